@@ -0,0 +1,37 @@
+# Benchmark: Analysing worlds
+# Times vengeance.analysis.analyse_world on square grids in which every exit
+# is one-way, leading east or north, so every location is a strongly
+# connected component of its own and the last is a dead end.
+# Run with an optional list of grid widths:
+#
+#     python benchmarks/analysis.py 300 1000
+import sys
+import timeit
+
+from grid import create_game
+
+from vengeance.analysis import analyse_world
+
+DEFAULT_SIZES = [300, 1000]
+
+
+def benchmark(width):
+    game = create_game(width, one_way=True)
+    start = timeit.default_timer()
+    analysis = analyse_world(game)
+    elapsed = timeit.default_timer() - start
+    assert len(analysis.dead_ends) == 1
+
+    location_count = width * width
+    print('{0:>9} locations: {1:6.3f} s ({2:5.3f} us/location)'.format(
+        location_count, elapsed, elapsed / location_count * 1e6))
+
+
+def main(args):
+    sizes = [int(arg) for arg in args] or DEFAULT_SIZES
+    for size in sizes:
+        benchmark(size)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,60 @@
+# Benchmark: Loading compiled worlds
+# Shows that loading a compiled world takes the same time however many
+# rooms it has, and how long compiling it (from create_game input) and
+# creating a playable game from it take.
+# Run with an optional list of room counts:
+#
+#     python benchmarks/compiled_world.py 1000 100000 1000000
+import os
+import shutil
+import sys
+import tempfile
+import timeit
+
+from create_game import create_game_data
+
+from vengeance.compiled import load_compiled_world
+from vengeance.compiled import save_compiled_world
+
+DEFAULT_SIZES = [1000, 100000, 1000000]
+
+
+def benchmark(room_count, directory):
+    path = os.path.join(directory, 'world.bin')
+
+    game_data = create_game_data(room_count)
+    start = timeit.default_timer()
+    save_compiled_world(game_data, path)
+    compiling = timeit.default_timer() - start
+
+    start = timeit.default_timer()
+    world = load_compiled_world(path)
+    loading = timeit.default_timer() - start
+
+    start = timeit.default_timer()
+    world.location_description(world.find_location('Room 0'))
+    lookup = timeit.default_timer() - start
+
+    start = timeit.default_timer()
+    world.create_game()
+    game_creation = timeit.default_timer() - start
+    world.close()
+
+    print('{0:>9} rooms ({1:6.1f} MB): compile {2:7.3f} s, load {3:7.3f} ms,'
+          ' first lookup {4:7.3f} ms, create game {5:7.3f} s'.format(
+              room_count, os.path.getsize(path) / 1e6, compiling,
+              loading * 1e3, lookup * 1e3, game_creation))
+
+
+def main(args):
+    sizes = [int(arg) for arg in args] or DEFAULT_SIZES
+    directory = tempfile.mkdtemp()
+    try:
+        for size in sizes:
+            benchmark(size, directory)
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,64 @@
+# Benchmark: Loading declaratively defined games
+# Shows how vengeance.create_game scales with the number of rooms and
+# exits in a synthetic world. Run with an optional list of room counts:
+#
+#     python benchmarks/create_game.py 1000 10000 100000 1000000
+import sys
+import timeit
+
+import vengeance
+
+DEFAULT_SIZES = [1000, 10000, 100000, 1000000]
+
+
+def room_name(index):
+    return 'Room ' + str(index)
+
+
+def create_game_data(room_count):
+    """
+    Creates a corridor of rooms, each with an exit to the next room and
+    every tenth room also with a one-way exit back to the first room.
+    """
+    rooms = []
+    for i in range(room_count):
+        exits = []
+        if i < room_count - 1:
+            exits.append({'to': room_name(i + 1), 'direction': 'east'})
+        if i % 10 == 9:
+            exits.append({'to': room_name(0), 'direction': 'up',
+                          'one_way': True})
+        rooms.append({'name': room_name(i),
+                      'description': 'Room number ' + str(i),
+                      'exits': exits})
+
+    return {
+        'directions': [
+            {'name': 'east', 'opposite': 'west'},
+            {'name': 'up', 'opposite': 'down'}
+        ],
+        'rooms': rooms
+    }
+
+
+def benchmark(room_count):
+    game_data = create_game_data(room_count)
+    exit_count = sum(len(room['exits']) for room in game_data['rooms'])
+
+    start = timeit.default_timer()
+    vengeance.create_game(game_data)
+    elapsed = timeit.default_timer() - start
+
+    print('{0:>9} rooms, {1:>9} exits: {2:8.3f} s '
+          '({3:6.3f} us/room)'.format(room_count, exit_count, elapsed,
+                                      elapsed / room_count * 1e6))
+
+
+def main(args):
+    sizes = [int(arg) for arg in args] or DEFAULT_SIZES
+    for size in sizes:
+        benchmark(size)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,93 @@
+# Benchmark: Locations with stored descriptions
+# Compares the memory held (and the peak memory used while loading) by a
+# game whose locations hold their descriptions with one, loaded from the
+# same JSON Lines, whose descriptions are read from a file as they are
+# needed, and the time taken to read a description which is and is not
+# cached. Requires Python 3.4 or later (for tracemalloc). Run with an
+# optional list of room counts:
+#
+#     python benchmarks/descriptions.py 10000 100000
+import gc
+import json
+import os
+import shutil
+import sys
+import tempfile
+import timeit
+import tracemalloc
+
+from create_game import create_game_data
+
+import vengeance
+from vengeance.descriptions import create_game_from_json_lines
+from vengeance.descriptions import load_descriptions
+from vengeance.descriptions import save_descriptions
+
+DEFAULT_SIZES = [10000, 100000]
+DESCRIPTION_LENGTH = 300
+READS = 100000
+
+
+def create_lines(room_count):
+    game_data = create_game_data(room_count)
+    lines = [json.dumps(dict(direction, type='direction'))
+             for direction in game_data['directions']]
+    for room in game_data['rooms']:
+        room['description'] = room['description'].ljust(DESCRIPTION_LENGTH)
+        lines.append(json.dumps(dict(room, type='room')))
+    return lines
+
+
+def traced_peak(create, *args):
+    gc.collect()
+    tracemalloc.start()
+    game = create(*args)
+    gc.collect()
+    size, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return game, size, peak
+
+
+def benchmark(room_count, directory):
+    path = os.path.join(directory, 'descriptions.bin')
+    lines = create_lines(room_count)
+
+    game, resident, resident_peak = traced_peak(
+        vengeance.create_game_from_json_lines, lines)
+    save_descriptions(game, path)
+    del game
+
+    store = load_descriptions(path)
+    stored_game, stored, stored_peak = traced_peak(
+        create_game_from_json_lines, lines, store)
+
+    locations = stored_game.world._locations
+    location = locations[0]
+    location.description
+    hit = timeit.timeit(lambda: location.description, number=READS) / READS
+    start = timeit.default_timer()
+    for location in locations[1:READS + 1]:
+        location.description
+    miss = (timeit.default_timer() - start) / len(locations[1:READS + 1])
+    store.close()
+
+    print('{0:>9} rooms: {1:6.1f} bytes/room resident (peak {2:6.1f}), '
+          '{3:6.1f} bytes/room stored (peak {4:6.1f}), cached read '
+          '{5:5.2f} us, uncached read {6:5.2f} us'.format(
+              room_count, float(resident) / room_count,
+              float(resident_peak) / room_count, float(stored) / room_count,
+              float(stored_peak) / room_count, hit * 1e6, miss * 1e6))
+
+
+def main(args):
+    sizes = [int(arg) for arg in args] or DEFAULT_SIZES
+    directory = tempfile.mkdtemp()
+    try:
+        for size in sizes:
+            benchmark(size, directory)
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
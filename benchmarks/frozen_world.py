@@ -0,0 +1,52 @@
+# Benchmark: Moving through a frozen world
+# Compares processing a long random walk through a 100x100 grid with
+# Game.process_input before and after freezing the world (see World.freeze).
+# Run with an optional list of script lengths:
+#
+#     python benchmarks/frozen_world.py 100000 1000000
+import random
+import sys
+import timeit
+
+from grid import create_game
+
+DEFAULT_SIZES = [100000, 1000000]
+
+
+def walk(game, inputs):
+    process_input = game.process_input
+    start = timeit.default_timer()
+    for user_input in inputs:
+        process_input(user_input)
+    return timeit.default_timer() - start
+
+
+def benchmark(step_count):
+    generator = random.Random(0)
+    inputs = [generator.choice('nsew') for _ in range(step_count)]
+
+    game = create_game()
+    thawed = walk(game, inputs)
+    expected = game.character.current_location
+
+    game = create_game()
+    start = timeit.default_timer()
+    game.world.freeze()
+    freezing = timeit.default_timer() - start
+    frozen = walk(game, inputs)
+    assert game.character.current_location.name == expected.name
+
+    print('{0:>9} steps: thawed {1:5.3f} us/step, frozen {2:5.3f} us/step '
+          '(freezing {3:5.1f} ms)'.format(
+              step_count, thawed / step_count * 1e6,
+              frozen / step_count * 1e6, freezing * 1e3))
+
+
+def main(args):
+    sizes = [int(arg) for arg in args] or DEFAULT_SIZES
+    for size in sizes:
+        benchmark(size)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
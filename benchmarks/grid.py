@@ -0,0 +1,44 @@
+# The square grid of locations walked, queried and analysed by several of
+# the benchmarks. Not a benchmark itself.
+from vengeance.directions import EAST, NORTH
+from vengeance.game import Game
+from vengeance.game import Location
+
+WIDTH = 100
+
+
+def location_names(width):
+    return ['Location ' + str(i) for i in range(width * width)]
+
+
+def add_exits(locations, width, one_way=False):
+    """
+    Joins each location in a grid, row by row, to the next location east
+    and north of it, returning the number of exits added.
+    """
+    exit_count = 0
+    for i, location in enumerate(locations):
+        if i % width < width - 1:
+            exit_count += add_exit(location, EAST, locations[i + 1], one_way)
+        if i + width < len(locations):
+            exit_count += add_exit(location, NORTH, locations[i + width],
+                                   one_way)
+    return exit_count
+
+
+def add_exit(location, direction, to_location, one_way):
+    if one_way:
+        location.add_one_way_exit(direction, to_location)
+        return 1
+    location.add_exit(direction, to_location)
+    return 2
+
+
+def create_locations(width=WIDTH, one_way=False):
+    locations = [Location(name) for name in location_names(width)]
+    add_exits(locations, width, one_way)
+    return locations
+
+
+def create_game(width=WIDTH, one_way=False):
+    return Game(create_locations(width, one_way))
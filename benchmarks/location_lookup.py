@@ -0,0 +1,47 @@
+# Benchmark: Game construction and location lookup
+# Shows how building a Game and finding its locations by name scale
+# with the number of locations. Run with an optional list of sizes:
+#
+#     python benchmarks/location_lookup.py 1000 10000 100000 1000000
+import sys
+import timeit
+
+from vengeance.game import Game
+from vengeance.game import Location
+
+DEFAULT_SIZES = [1000, 10000, 100000, 1000000]
+LOOKUPS = 100000
+
+
+def create_locations(count):
+    return [Location('Location ' + str(i)) for i in range(count)]
+
+
+def benchmark(count):
+    locations = create_locations(count)
+
+    start = timeit.default_timer()
+    game = Game(locations)
+    construction = timeit.default_timer() - start
+
+    step = max(1, count // LOOKUPS)
+    names = [locations[i].name for i in range(0, count, step)][:LOOKUPS]
+    start = timeit.default_timer()
+    for name in names:
+        game.find_location(name)
+    lookup = (timeit.default_timer() - start) / len(names)
+
+    print('{0:>9} locations: construction {1:8.3f} s '
+          '({2:6.3f} us/location), find_location {3:6.3f} us'.format(
+              count, construction, construction / count * 1e6,
+              lookup * 1e6))
+
+
+def main(args):
+    sizes = [int(arg) for arg in args] or DEFAULT_SIZES
+    for size in sizes:
+        benchmark(size)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
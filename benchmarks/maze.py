@@ -0,0 +1,46 @@
+# Benchmark: Generating mazes
+# Times generating square mazes with each algorithm of vengeance.maze,
+# building a game from them and drawing them.
+# Run with an optional list of maze widths:
+#
+#     python benchmarks/maze.py 300 1000
+import gc
+import sys
+import timeit
+
+from vengeance.maze import generate_maze
+
+DEFAULT_SIZES = [300, 1000]
+ALGORITHMS = ['backtracker', 'prim', 'binary_tree']
+
+
+def benchmark(width):
+    for algorithm in ALGORITHMS:
+        start = timeit.default_timer()
+        maze = generate_maze(width, width, algorithm, seed=0)
+        generated = timeit.default_timer() - start
+
+        start = timeit.default_timer()
+        maze.create_game()
+        # The game is built with the garbage collector paused, so include
+        # the first collection of its objects once the collector resumes
+        gc.collect()
+        built = timeit.default_timer() - start
+
+        start = timeit.default_timer()
+        maze.render()
+        rendered = timeit.default_timer() - start
+
+        print('{0:>9} cells, {1:<11}: generate {2:6.3f} s, '
+              'create game {3:6.3f} s, render {4:6.3f} s'.format(
+                  width * width, algorithm, generated, built, rendered))
+
+
+def main(args):
+    sizes = [int(arg) for arg in args] or DEFAULT_SIZES
+    for size in sizes:
+        benchmark(size)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,54 @@
+# Benchmark: Memory used by locations and exits
+# Reports the bytes allocated per location and per exit when building a
+# grid of locations joined by two-way exits, and per game played in it.
+# Requires Python 3.4 or later (for tracemalloc). Run with an optional list
+# of location counts:
+#
+#     python benchmarks/memory.py 10000 100000
+import sys
+import tracemalloc
+
+from grid import add_exits
+from grid import location_names
+
+from vengeance.game import Game
+from vengeance.game import Location
+
+DEFAULT_SIZES = [10000, 100000]
+GAMES = 10000
+
+
+def benchmark(location_count):
+    width = int(location_count ** 0.5)
+    names = location_names(width)
+
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    locations = [Location(name) for name in names]
+    game = Game(locations)
+    after_locations = tracemalloc.get_traced_memory()[0]
+
+    exit_count = add_exits(locations, width)
+    after_exits = tracemalloc.get_traced_memory()[0]
+
+    world = game.world
+    games = [world.create_game() for _ in range(GAMES)]
+    after_games = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    print('{0:>9} locations, {1:>9} exits: {2:6.1f} bytes/location, '
+          '{3:6.1f} bytes/exit, {4:6.1f} bytes/game'.format(
+              len(locations), exit_count,
+              float(after_locations - start) / len(locations),
+              float(after_exits - after_locations) / exit_count,
+              float(after_games - after_exits) / len(games)))
+
+
+def main(args):
+    sizes = [int(arg) for arg in args] or DEFAULT_SIZES
+    for size in sizes:
+        benchmark(size)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,50 @@
+# Benchmark: Loading games using several processes
+# Compares vengeance.create_game with
+# vengeance.parallel.create_game_in_parallel using different numbers of
+# processes, on the synthetic world of benchmarks/create_game.py.
+# Run with an optional list of room counts:
+#
+#     python benchmarks/parallel_create_game.py 100000 1000000
+import multiprocessing
+import sys
+import timeit
+
+import vengeance
+from vengeance.parallel import create_game_in_parallel
+
+from create_game import create_game_data
+
+DEFAULT_SIZES = [100000, 1000000]
+
+
+def worker_counts():
+    counts = [1]
+    while counts[-1] * 2 <= multiprocessing.cpu_count():
+        counts.append(counts[-1] * 2)
+    return counts
+
+
+def benchmark(room_count):
+    game_data = create_game_data(room_count)
+
+    start = timeit.default_timer()
+    vengeance.create_game(game_data)
+    serial = timeit.default_timer() - start
+    print('{0:>9} rooms: create_game {1:8.3f} s'.format(room_count, serial))
+
+    for worker_count in worker_counts():
+        start = timeit.default_timer()
+        create_game_in_parallel(game_data, worker_count)
+        parallel = timeit.default_timer() - start
+        print('{0:>9} rooms: {1:>2} processes {2:8.3f} s'.format(
+            room_count, worker_count, parallel))
+
+
+def main(args):
+    sizes = [int(arg) for arg in args] or DEFAULT_SIZES
+    for size in sizes:
+        benchmark(size)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,61 @@
+# Benchmark: Overhead of profiling rounds
+# Compares the time per round of Game.run without a profiler and with a
+# vengeance.profiling.RoundProfiler, using handlers which do no work, so
+# that the difference is the cost of timing each phase. Run with an
+# optional list of round counts:
+#
+#     python benchmarks/profiling.py 100000 1000000
+import sys
+import timeit
+
+from vengeance.directions import NORTH
+from vengeance.game import Game
+from vengeance.game import Location
+from vengeance.profiling import RoundProfiler
+
+DEFAULT_SIZES = [100000, 1000000]
+
+
+def run(round_count, profiler):
+    start = Location('Start')
+    start.add_exit(NORTH, Location('End'))
+    game = Game([start])
+    inputs = iter(['n', 's'] * (round_count // 2))
+    game.display_handler = lambda text: None
+    game.input_handler = lambda: next(inputs)
+    game.profiler = profiler
+    rounds = [0]
+
+    def end_of_round_handler(game):
+        rounds[0] += 1
+        if rounds[0] == round_count:
+            game.should_end = True
+
+    game.end_of_round_handler = end_of_round_handler
+
+    start = timeit.default_timer()
+    game.run()
+    return (timeit.default_timer() - start) / round_count
+
+
+def benchmark(round_count):
+    unprofiled = run(round_count, None)
+    profiler = RoundProfiler()
+    profiled = run(round_count, profiler)
+    process_input = profiler.histograms['process_input']
+
+    print('{0:>9} rounds: unprofiled {1:5.2f} us/round, profiled {2:5.2f} '
+          'us/round (process_input mean {3:5.2f} us, 99th percentile '
+          '{4:5.2f} us)'.format(
+              round_count, unprofiled * 1e6, profiled * 1e6,
+              process_input.mean * 1e6, process_input.quantile(0.99) * 1e6))
+
+
+def main(args):
+    sizes = [int(arg) for arg in args] or DEFAULT_SIZES
+    for size in sizes:
+        benchmark(size)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
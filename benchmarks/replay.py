@@ -0,0 +1,56 @@
+# Benchmark: Replaying scripted playthroughs
+# Compares processing a long random walk through a grid one input at a time
+# with Game.process_input against processing it in one call to Game.replay,
+# before and after freezing the world.
+# Run with an optional list of script lengths:
+#
+#     python benchmarks/replay.py 100000 1000000
+import random
+import sys
+import timeit
+
+from grid import create_game
+
+DEFAULT_SIZES = [100000, 1000000]
+
+
+def benchmark(step_count):
+    generator = random.Random(0)
+    inputs = [generator.choice('nsew') for _ in range(step_count)]
+
+    game = create_game()
+    start = timeit.default_timer()
+    for user_input in inputs:
+        game.process_input(user_input)
+    one_at_a_time = timeit.default_timer() - start
+    expected = game.character.current_location
+
+    game = create_game()
+    start = timeit.default_timer()
+    location, _ = game.replay(inputs)
+    replayed = timeit.default_timer() - start
+    assert location.name == expected.name
+
+    game = create_game()
+    game.world.freeze()
+    start = timeit.default_timer()
+    location, _ = game.replay(inputs)
+    frozen = timeit.default_timer() - start
+    assert location.name == expected.name
+
+    print('{0:>9} steps: process_input {1:6.3f} s ({2:5.3f} us/step), '
+          'replay {3:6.3f} s ({4:5.3f} us/step), frozen replay {5:6.3f} s '
+          '({6:5.3f} us/step)'.format(
+              step_count, one_at_a_time, one_at_a_time / step_count * 1e6,
+              replayed, replayed / step_count * 1e6,
+              frozen, frozen / step_count * 1e6))
+
+
+def main(args):
+    sizes = [int(arg) for arg in args] or DEFAULT_SIZES
+    for size in sizes:
+        benchmark(size)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
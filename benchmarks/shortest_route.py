@@ -0,0 +1,52 @@
+# Benchmark: Finding shortest routes
+# Compares finding the distance between two nearby locations in a square
+# grid by breadth-first search from one end (LocationQuery.distance) with
+# finding the route between them by search from both ends
+# (LocationQuery.shortest_route).
+# Run with an optional list of grid widths:
+#
+#     python benchmarks/shortest_route.py 100 300
+import sys
+import timeit
+
+from grid import create_locations
+
+from vengeance.game import Game
+from vengeance.query import LocationQuery
+
+DEFAULT_SIZES = [100, 300]
+
+
+def benchmark(width):
+    locations = create_locations(width)
+    first = locations[0]
+    last = locations[10 * width + 10]
+
+    query = LocationQuery(Game(locations))
+    query.graph.adjacency()
+    start = timeit.default_timer()
+    distance = query.distance(first, last)
+    one_end = timeit.default_timer() - start
+    query.close()
+
+    query = LocationQuery(Game(locations))
+    # Build the exits indexed by the location they lead to beforehand
+    query.shortest_route(locations[1], first)
+    start = timeit.default_timer()
+    route = query.shortest_route(first, last)
+    both_ends = timeit.default_timer() - start
+    query.close()
+    assert len(route) == distance
+
+    print('{0:>9} locations: one end {1:6.3f} s, both ends {2:6.3f} s'.format(
+        width * width, one_end, both_ends))
+
+
+def main(args):
+    sizes = [int(arg) for arg in args] or DEFAULT_SIZES
+    for size in sizes:
+        benchmark(size)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
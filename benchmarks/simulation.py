@@ -0,0 +1,36 @@
+# Benchmark: Simulating random walks
+# Times moving many agents at random through a grid with
+# vengeance.simulation.simulate, reporting the time per agent-step.
+# Run with an optional list of agent counts (each agent takes 1000 steps):
+#
+#     python benchmarks/simulation.py 1000 10000
+import sys
+import timeit
+
+from grid import create_game
+
+from vengeance.simulation import simulate
+
+DEFAULT_SIZES = [1000, 10000]
+STEP_COUNT = 1000
+
+
+def benchmark(agent_count):
+    game = create_game()
+    start = timeit.default_timer()
+    simulate(game, agent_count, STEP_COUNT, seed=0)
+    elapsed = timeit.default_timer() - start
+
+    agent_steps = agent_count * STEP_COUNT
+    print('{0:>10} agent-steps: {1:6.3f} s ({2:6.3f} us/agent-step)'.format(
+        agent_steps, elapsed, elapsed / agent_steps * 1e6))
+
+
+def main(args):
+    sizes = [int(arg) for arg in args] or DEFAULT_SIZES
+    for size in sizes:
+        benchmark(size)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,51 @@
+# Benchmark: Saving and restoring sessions
+# Times saving the sessions of many games played in one world with
+# vengeance.snapshot.snapshot_session and restoring them with
+# restore_session.
+# Run with an optional list of session counts:
+#
+#     python benchmarks/snapshot.py 100000 1000000
+import random
+import sys
+import timeit
+
+from grid import create_game
+
+from vengeance.snapshot import restore_session
+from vengeance.snapshot import snapshot_session
+
+DEFAULT_SIZES = [100000, 300000]
+
+
+def benchmark(session_count):
+    world = create_game().world
+    generator = random.Random(0)
+    games = []
+    for _ in range(session_count):
+        game = world.create_game()
+        game.replay(generator.choice('ne') for _ in range(20))
+        games.append(game)
+
+    start = timeit.default_timer()
+    sessions = [snapshot_session(game) for game in games]
+    saved = timeit.default_timer() - start
+
+    start = timeit.default_timer()
+    for session in sessions:
+        restore_session(world, session)
+    restored = timeit.default_timer() - start
+
+    print('{0:>9} sessions: save {1:6.3f} s ({2:9.0f}/s), '
+          'restore {3:6.3f} s ({4:9.0f}/s)'.format(
+              session_count, saved, session_count / saved, restored,
+              session_count / restored))
+
+
+def main(args):
+    sizes = [int(arg) for arg in args] or DEFAULT_SIZES
+    for size in sizes:
+        benchmark(size)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,51 @@
+# Benchmark: Matching untidy input
+# Compares Game.process_input for input which exactly matches an exit with
+# input which only matches it after trimming and case folding, and input
+# which is a unique prefix of it, at a location with many exits. Run with
+# an optional list of exit counts:
+#
+#     python benchmarks/tokenizer.py 10 100 1000
+import sys
+import timeit
+
+from vengeance.game import Direction
+from vengeance.game import Game
+from vengeance.game import Location
+
+DEFAULT_SIZES = [10, 100, 1000]
+INPUTS = 20000
+
+
+def create_game(exit_count):
+    hub = Location('Hub')
+    for i in range(exit_count):
+        hub.add_one_way_exit(Direction('passage' + str(i)), hub)
+    hub.add_one_way_exit(Direction('trapdoor'), hub)
+    return Game([hub])
+
+
+def time_input(game, user_input):
+    process_input = game.process_input
+    return timeit.timeit(lambda: process_input(user_input),
+                         number=INPUTS) / INPUTS
+
+
+def benchmark(exit_count):
+    game = create_game(exit_count)
+    exact = time_input(game, 'trapdoor')
+    folded = time_input(game, ' TrapDoor ')
+    prefix = time_input(game, 'Trap')
+
+    print('{0:>7} exits: exact {1:5.2f} us, folded {2:5.2f} us, '
+          'prefix {3:5.2f} us'.format(
+              exit_count, exact * 1e6, folded * 1e6, prefix * 1e6))
+
+
+def main(args):
+    sizes = [int(arg) for arg in args] or DEFAULT_SIZES
+    for size in sizes:
+        benchmark(size)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,66 @@
+# Use case: Serve many players over the network from one event loop
+# Example: Each connection plays its own game in a single shared world
+# (requires Python 3.7 or later). Connect with, e.g., 'nc localhost 4000'
+import asyncio
+
+import vengeance
+from vengeance.display import BufferedDisplay
+
+world = vengeance.create_game({
+    'directions': [
+        {'name': 'up', 'opposite': 'down'},
+        {'name': 'in', 'opposite': 'out'},
+        {'name': 'west', 'opposite': 'east'}
+    ],
+    'rooms': [
+        {'name': 'A Church',
+         'description': 'Tiny place of worship',
+         'exits': [
+             {'to': 'The Crypt', 'direction': 'down'}
+         ]},
+        {'name': 'The Crypt',
+         'description': 'Dusty tomb filled with empty sarcophagi',
+         'exits': [
+             {'to': 'A Coffin', 'direction': 'in', 'one_way': True},
+             {'to': 'A Cave', 'direction': 'west'}
+         ]},
+        {'name': 'A Coffin',
+         'description': 'A tight squeeze and pitch dark'},
+        {'name': 'A Cave',
+         'description': 'A dark and dingy place'}
+    ],
+}).world
+
+async def play(reader, writer):
+    game = world.create_game()
+
+    def write(text):
+        writer.write(text.encode('utf-8'))
+
+    async def input_handler():
+        line = await reader.readline()
+        if not line:
+            # The player has disconnected
+            return 'quit'
+        return line.decode('utf-8').strip()
+
+    async def quit_without_confirmation(display_handler, input_handler):
+        return True
+
+    # Everything displayed in a round is sent in a single write, when the
+    # game next asks for input
+    game.display_handler = BufferedDisplay(write)
+    game.async_input_handler = input_handler
+    game.async_quit_handler = quit_without_confirmation
+
+    try:
+        await game.run_async()
+    finally:
+        writer.close()
+
+async def main():
+    server = await asyncio.start_server(play, 'localhost', 4000)
+    async with server:
+        await server.serve_forever()
+
+asyncio.run(main())
@@ -1,10 +1,22 @@
 """
 Vengeance - text adventure game engine.
 """
+import gc
+import json
+
 from vengeance.game import Direction
 from vengeance.game import Game
 from vengeance.game import GameFormatException
 from vengeance.game import Location
+from vengeance.game import World
+
+
+try:
+    # Disable 'Undefined variable 'unicode''
+    # pylint: disable=E0602
+    _TEXT_TYPE = unicode
+except NameError:
+    _TEXT_TYPE = str
 
 
 class _Struct:
@@ -39,40 +51,53 @@ def _create_directions(direction_data):
     """
     Creates the directions in the game.
 
-    direction_data: Details of the directions in the game
+    :param list direction_data: Details of the directions in the game
+    :return: Created directions, keyed by name
+    :rtype: dict
     """
-    directions = []
+    directions = {}
     for datum in direction_data:
-        _check_direction_well_formed(datum)
-
-        # Disable 'Used * or ** magic
-        # pylint: disable=W0142
-        direction = _Struct(**datum)
-        direction_names = [d.name for d in directions]
-        _check_direction_valid(direction, direction_names)
-
-        # Disable 'Instance of '_Struct' has no 'name' member
-        # Disable 'Instance of '_Struct' has no 'opposite' member
-        # pylint: disable=E1101
-        name = direction.name
-        opposite = direction.opposite
-
-        reserved_word = 'quit'
-        name_key = _direction_name_key()
-        _check_if_direction_is_reserved(reserved_word, name, name_key)
-        opposite_key = _direction_opposite_key()
-        _check_if_direction_is_reserved(reserved_word, opposite, opposite_key)
-
-        direction = Direction(name)
-        opposite_direction = Direction(opposite)
-        direction.opposite = opposite_direction
-        opposite_direction.opposite = direction
-        directions.append(direction)
-        directions.append(opposite_direction)
+        _add_direction_pair(datum, directions)
 
     return directions
 
 
+def _add_direction_pair(datum, directions):
+    """
+    Creates a direction and its opposite.
+
+    :param dict datum: Details of the direction
+    :param dict directions: The directions created so far, keyed by name,
+        to which the new directions are added
+    :raises: ``GameFormatException`` if ``datum`` is invalid
+    """
+    _check_direction_well_formed(datum)
+
+    # Disable 'Used * or ** magic
+    # pylint: disable=W0142
+    direction = _Struct(**datum)
+    _check_direction_valid(direction, directions)
+
+    # Disable 'Instance of '_Struct' has no 'name' member
+    # Disable 'Instance of '_Struct' has no 'opposite' member
+    # pylint: disable=E1101
+    name = direction.name
+    opposite = direction.opposite
+
+    reserved_word = 'quit'
+    name_key = _direction_name_key()
+    _check_if_direction_is_reserved(reserved_word, name, name_key)
+    opposite_key = _direction_opposite_key()
+    _check_if_direction_is_reserved(reserved_word, opposite, opposite_key)
+
+    direction = Direction(name)
+    opposite_direction = Direction(opposite)
+    direction.opposite = opposite_direction
+    opposite_direction.opposite = direction
+    directions[name] = direction
+    directions[opposite] = opposite_direction
+
+
 def _check_direction_well_formed(direction):
     """
     Checks the structure of a direction dictionary.
@@ -100,7 +125,8 @@ def _check_direction_valid(direction, direction_names):
     Checks the validity of a direction dictionary.
 
     :param dict direction: The direction to check
-    :param list direction_names: The current set of direction names
+    :param direction_names: The names of the directions created so far
+    :type direction_names: set or dict
     """
     if not isinstance(direction.name, str):
         raise GameFormatException(u'Direction name must be a string')
@@ -144,130 +170,209 @@ def _create_locations(location_data):
     :rtype: list of locations
     """
     locations = []
+    location_names = set()
     for location_datum in location_data:
-        if 'name' not in location_datum:
-            if 'description' not in location_datum:
-                message = u'Missing name and description from room'
-                raise GameFormatException(message)
-            else:
-                description = location_datum['description']
-                message = u'Missing name from room with description "{0}"'
-                raise GameFormatException(message.format(description))
+        location = _create_location(location_datum, location_names)
+        location_names.add(location.name)
+        locations.append(location)
 
-        name = location_datum['name']
+    return locations
+
+
+def _create_location(location_datum, location_names):
+    """
+    Creates a single location.
+
+    :param dict location_datum: Details of the location
+    :param location_names: The names of the locations created so far
+    :type location_names: set or dict
+    :return: Created location
+    :rtype: Location
+    :raises: ``GameFormatException`` if ``location_datum`` is invalid
+    """
+    name, description = _check_location_well_formed(location_datum,
+                                                    location_names)
+    return Location(name, description)
 
-        if 'description' not in location_datum:
-            message = u'Missing description from room with name "{0}"'
-            raise GameFormatException(message.format(name))
 
-        if not isinstance(name, str):
-            raise GameFormatException(u'Room name must be a string')
+def _check_location_well_formed(location_datum, location_names):
+    """
+    Checks the structure of a location dictionary.
+
+    :param dict location_datum: Details of the location
+    :param location_names: The names of the locations created so far
+    :type location_names: set or dict
+    :return: The name and description of the location
+    :rtype: tuple
+    :raises: ``GameFormatException`` if ``location_datum`` is invalid
+    """
+    name = _check_location_named(location_datum)
 
-        if name in [r.name for r in locations]:
-            message = u'Redefinition of room "{0}"'
-            raise GameFormatException(message.format(name))
+    if name in location_names:
+        message = u'Redefinition of room "{0}"'
+        raise GameFormatException(message.format(name))
 
-        description = location_datum['description']
-        if not isinstance(description, str):
-            raise GameFormatException(u'Room description must be a string')
+    return name, _check_location_described(location_datum)
 
-        location = Location(name, description)
-        locations.append(location)
 
-    return locations
+def _check_location_named(location_datum):
+    """
+    Checks the parts of a location dictionary which are checked before
+    whether its name is a redefinition (see _check_location_well_formed).
+
+    :param dict location_datum: Details of the location
+    :return: The name of the location
+    :rtype: string
+    :raises: ``GameFormatException`` if ``location_datum`` is invalid
+    """
+    if 'name' not in location_datum:
+        if 'description' not in location_datum:
+            message = u'Missing name and description from room'
+            raise GameFormatException(message)
+        else:
+            description = location_datum['description']
+            message = u'Missing name from room with description "{0}"'
+            raise GameFormatException(message.format(description))
+
+    name = location_datum['name']
 
+    if 'description' not in location_datum:
+        message = u'Missing description from room with name "{0}"'
+        raise GameFormatException(message.format(name))
 
-def _create_exit_data(location_data):
+    if not isinstance(name, str):
+        raise GameFormatException(u'Room name must be a string')
+
+    return name
+
+
+def _check_location_described(location_datum):
     """
-    Creates exit data for the game.
+    Checks the parts of a location dictionary which are checked after
+    whether its name is a redefinition (see _check_location_well_formed).
 
-    location_data: Details of the locations in the game
+    :param dict location_datum: Details of the location
+    :return: The description of the location
+    :rtype: string
+    :raises: ``GameFormatException`` if ``location_datum`` is invalid
     """
-    exit_data = []
-    for location_datum in location_data:
-        location_name = location_datum['name']
-        location_datum.setdefault('exits', [])
-        for current_exit in location_datum['exits']:
-            current_exit.setdefault('one_way', False)
-
-            if 'to' not in current_exit:
-                if 'direction' not in current_exit:
-                    if 'direction' not in current_exit:
-                        message = u'Missing to room and direction from ' \
-                                  u'exit from room "{0}"'
-                        formatted_message = message.format(location_name)
-                        raise GameFormatException(formatted_message)
-                else:
-                    message = u'Missing to room from exit with direction ' \
-                              u'"{0}" from room "{1}"'
-                    direction_name = current_exit['direction']
-                    formatted_message = message.format(direction_name,
-                                                       location_name)
-                    raise GameFormatException(formatted_message)
-
-            if 'direction' not in current_exit:
-                message = u'Missing direction from exit to room "{0}" ' \
-                          u'from room "{1}"'
-                raise GameFormatException(
-                    message.format(current_exit['to'], location_name))
-
-            to_location = current_exit['to']
-            if not isinstance(to_location, str):
-                raise GameFormatException('Exit to room must be a string')
-
-            direction = current_exit['direction']
-            if not isinstance(direction, str):
-                raise GameFormatException('Exit direction must be a string')
-
-            one_way = current_exit['one_way']
-            if not isinstance(one_way, bool):
-                raise GameFormatException('Exit one_way must be a boolean')
-
-            exit_datum = {
-                'from': location_name,
-                'to': to_location,
-                'direction': direction,
-                'one_way': one_way
-            }
-            exit_data.append(exit_datum)
-
-    return exit_data
-
-
-def _add_exits(game, directions, exit_data):
-    """
-    Adds exits to locations.
-
-    game: The game containing the locations to which to add exits
-    directions: The directions in which exits can lead
-    exit_data: Details of the exits in the game
-    """
-    for datum in exit_data:
-        from_name = datum['from']
-        from_location = game.find_location(from_name)
-        to_name = datum['to']
-        to_location = game.find_location(to_name)
-        if to_location is None:
-            message = u'Unknown exit room "{0}" from "{1}"'
-            raise GameFormatException(message.format(to_name, from_name))
-
-        direction_name = datum['direction']
-        the_exit = None
-        for direction in directions:
-            if direction.name == direction_name:
-                the_exit = direction
-        if the_exit is None:
-            message = u'Unknown exit direction "{0}" from room "{1}"'
-            raise GameFormatException(
-                message.format(direction_name, from_name))
+    description = location_datum['description']
+    if not isinstance(description, str):
+        raise GameFormatException(u'Room description must be a string')
 
-        one_way = datum['one_way']
-        add_exit_func = None
-        if one_way:
-            add_exit_func = Location.add_one_way_exit
+    return description
+
+
+def _check_exit_well_formed(exit_datum, location_name):
+    """
+    Checks the structure of an exit dictionary.
+
+    :param dict exit_datum: The exit to check
+    :param string location_name: The name of the room the exit leads from
+    :return: The names of the room and direction to which the exit leads
+        and whether or not the exit is one-way
+    :rtype: tuple
+    :raises: ``GameFormatException`` if exit structure is invalid
+    """
+    if 'to' not in exit_datum:
+        if 'direction' not in exit_datum:
+            message = u'Missing to room and direction from ' \
+                      u'exit from room "{0}"'
+            raise GameFormatException(message.format(location_name))
         else:
-            add_exit_func = Location.add_exit
-        add_exit_func(from_location, the_exit, to_location)
+            message = u'Missing to room from exit with direction ' \
+                      u'"{0}" from room "{1}"'
+            direction_name = exit_datum['direction']
+            formatted_message = message.format(direction_name,
+                                               location_name)
+            raise GameFormatException(formatted_message)
+
+    if 'direction' not in exit_datum:
+        message = u'Missing direction from exit to room "{0}" ' \
+                  u'from room "{1}"'
+        raise GameFormatException(
+            message.format(exit_datum['to'], location_name))
+
+    to_location = exit_datum['to']
+    if not isinstance(to_location, str):
+        raise GameFormatException('Exit to room must be a string')
+
+    direction = exit_datum['direction']
+    if not isinstance(direction, str):
+        raise GameFormatException('Exit direction must be a string')
+
+    one_way = exit_datum.get('one_way', False)
+    if not isinstance(one_way, bool):
+        raise GameFormatException('Exit one_way must be a boolean')
+
+    return to_location, direction, one_way
+
+
+def _resolve_exit(game, directions, from_name, to_name, direction_name):
+    """
+    Finds the location and direction to which an exit leads.
+
+    :param Game game: The game containing the locations
+    :param dict directions: The directions in the game, keyed by name
+    :param string from_name: The name of the room the exit leads from
+    :param string to_name: The name of the room the exit leads to
+    :param string direction_name: The name of the exit direction
+    :return: The location and direction, or a message describing why the
+        exit cannot be resolved
+    :rtype: tuple
+    """
+    to_location = game.find_location(to_name)
+    if to_location is None:
+        message = u'Unknown exit room "{0}" from "{1}"'
+        return None, None, message.format(to_name, from_name)
+
+    direction = directions.get(direction_name)
+    if direction is None:
+        message = u'Unknown exit direction "{0}" from room "{1}"'
+        return None, None, message.format(direction_name, from_name)
+
+    return to_location, direction, None
+
+
+def _add_exits(game, directions, locations, location_data):
+    """
+    Validates exits and adds them to locations in a single pass.
+
+    Exits which are not well formed are reported as soon as they are
+    found. Exits to unknown rooms or in unknown directions are reported
+    only once every exit has been checked, so that the errors raised are
+    the same as if all exits were checked before any were added.
+
+    :param Game game: The game containing the locations to which to add
+        exits
+    :param dict directions: The directions in the game, keyed by name
+    :param list locations: The locations in the game, in the same order as
+        ``location_data``
+    :param list location_data: Details of the locations in the game
+    :raises: ``GameFormatException`` if any exit is invalid
+    """
+    unresolved_message = None
+    for index, location_datum in enumerate(location_data):
+        from_location = locations[index]
+        from_name = from_location.name
+        for exit_datum in location_datum.get('exits', ()):
+            to_name, direction_name, one_way = _check_exit_well_formed(
+                exit_datum, from_name)
+            if unresolved_message is not None:
+                continue
+
+            to_location, direction, unresolved_message = _resolve_exit(
+                game, directions, from_name, to_name, direction_name)
+            if unresolved_message is not None:
+                continue
+
+            if one_way:
+                from_location.add_one_way_exit(direction, to_location)
+            else:
+                from_location.add_exit(direction, to_location)
+
+    if unresolved_message is not None:
+        raise GameFormatException(unresolved_message)
 
 
 def _get_location_data(game_data):
@@ -289,6 +394,46 @@ def _get_location_data(game_data):
     return location_data
 
 
+def _without_garbage_collection(func, *args):
+    """
+    Calls a function with the cyclic garbage collector paused.
+
+    Building a large world allocates millions of objects, none of which
+    are garbage, and the collector's full collections would otherwise make
+    loading quadratic.
+
+    :param function func: The function to call
+    :param args: The arguments with which to call ``func``
+    :return: The result of calling ``func``
+    """
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return func(*args)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+
+def _create_game(game_data):
+    """
+    Creates a game (see create_game).
+
+    :param dict game_data: Details of the game (see run_game)
+    :return: Created game
+    :rtype: Game
+    """
+    directions = _create_directions(game_data['directions'])
+
+    location_data = _get_location_data(game_data)
+    locations = _create_locations(location_data)
+    if len(locations) > 0:
+        game = Game(locations)
+        _add_exits(game, directions, locations, location_data)
+
+        return game
+
+
 def create_game(game_data):
     """
     Creates a game.
@@ -304,15 +449,311 @@ def create_game(game_data):
     if 'directions' not in game_data:
         raise GameFormatException(u'Missing directions list')
 
-    directions = _create_directions(game_data['directions'])
+    return _without_garbage_collection(_create_game, game_data)
 
-    locations = _create_locations(_get_location_data(game_data))
-    if len(locations) > 0:
-        game = Game(locations)
-        exit_data = _create_exit_data(_get_location_data(game_data))
-        _add_exits(game, directions, exit_data)
 
-        return game
+class _RecordLoader(object):
+    """
+    Builds a game from a stream of direction, room and exit records.
+
+    Rooms which are referred to by exits before they are defined are
+    created as soon as they are referred to and completed when their
+    record arrives, so no record needs to be kept once it is processed.
+    """
+    def __init__(self):
+        self._directions = {}
+        self._locations = []
+        self._locations_by_name = {}
+        # Rooms referred to by an exit but not yet defined, keyed by name,
+        # with the position of the first reference to them and the error
+        # to report if they are never defined
+        self._undefined_locations = {}
+        self._undefined_location_count = 0
+
+    def __contains__(self, name):
+        """
+        Returns whether or not a room has been defined.
+
+        :param string name: The name of the room
+        :return: True if a room record with the name has been processed,
+            False otherwise
+        :rtype: bool
+        """
+        return (name in self._locations_by_name and
+                name not in self._undefined_locations)
+
+    def load(self, records):
+        """
+        Processes every record and creates the game.
+
+        :param records: The records from which to create the game
+        :type records: iterable of dicts
+        :return: Created game
+        :rtype: Game
+        :raises: ``GameFormatException`` if any record is invalid
+        """
+        loaders = {
+            'direction': self._load_direction,
+            'room': self._load_room,
+            'exit': self._load_exit
+        }
+        for record in records:
+            if not isinstance(record, dict):
+                raise GameFormatException(u'Record must be a dictionary')
+
+            if 'type' not in record:
+                raise GameFormatException(u'Missing type from record')
+
+            record_type = record['type']
+            if record_type not in loaders:
+                message = u'Unknown record type "{0}"'
+                raise GameFormatException(message.format(record_type))
+
+            loaders[record_type](record)
+
+        if self._undefined_locations:
+            _, message = min(self._undefined_locations.values())
+            raise GameFormatException(message)
+
+        if not self._locations:
+            message = u'Records must contain at least one room'
+            raise GameFormatException(message)
+
+        return Game(self._locations)
+
+    def _load_direction(self, record):
+        """
+        Processes a direction record.
+
+        :param dict record: The direction record
+        """
+        _add_direction_pair(record, self._directions)
+
+    def _load_room(self, record):
+        """
+        Processes a room record, including any exits it contains.
+
+        :param dict record: The room record
+        """
+        name, description = _check_location_well_formed(record, self)
+
+        if name in self._undefined_locations:
+            del self._undefined_locations[name]
+            location = self._find_or_create_location(name)
+            self._describe_location(location, description)
+        else:
+            location = self._create_location(name, description)
+            self._locations_by_name[name] = location
+        self._locations.append(location)
+
+        for exit_datum in record.get('exits', ()):
+            self._add_exit(location, exit_datum)
+
+    def _load_exit(self, record):
+        """
+        Processes an exit record.
+
+        :param dict record: The exit record
+        """
+        if 'from' not in record:
+            message = u'Missing from room from exit record'
+            raise GameFormatException(message)
+
+        from_name = record['from']
+        if not isinstance(from_name, str):
+            raise GameFormatException(u'Exit from room must be a string')
+
+        message = u'Unknown exit from room "{0}"'
+        from_location = self._find_location(from_name,
+                                            message.format(from_name))
+        self._add_exit(from_location, record)
+
+    def _add_exit(self, from_location, exit_datum):
+        """
+        Adds an exit to a location.
+
+        :param Location from_location: The location the exit leads from
+        :param dict exit_datum: Details of the exit
+        """
+        from_name = from_location.name
+        to_name, direction_name, one_way = _check_exit_well_formed(
+            exit_datum, from_name)
+
+        direction = self._directions.get(direction_name)
+        if direction is None:
+            message = u'Unknown exit direction "{0}" from room "{1}"'
+            raise GameFormatException(
+                message.format(direction_name, from_name))
+
+        message = u'Unknown exit room "{0}" from "{1}"'
+        to_location = self._find_location(to_name,
+                                          message.format(to_name, from_name))
+        if one_way:
+            from_location.add_one_way_exit(direction, to_location)
+        else:
+            from_location.add_exit(direction, to_location)
+
+    def _find_location(self, name, undefined_message):
+        """
+        Finds a location by name, creating it if it has not been defined.
+
+        :param string name: The name of the location to find
+        :param string undefined_message: The error to report if this is the
+            first reference to the location and it is never defined
+        :return: The found location
+        :rtype: Location
+        """
+        if name not in self._locations_by_name:
+            position = self._undefined_location_count
+            self._undefined_location_count += 1
+            self._undefined_locations[name] = (position, undefined_message)
+        return self._find_or_create_location(name)
+
+    def _find_or_create_location(self, name):
+        """
+        Finds a location by name, creating it with no description if it
+        does not yet exist.
+
+        :param string name: The name of the location to find
+        :return: The found location
+        :rtype: Location
+        """
+        location = self._locations_by_name.get(name)
+        if location is None:
+            location = self._create_location(name)
+            self._locations_by_name[name] = location
+        return location
+
+    def _create_location(self, name, description=''):
+        """
+        Creates a location for a room.
+
+        :param string name: The name of the room
+        :param string description: The description of the room
+        :return: Created location
+        :rtype: Location
+        """
+        return Location(name, description)
+
+    def _describe_location(self, location, description):
+        # Disable 'Access to a protected member _description of a client
+        # class'
+        # pylint: disable=W0212
+        """
+        Describes a location created before its room was defined, as the
+        next room.
+
+        :param Location location: The location
+        :param string description: The description of the room
+        """
+        location._description = description
+
+
+def create_game_from_records(records):
+    """
+    Creates a game from a stream of records.
+
+    :param records: The records from which to create the game
+    :type records: iterable of dicts
+    :return: Created game
+    :rtype: Game
+    :raises: ``GameFormatException`` if any record is invalid
+
+    Each record is a dictionary with a ``'type'`` key whose value is one
+    of ``'direction'``, ``'room'`` or ``'exit'``. The other keys of a record
+    are the same as those of the corresponding dictionary in ``game_data``
+    (see run_game), except that an exit record also has a ``'from'`` key
+    whose value is the ``'name'`` of the room the exit leads from. A room
+    record may still contain its own ``'exits'`` list.
+
+    A direction must be defined before any exit which uses it, but exits may
+    lead to (or from) rooms which are defined later in the stream. The first
+    room record defines the room in which the player's character starts.
+
+    Records are processed one at a time and are not retained, so a world
+    can be loaded from a source far larger than the memory it occupies once
+    it has been built::
+
+        vengeance.create_game_from_records([
+            {'type': 'direction', 'name': 'up', 'opposite': 'down'},
+            {'type': 'room', 'name': 'A Church',
+             'description': 'Tiny place of worship'},
+            {'type': 'exit', 'from': 'A Church', 'to': 'The Crypt',
+             'direction': 'down'},
+            {'type': 'room', 'name': 'The Crypt',
+             'description': 'Dusty tomb filled with empty sarcophagi'}
+        ])
+
+    """
+    loader = _RecordLoader()
+    return _without_garbage_collection(loader.load, records)
+
+
+def _json_records(lines):
+    """
+    Decodes JSON Lines into records.
+
+    :param lines: The lines to decode
+    :type lines: iterable of strings
+    :return: The decoded records, skipping blank lines
+    :rtype: iterator of dicts
+    :raises: ``GameFormatException`` if a line is not valid JSON
+    """
+    for line_number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+
+        try:
+            yield json.loads(line, object_hook=_native_strings)
+        except ValueError:
+            message = u'Invalid JSON on line {0}'
+            raise GameFormatException(message.format(line_number))
+
+
+def _native_strings(json_object):
+    """
+    Converts the strings in a decoded JSON object to native strings, as
+    required by the checks on game data (which on Python 2 are not the
+    unicode strings the JSON decoder produces).
+
+    :param dict json_object: The decoded JSON object
+    :return: The object with native string keys and values
+    :rtype: dict
+    """
+    if str is not bytes:
+        return json_object
+
+    return dict((_native_string(key), _native_string(value))
+                for key, value in json_object.items())
+
+
+def _native_string(value):
+    """
+    Converts a decoded JSON value to a native string on Python 2.
+
+    :param value: The value to convert
+    :return: ``value`` as a UTF-8 encoded string if it is a unicode string
+        or ``value`` itself otherwise
+    """
+    if isinstance(value, _TEXT_TYPE):
+        return value.encode('utf-8')
+    if isinstance(value, list):
+        return [_native_string(item) for item in value]
+    return value
+
+
+def create_game_from_json_lines(lines):
+    """
+    Creates a game from records in JSON Lines format.
+
+    :param lines: The lines containing one JSON encoded record each (see
+        create_game_from_records). Blank lines are ignored
+    :type lines: iterable of strings, such as an open file
+    :return: Created game
+    :rtype: Game
+    :raises: ``GameFormatException`` if any line or record is invalid
+    """
+    return create_game_from_records(_json_records(lines))
 
 
 def run_game(game_data):
@@ -0,0 +1,176 @@
+"""
+Running games on an asyncio event loop (Python 3.5 and later only).
+"""
+import asyncio
+
+from vengeance.profiling import DISPLAY
+from vengeance.profiling import END_OF_ROUND
+from vengeance.profiling import INPUT
+from vengeance.profiling import PROCESS_INPUT
+from vengeance.profiling import QUIT
+from vengeance.profiling import RENDER
+
+
+async def run_game(game):
+    # Disable 'Access to a protected member _pending_quit of a client class'
+    # Disable 'Access to a protected member _render_location of a client
+    # class'
+    # Disable 'Access to a protected member _flush_display of a client class'
+    # pylint: disable=W0212
+    """
+    Runs a game, awaiting its asynchronous handlers (see Game.run_async).
+
+    :param Game game: The game to run
+    """
+    display_handler = game.async_display_handler or _display_adapter(game)
+    input_handler = game.async_input_handler or _input_adapter(game)
+    quit_handler = game.async_quit_handler or _quit_adapter(game)
+    end_of_round_handler = (game.async_end_of_round_handler or
+                            _end_of_round_adapter(game))
+
+    async def read_input():
+        """
+        Retrieves input, first flushing the game's display handler so the
+        user sees any buffered output.
+        """
+        game._flush_display()
+        return await input_handler()
+
+    profiler = game.profiler
+    game._pending_quit = False
+    try:
+        while True:
+            if profiler is not None:
+                profiler.start_round()
+
+            current_location = game.character.current_location
+            rendered_location = game._render_location(current_location)
+            if profiler is not None:
+                profiler.end_phase(RENDER)
+            await display_handler(rendered_location)
+            if profiler is not None:
+                profiler.end_phase(DISPLAY)
+
+            user_input = await read_input()
+            if profiler is not None:
+                profiler.end_phase(INPUT)
+            game.process_input(user_input)
+            if profiler is not None:
+                profiler.end_phase(PROCESS_INPUT)
+            if game._pending_quit:
+                game._pending_quit = False
+                game.should_end = await quit_handler(display_handler,
+                                                     read_input)
+                if profiler is not None:
+                    profiler.end_phase(QUIT)
+
+            await end_of_round_handler(game)
+            if profiler is not None:
+                profiler.end_phase(END_OF_ROUND)
+                profiler.end_round()
+
+            if game.should_end:
+                break
+    finally:
+        game._pending_quit = None
+        game._flush_display()
+
+
+def _running_loop():
+    """
+    :return: The event loop running the current coroutine
+    :rtype: asyncio.AbstractEventLoop
+    """
+    # get_running_loop was added in Python 3.7; before then get_event_loop
+    # returns the running loop when called from a coroutine
+    get_running_loop = getattr(asyncio, 'get_running_loop', None)
+    if get_running_loop is None:
+        return asyncio.get_event_loop()
+    return get_running_loop()
+
+
+def _display_adapter(game):
+    """
+    :param Game game: The game being run
+    :return: An asynchronous display handler which calls the game's
+        display handler
+    :rtype: function
+    """
+    async def display_handler(text):
+        """
+        Displays text using the game's display handler.
+        """
+        game.display_handler(text)
+
+    return display_handler
+
+
+def _input_adapter(game):
+    """
+    :param Game game: The game being run
+    :return: An asynchronous input handler which calls the game's input
+        handler in the event loop's default executor, as it may block
+    :rtype: function
+    """
+    async def input_handler():
+        """
+        Retrieves input using the game's input handler.
+        """
+        loop = _running_loop()
+        return await loop.run_in_executor(None, game.input_handler)
+
+    return input_handler
+
+
+def _quit_adapter(game):
+    """
+    :param Game game: The game being run
+    :return: An asynchronous quit handler which asks the user for
+        confirmation if the game's quit handler is the default one, or
+        otherwise calls the game's quit handler in the event loop's default
+        executor
+    :rtype: function
+    """
+    # Disable 'Access to a protected member _default_quit_handler of a
+    # client class'
+    # Disable 'Access to a protected member _read_input of a client class'
+    # pylint: disable=W0212
+    from vengeance import game as game_module
+
+    if game.quit_handler is not game_module._default_quit_handler:
+        async def quit_handler(_, __):
+            """
+            Determines whether to quit using the game's quit handler.
+            """
+            loop = _running_loop()
+            return await loop.run_in_executor(
+                None, game.quit_handler, game.display_handler,
+                game._read_input)
+
+        return quit_handler
+
+    async def confirm_quit(display_handler, input_handler):
+        """
+        Asks the user to confirm that they want to quit.
+        """
+        await display_handler('Are you sure you want to quit?')
+        quit_input = await input_handler()
+        return quit_input == 'y' or quit_input == 'yes'
+
+    return confirm_quit
+
+
+def _end_of_round_adapter(game):
+    """
+    :param Game game: The game being run
+    :return: An asynchronous end of round handler which calls the game's
+        end of round handler
+    :rtype: function
+    """
+    async def end_of_round_handler(_):
+        """
+        Calls the game's end of round handler.
+        """
+        game.end_of_round_handler(game)
+
+    return end_of_round_handler
@@ -0,0 +1,198 @@
+"""
+Checking the integrity of worlds.
+
+An analysis finds the parts of a world in which a player could never be, or
+could become stuck: locations which cannot be reached from the starting
+location, groups of locations which can be entered but never left (sink
+components) and locations with no exits (dead ends). It takes time linear
+in the number of locations and exits, so is cheap enough to run whenever a
+world is loaded.
+"""
+from array import array
+
+from vengeance.graph import LocationGraph
+
+
+class WorldAnalysis(object):
+    """
+    The results of analysing a world.
+
+    :param list unreachable_locations: The locations which cannot be
+        reached from the starting location
+    :param list sink_components: The groups of locations which can be
+        entered but not left
+    :param list dead_ends: The locations with no exits
+    """
+    def __init__(self, unreachable_locations, sink_components, dead_ends):
+        self._unreachable_locations = unreachable_locations
+        self._sink_components = sink_components
+        self._dead_ends = dead_ends
+
+    @property
+    def unreachable_locations(self):
+        """
+        The locations which cannot be reached from the starting location.
+
+        :getter: Returns the unreachable locations, in the order of the
+            game's locations
+        :type: list of Location objects
+        """
+        return self._unreachable_locations
+
+    @property
+    def sink_components(self):
+        """
+        The groups of locations which can be reached from the starting
+        location but from which the starting location cannot be reached
+        again, and which have no exits to other locations. Each group is a
+        strongly connected component of the world: any of its locations can
+        be reached from any other.
+
+        :getter: Returns the sink components, each in the order of the
+            game's locations
+        :type: list of lists of Location objects
+        """
+        return self._sink_components
+
+    @property
+    def dead_ends(self):
+        """
+        The locations which can be reached from the starting location and
+        have no exits.
+
+        :getter: Returns the dead ends, in the order of the game's locations
+        :type: list of Location objects
+        """
+        return self._dead_ends
+
+    @property
+    def is_sound(self):
+        """
+        Whether every location can be reached from the starting location and
+        the starting location can be reached from every location.
+
+        :getter: Returns True if the analysis found no problems
+        :type: bool
+        """
+        return not (self._unreachable_locations or self._sink_components or
+                    self._dead_ends)
+
+
+def analyse_world(game):
+    # Disable 'Access to a protected member _locations of a client class'
+    # pylint: disable=W0212
+    """
+    Analyses the world of a game from its starting location.
+
+    :param Game game: The game whose world to analyse
+    :return: The results of the analysis
+    :rtype: WorldAnalysis
+    """
+    graph = LocationGraph(game)
+    try:
+        start_id = graph.location_id(game.world.starting_location)
+        # Only the game's own locations are reported, not locations outside
+        # it which are reached by an exit
+        location_count = len(game.world._locations)
+        offsets, targets, _ = graph.adjacency()
+        reachable = graph.reachable(start_id)
+        components, component_count = strongly_connected_components(graph)
+        locations = [graph.location(location_id)
+                     for location_id in range(graph.location_count)]
+    finally:
+        graph.close()
+
+    leaves = bytearray(component_count)
+    for location_id in range(len(locations)):
+        component = components[location_id]
+        for index in range(offsets[location_id], offsets[location_id + 1]):
+            if components[targets[index]] != component:
+                leaves[component] = 1
+                break
+
+    unreachable_locations = [locations[location_id]
+                             for location_id in range(location_count)
+                             if not reachable[location_id]]
+    dead_ends = [locations[location_id]
+                 for location_id in range(len(locations))
+                 if reachable[location_id] and
+                 offsets[location_id] == offsets[location_id + 1]]
+    sinks = {}
+    start_component = components[start_id]
+    for location_id in range(len(locations)):
+        component = components[location_id]
+        if (reachable[location_id] and not leaves[component] and
+                component != start_component):
+            sinks.setdefault(component, []).append(location_id)
+    sink_components = [[locations[location_id] for location_id in sink]
+                       for sink in sorted(sinks.values())]
+
+    return WorldAnalysis(unreachable_locations, sink_components, dead_ends)
+
+
+def strongly_connected_components(graph):
+    # Disable 'Too many local variables'
+    # pylint: disable=R0914
+    """
+    Finds the strongly connected components of a location graph: the
+    largest groups of locations in which any location can be reached from
+    any other.
+
+    Uses Tarjan's algorithm, without recursion so that long chains of
+    locations cannot exhaust the stack. Components are numbered in reverse
+    topological order, so no exit leads from a component to one with a
+    larger number.
+
+    :param LocationGraph graph: The graph
+    :return: The component of each location, indexed by location id, and
+        the number of components
+    :rtype: tuple of array and int
+    """
+    offsets, targets, _ = graph.adjacency()
+    location_count = graph.location_count
+    unvisited = -1
+    order = array('i', [unvisited]) * location_count
+    lowest = array('i', [0]) * location_count
+    components = array('i', [unvisited]) * location_count
+    next_exit = offsets[:-1]
+    on_stack = bytearray(location_count)
+    stack = []
+    visit_count = 0
+    component_count = 0
+
+    for root in range(location_count):
+        if order[root] != unvisited:
+            continue
+        order[root] = lowest[root] = visit_count
+        visit_count += 1
+        stack.append(root)
+        on_stack[root] = 1
+        path = [root]
+        while path:
+            location_id = path[-1]
+            index = next_exit[location_id]
+            if index < offsets[location_id + 1]:
+                next_exit[location_id] = index + 1
+                target = targets[index]
+                if order[target] == unvisited:
+                    order[target] = lowest[target] = visit_count
+                    visit_count += 1
+                    stack.append(target)
+                    on_stack[target] = 1
+                    path.append(target)
+                elif on_stack[target] and order[target] < lowest[location_id]:
+                    lowest[location_id] = order[target]
+                continue
+
+            path.pop()
+            if lowest[location_id] == order[location_id]:
+                member = None
+                while member != location_id:
+                    member = stack.pop()
+                    on_stack[member] = 0
+                    components[member] = component_count
+                component_count += 1
+            if path and lowest[location_id] < lowest[path[-1]]:
+                lowest[path[-1]] = lowest[location_id]
+
+    return components, component_count
@@ -0,0 +1,593 @@
+"""
+Compiled worlds.
+
+A compiled world stores the locations, descriptions, directions and exits
+of a game in packed tables within a single binary file. The file is loaded
+by memory-mapping it, so loading takes the same time however large the
+world is, descriptions are only decoded when they are read and processes
+which load the same file share its pages.
+"""
+import array
+import mmap
+import struct
+import sys
+import zlib
+
+import vengeance
+from vengeance.game import Direction
+from vengeance.game import Game
+from vengeance.game import GameFormatException
+from vengeance.game import Location
+
+_MAGIC = b'VNGW'
+_VERSION = 1
+
+# Magic, version, counts of directions, locations, exits and name hash
+# buckets, then the offsets of the direction, location, exit, bucket and
+# string tables
+_HEADER = struct.Struct('<4sIIIIIQQQQQ')
+
+# Name offset, name length and opposite direction index (-1 if none)
+_DIRECTION = struct.Struct('<QIi')
+
+# Name offset, name length, description offset, description length, index
+# of first exit and number of exits
+_LOCATION = struct.Struct('<QIQIII')
+
+# Direction index and index of the location to which the exit leads
+_EXIT = struct.Struct('<II')
+
+# Location index plus one (zero for an empty bucket)
+_BUCKET = struct.Struct('<I')
+
+
+def _encode(text):
+    """
+    Encodes a string for storage.
+
+    :param string text: The string to encode
+    :return: The UTF-8 encoding of ``text``
+    :rtype: bytes
+    """
+    if isinstance(text, bytes):
+        return text
+    return text.encode('utf-8')
+
+
+def _decode(data):
+    """
+    Decodes a stored string.
+
+    :param bytes data: The UTF-8 encoded string
+    :return: The decoded string
+    :rtype: string
+    """
+    if str is bytes:
+        return data
+    return data.decode('utf-8')
+
+
+def _name_hash(encoded_name):
+    """
+    Hashes a location name, consistently across processes and platforms.
+
+    :param bytes encoded_name: The UTF-8 encoded name
+    :return: The hash of the name
+    :rtype: int
+    """
+    return zlib.crc32(encoded_name) & 0xffffffff
+
+
+def _pack_buckets(buckets):
+    """
+    Packs the location name hash table.
+
+    :param list buckets: The entry of each bucket
+    :return: The entries packed as little-endian unsigned 32-bit integers
+    :rtype: bytes
+    """
+    packed = array.array('I', buckets)
+    if packed.itemsize != _BUCKET.size:
+        # Unsigned ints are not 32 bits wide on this platform
+        packed = array.array('B', b'\x00' * (len(buckets) * _BUCKET.size))
+        for index, bucket in enumerate(buckets):
+            _BUCKET.pack_into(packed, index * _BUCKET.size, bucket)
+    elif sys.byteorder != 'little':
+        packed.byteswap()
+
+    # Python 2 arrays have tostring rather than tobytes
+    to_bytes = getattr(packed, 'tobytes', None) or packed.tostring
+    return to_bytes()
+
+
+def _bucket_count(location_count):
+    """
+    Determines the size of the location name hash table.
+
+    :param int location_count: The number of locations in the world
+    :return: A power of two at least twice ``location_count``
+    :rtype: int
+    """
+    bucket_count = 1
+    while bucket_count < 2 * location_count:
+        bucket_count *= 2
+    return bucket_count
+
+
+class _StringTable(object):
+    """
+    A pool of encoded strings, each referred to by offset and length.
+    """
+    def __init__(self):
+        self._chunks = []
+        self._size = 0
+
+    def add(self, text):
+        """
+        Adds a string to the pool.
+
+        :param string text: The string to add
+        :return: The offset and length of the encoded string
+        :rtype: tuple
+        """
+        encoded = _encode(text)
+        offset = self._size
+        self._chunks.append(encoded)
+        self._size += len(encoded)
+        return offset, len(encoded)
+
+    def to_bytes(self):
+        """
+        :return: The encoded strings
+        :rtype: bytes
+        """
+        return b''.join(self._chunks)
+
+
+def _direction_indexes(locations):
+    """
+    Numbers the directions of the exits from some locations.
+
+    :param list locations: The locations
+    :return: The directions in the order numbered, and their indexes
+        keyed by direction
+    :rtype: tuple
+    """
+    directions = []
+    indexes = {}
+
+    def add(direction):
+        """
+        Numbers a direction if it has not already been numbered.
+        """
+        if direction is not None and direction not in indexes:
+            indexes[direction] = len(directions)
+            directions.append(direction)
+            add(direction.opposite)
+
+    for location in locations:
+        for an_exit in location.exits:
+            add(an_exit.direction)
+
+    return directions, indexes
+
+
+def compile_world(source):
+    """
+    Compiles a world.
+
+    :param source: The game to compile, or details of a game from which one
+        can be created (see vengeance.run_game)
+    :type source: Game or dict
+    :return: The compiled world
+    :rtype: bytes
+    :raises: ``GameFormatException`` if ``source`` is an invalid
+        dictionary
+    """
+    if isinstance(source, Game):
+        game = source
+    else:
+        game = vengeance.create_game(source)
+
+    # Disable 'Access to a protected member _without_garbage_collection
+    # of a client class'
+    # pylint: disable=W0212
+    return vengeance._without_garbage_collection(_compile_game, game)
+
+
+def _compile_game(game):
+    # Disable 'Access to a protected member _locations of a client class'
+    # pylint: disable=W0212
+    """
+    Compiles a game (see compile_world).
+
+    :param Game game: The game to compile
+    :return: The compiled world
+    :rtype: bytes
+    """
+    locations = game.world._locations
+    location_indexes = dict(
+        (location, index) for index, location in enumerate(locations))
+    directions, direction_indexes = _direction_indexes(locations)
+    strings = _StringTable()
+
+    direction_table = []
+    for direction in directions:
+        name_offset, name_length = strings.add(direction.name)
+        opposite_index = direction_indexes.get(direction.opposite, -1)
+        direction_table.append(
+            _DIRECTION.pack(name_offset, name_length, opposite_index))
+
+    bucket_count = _bucket_count(len(locations))
+    buckets = [0] * bucket_count
+    location_table = []
+    exit_table = []
+    for index, location in enumerate(locations):
+        name_offset, name_length = strings.add(location.name)
+        description_offset, description_length = strings.add(
+            location.description)
+        exits = location.exits
+        location_table.append(_LOCATION.pack(
+            name_offset, name_length, description_offset,
+            description_length, len(exit_table), len(exits)))
+        for an_exit in exits:
+            to_index = location_indexes.get(an_exit.to_location)
+            if to_index is None:
+                message = u'Exit to location "{0}" outside the game'
+                raise ValueError(message.format(an_exit.to_location.name))
+            exit_table.append(_EXIT.pack(
+                direction_indexes[an_exit.direction], to_index))
+
+        bucket = _name_hash(_encode(location.name)) & (bucket_count - 1)
+        while buckets[bucket]:
+            bucket = (bucket + 1) & (bucket_count - 1)
+        buckets[bucket] = index + 1
+
+    tables = [
+        b''.join(direction_table),
+        b''.join(location_table),
+        b''.join(exit_table),
+        _pack_buckets(buckets),
+        strings.to_bytes()
+    ]
+    offsets = []
+    offset = _HEADER.size
+    for table in tables:
+        offsets.append(offset)
+        offset += len(table)
+
+    header = _HEADER.pack(_MAGIC, _VERSION, len(directions), len(locations),
+                          len(exit_table), bucket_count, *offsets)
+    return header + b''.join(tables)
+
+
+def save_compiled_world(source, path):
+    """
+    Compiles a world and writes it to a file.
+
+    :param source: The game to compile, or details of a game from which one
+        can be created (see vengeance.run_game)
+    :type source: Game or dict
+    :param string path: The path of the file to write
+    :raises: ``GameFormatException`` if ``source`` is an invalid
+        dictionary
+    """
+    compiled = compile_world(source)
+    with open(path, 'wb') as compiled_file:
+        compiled_file.write(compiled)
+
+
+def load_compiled_world(path):
+    """
+    Loads a compiled world from a file by memory-mapping it.
+
+    :param string path: The path of the file written by save_compiled_world
+    :return: The loaded world, which should be closed when no longer needed
+    :rtype: CompiledWorld
+    :raises: ``GameFormatException`` if the file is not a compiled world
+    """
+    with open(path, 'rb') as compiled_file:
+        data = mmap.mmap(compiled_file.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        return CompiledWorld(data)
+    except GameFormatException:
+        data.close()
+        raise
+
+
+class CompiledWorld(object):
+    """
+    A compiled world, read directly from its packed tables.
+
+    Locations and directions are identified by their index in the world.
+    The first location is the one in which the player's character starts.
+
+    :param data: The compiled world (see compile_world)
+    :type data: bytes or mmap
+    :raises: ``GameFormatException`` if ``data`` is not a compiled world
+    """
+    def __init__(self, data):
+        if len(data) < _HEADER.size:
+            raise GameFormatException(u'Compiled world is truncated')
+
+        header = _HEADER.unpack_from(data, 0)
+        if header[0] != _MAGIC:
+            raise GameFormatException(u'Not a compiled world')
+        if header[1] != _VERSION:
+            message = u'Unsupported compiled world version {0}'
+            raise GameFormatException(message.format(header[1]))
+
+        self._data = data
+        (self._direction_count, self._location_count, self._exit_count,
+         self._bucket_count) = header[2:6]
+        (self._directions_offset, self._locations_offset,
+         self._exits_offset, self._buckets_offset,
+         self._strings_offset) = header[6:]
+        self._check_tables()
+
+    def _check_tables(self):
+        """
+        Checks that the tables described by the header lie, in order, within
+        the compiled world, so that a truncated or corrupt file is rejected
+        when it is loaded rather than when a table is read.
+
+        :raises: ``GameFormatException`` if a table lies outside the compiled
+            world, or the name hash table cannot hold every location
+        """
+        tables = [
+            (self._directions_offset, self._direction_count * _DIRECTION.size),
+            (self._locations_offset, self._location_count * _LOCATION.size),
+            (self._exits_offset, self._exit_count * _EXIT.size),
+            (self._buckets_offset, self._bucket_count * _BUCKET.size),
+            (self._strings_offset, 0)
+        ]
+        end = _HEADER.size
+        for offset, size in tables:
+            if offset < end:
+                raise GameFormatException(u'Compiled world is corrupt')
+            end = offset + size
+        if end > len(self._data):
+            raise GameFormatException(u'Compiled world is truncated')
+
+        # Finding a location stops at an empty bucket, so there must be at
+        # least one, and buckets are found by masking hashes
+        bucket_count = self._bucket_count
+        if (bucket_count <= self._location_count or
+                bucket_count & (bucket_count - 1)):
+            raise GameFormatException(u'Compiled world is corrupt')
+
+    def close(self):
+        """
+        Releases the memory map (if any) from which the world is read.
+        """
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    @property
+    def direction_count(self):
+        """
+        The number of directions in the world.
+
+        :getter: Returns the number of directions
+        :type: int
+        """
+        return self._direction_count
+
+    @property
+    def location_count(self):
+        """
+        The number of locations in the world.
+
+        :getter: Returns the number of locations
+        :type: int
+        """
+        return self._location_count
+
+    @property
+    def exit_count(self):
+        """
+        The number of (one-way) exits in the world.
+
+        :getter: Returns the number of exits
+        :type: int
+        """
+        return self._exit_count
+
+    def _string(self, offset, length):
+        """
+        Decodes a string from the string table.
+
+        :param int offset: The offset of the string in the table
+        :param int length: The encoded length of the string
+        :return: The decoded string
+        :rtype: string
+        """
+        start = self._strings_offset + offset
+        return _decode(self._data[start:start + length])
+
+    def _location(self, location_id):
+        """
+        Reads an entry from the location table.
+
+        :param int location_id: The index of the location
+        :return: The location table entry
+        :rtype: tuple
+        :raises: ``IndexError`` if there is no such location
+        """
+        if not 0 <= location_id < self._location_count:
+            raise IndexError('location_id out of range')
+        offset = self._locations_offset + location_id * _LOCATION.size
+        return _LOCATION.unpack_from(self._data, offset)
+
+    def direction_name(self, direction_id):
+        """
+        Returns the name of a direction.
+
+        :param int direction_id: The index of the direction
+        :return: The name of the direction
+        :rtype: string
+        :raises: ``IndexError`` if there is no such direction
+        """
+        return self._string(*self._direction(direction_id)[:2])
+
+    def direction_opposite(self, direction_id):
+        """
+        Returns the opposite of a direction.
+
+        :param int direction_id: The index of the direction
+        :return: The index of the opposite direction or None if the
+            direction has no opposite
+        :rtype: int
+        :raises: ``IndexError`` if there is no such direction
+        """
+        opposite_id = self._direction(direction_id)[2]
+        if opposite_id < 0:
+            return None
+        return opposite_id
+
+    def _direction(self, direction_id):
+        """
+        Reads an entry from the direction table.
+
+        :param int direction_id: The index of the direction
+        :return: The direction table entry
+        :rtype: tuple
+        :raises: ``IndexError`` if there is no such direction
+        """
+        if not 0 <= direction_id < self._direction_count:
+            raise IndexError('direction_id out of range')
+        offset = self._directions_offset + direction_id * _DIRECTION.size
+        return _DIRECTION.unpack_from(self._data, offset)
+
+    def location_name(self, location_id):
+        """
+        Returns the name of a location.
+
+        :param int location_id: The index of the location
+        :return: The name of the location
+        :rtype: string
+        :raises: ``IndexError`` if there is no such location
+        """
+        return self._string(*self._location(location_id)[:2])
+
+    def location_description(self, location_id):
+        """
+        Returns the description of a location, decoding it as it is read.
+
+        :param int location_id: The index of the location
+        :return: The description of the location
+        :rtype: string
+        :raises: ``IndexError`` if there is no such location
+        """
+        return self._string(*self._location(location_id)[2:4])
+
+    def location_exits(self, location_id):
+        """
+        Returns the exits from a location.
+
+        :param int location_id: The index of the location
+        :return: The index of the direction of each exit and of the location
+            to which it leads
+        :rtype: list of tuples
+        :raises: ``IndexError`` if there is no such location
+        """
+        first_exit, exit_count = self._location(location_id)[4:]
+        offset = self._exits_offset + first_exit * _EXIT.size
+        return [_EXIT.unpack_from(self._data, offset + i * _EXIT.size)
+                for i in range(exit_count)]
+
+    def find_location(self, location_name):
+        """
+        Finds a location by name.
+
+        :param string location_name: The name of the location to find
+        :return: The index of the location or None if it was not found
+        :rtype: int
+        """
+        encoded_name = _encode(location_name)
+        mask = self._bucket_count - 1
+        bucket = _name_hash(encoded_name) & mask
+        while True:
+            offset = self._buckets_offset + bucket * _BUCKET.size
+            location_id = _BUCKET.unpack_from(self._data, offset)[0] - 1
+            if location_id < 0:
+                return None
+
+            name_offset, name_length = self._location(location_id)[:2]
+            start = self._strings_offset + name_offset
+            if self._data[start:start + name_length] == encoded_name:
+                return location_id
+
+            bucket = (bucket + 1) & mask
+
+    def create_game(self):
+        """
+        Creates a game from the world.
+
+        The descriptions of the game's locations are not decoded until they
+        are read, so the world must remain open while the game is played.
+
+        :return: Created game
+        :rtype: Game
+        """
+        # Disable 'Access to a protected member _without_garbage_collection
+        # of a client class'
+        # pylint: disable=W0212
+        return vengeance._without_garbage_collection(self._create_game)
+
+    def _create_game(self):
+        """
+        Creates a game from the world (see create_game).
+
+        :return: Created game
+        :rtype: Game
+        """
+        directions = [Direction(self.direction_name(direction_id))
+                      for direction_id in range(self._direction_count)]
+        for direction_id, direction in enumerate(directions):
+            opposite_id = self.direction_opposite(direction_id)
+            if opposite_id is not None and direction.opposite is None:
+                direction.opposite = directions[opposite_id]
+
+        locations = [_CompiledLocation(self, location_id)
+                     for location_id in range(self._location_count)]
+        for location_id, location in enumerate(locations):
+            for direction_id, to_id in self.location_exits(location_id):
+                location.add_one_way_exit(directions[direction_id],
+                                          locations[to_id])
+
+        return Game(locations)
+
+
+class _CompiledLocation(Location):
+    """
+    A location whose description is read from a compiled world.
+
+    :param CompiledWorld world: The world containing the location
+    :param int location_id: The index of the location in the world
+    """
+    __slots__ = ('_world', '_location_id')
+
+    _keeps_rendered = False
+
+    def __init__(self, world, location_id):
+        super(_CompiledLocation, self).__init__(
+            world.location_name(location_id))
+        self._world = world
+        self._location_id = location_id
+
+    @property
+    def description(self):
+        """
+        The description of the location.
+
+        :getter: Returns the location description
+        :type: string
+        """
+        return self._world.location_description(self._location_id)
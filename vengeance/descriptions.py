@@ -0,0 +1,312 @@
+"""
+Location descriptions stored outside memory.
+
+In a large world most of the memory used by locations is taken by their
+descriptions, although a player only ever reads those of the few locations
+they visit. The descriptions can instead be saved to a file holding an index
+of their offsets followed by their text, and read back only when they are
+needed. The file is memory-mapped, and a bounded cache of the most recently
+read descriptions is kept, so the memory a game uses depends on the
+locations its players are in rather than on the size of the world.
+
+Games whose locations read their descriptions from a store are created
+from the same records (or JSON Lines) as the game the descriptions were
+saved from, so the descriptions are never all held in memory at once.
+"""
+import collections
+import mmap
+import struct
+
+import vengeance
+from vengeance import _RecordLoader
+from vengeance.compiled import _decode
+from vengeance.compiled import _encode
+from vengeance.game import GameFormatException
+from vengeance.game import Location
+
+_MAGIC = b'VNGD'
+_VERSION = 1
+
+# Magic, version and number of descriptions
+_HEADER = struct.Struct('<4sII')
+
+# Offset and length of the description within the text
+_INDEX = struct.Struct('<QI')
+
+_DEFAULT_CACHE_SIZE = 1024
+
+
+def save_descriptions(game, path):
+    # Disable 'Access to a protected member _locations of a client class'
+    # pylint: disable=W0212
+    """
+    Writes the descriptions of the locations in a game to a file.
+
+    The descriptions are stored in the order of the locations in the game's
+    world, and are read back with load_descriptions.
+
+    :param Game game: The game whose descriptions to write
+    :param string path: The path of the file to write
+    """
+    index = []
+    text = []
+    offset = 0
+    for location in game.world._locations:
+        encoded = _encode(location.description)
+        index.append(_INDEX.pack(offset, len(encoded)))
+        text.append(encoded)
+        offset += len(encoded)
+
+    with open(path, 'wb') as descriptions_file:
+        descriptions_file.write(_HEADER.pack(_MAGIC, _VERSION, len(index)))
+        descriptions_file.write(b''.join(index))
+        descriptions_file.write(b''.join(text))
+
+
+def load_descriptions(path, cache_size=_DEFAULT_CACHE_SIZE):
+    """
+    Loads descriptions written by save_descriptions by memory-mapping their
+    file.
+
+    :param string path: The path of the file
+    :param int cache_size: The number of decoded descriptions to keep
+    :return: The loaded descriptions, which should be closed when no longer
+        needed
+    :rtype: DescriptionStore
+    :raises: ``GameFormatException`` if the file does not hold descriptions
+    """
+    with open(path, 'rb') as descriptions_file:
+        data = mmap.mmap(descriptions_file.fileno(), 0,
+                         access=mmap.ACCESS_READ)
+    try:
+        return DescriptionStore(data, cache_size)
+    except GameFormatException:
+        data.close()
+        raise
+
+
+class DescriptionStore(object):
+    """
+    Descriptions read as they are needed from the contents of a file written
+    by save_descriptions.
+
+    The most recently read descriptions are kept, decoded, so that the
+    descriptions of the locations which players are in are not read again
+    every round.
+
+    :param data: The contents of the file
+    :type data: bytes or mmap
+    :param int cache_size: The number of decoded descriptions to keep
+    :raises: ``ValueError`` if ``cache_size`` is negative
+    :raises: ``GameFormatException`` if ``data`` does not hold descriptions
+    """
+    def __init__(self, data, cache_size=_DEFAULT_CACHE_SIZE):
+        if cache_size < 0:
+            raise ValueError(u'cache_size must not be negative')
+
+        if len(data) < _HEADER.size:
+            raise GameFormatException(u'Descriptions are truncated')
+
+        magic, version, count = _HEADER.unpack_from(data, 0)
+        if magic != _MAGIC:
+            raise GameFormatException(u'Not a descriptions file')
+        if version != _VERSION:
+            message = u'Unsupported descriptions version {0}'
+            raise GameFormatException(message.format(version))
+        if len(data) < _HEADER.size + count * _INDEX.size:
+            raise GameFormatException(u'Descriptions are truncated')
+
+        self._data = data
+        self._count = count
+        self._text_offset = _HEADER.size + count * _INDEX.size
+        self._cache_size = cache_size
+        # Decoded descriptions keyed by index, least recently read first
+        self._cache = collections.OrderedDict()
+
+    def close(self):
+        """
+        Releases the memory map (if any) from which descriptions are read.
+        """
+        self._cache.clear()
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def cached_count(self):
+        """
+        The number of decoded descriptions currently kept.
+
+        :getter: Returns the number of cached descriptions
+        :type: int
+        """
+        return len(self._cache)
+
+    def description(self, index):
+        """
+        Returns a description, reading it if it is not cached.
+
+        :param int index: The index of the description, which is that of its
+            location in the saved game's world
+        :return: The description
+        :rtype: string
+        :raises: ``IndexError`` if there is no such description
+        """
+        cache = self._cache
+        if index in cache:
+            description = cache.pop(index)
+            cache[index] = description
+            return description
+
+        if not 0 <= index < self._count:
+            raise IndexError('index out of range')
+        offset, length = _INDEX.unpack_from(
+            self._data, _HEADER.size + index * _INDEX.size)
+        start = self._text_offset + offset
+        description = _decode(self._data[start:start + length])
+
+        if self._cache_size:
+            if len(cache) >= self._cache_size:
+                cache.popitem(last=False)
+            cache[index] = description
+        return description
+
+
+def create_game_from_records(records, store):
+    """
+    Creates a game from a stream of records (see
+    vengeance.create_game_from_records), whose locations read their
+    descriptions from a store rather than holding them.
+
+    The descriptions must have been saved from a game created from the same
+    rooms, in the same order. The descriptions in the room records are
+    checked as usual but are not kept. The store must remain open while the
+    game is played.
+
+    :param records: The records from which to create the game
+    :type records: iterable of dicts
+    :param DescriptionStore store: The saved descriptions
+    :return: Created game
+    :rtype: Game
+    :raises: ``GameFormatException`` if any record is invalid
+    :raises: ``ValueError`` if the number of descriptions in the store is
+        not the number of rooms
+    """
+    # Disable 'Access to a protected member _without_garbage_collection
+    # of a client class'
+    # pylint: disable=W0212
+    loader = _StoredDescriptionLoader(store)
+    return vengeance._without_garbage_collection(loader.load, records)
+
+
+def create_game_from_json_lines(lines, store):
+    """
+    Creates a game from JSON Lines (see
+    vengeance.create_game_from_json_lines), whose locations read their
+    descriptions from a store rather than holding them (see
+    create_game_from_records).
+
+    :param lines: The lines from which to create the game
+    :type lines: iterable of strings
+    :param DescriptionStore store: The saved descriptions
+    :return: Created game
+    :rtype: Game
+    :raises: ``GameFormatException`` if a line is not valid JSON or any
+        record is invalid
+    :raises: ``ValueError`` if the number of descriptions in the store is
+        not the number of rooms
+    """
+    # Disable 'Access to a protected member _json_records of a client class'
+    # pylint: disable=W0212
+    return create_game_from_records(vengeance._json_records(lines), store)
+
+
+class _StoredDescriptionLoader(_RecordLoader):
+    """
+    Builds a game from a stream of records, creating locations which read
+    their descriptions from a store.
+
+    :param DescriptionStore store: The saved descriptions
+    """
+    def __init__(self, store):
+        super(_StoredDescriptionLoader, self).__init__()
+        self._store = store
+
+    def load(self, records):
+        """
+        Processes every record and creates the game.
+
+        :param records: The records from which to create the game
+        :type records: iterable of dicts
+        :return: Created game
+        :rtype: Game
+        :raises: ``GameFormatException`` if any record is invalid
+        :raises: ``ValueError`` if the number of descriptions in the store
+            is not the number of rooms
+        """
+        game = super(_StoredDescriptionLoader, self).load(records)
+        if len(self._store) != len(self._locations):
+            message = u'Store holds {0} descriptions for {1} rooms'
+            raise ValueError(message.format(len(self._store),
+                                            len(self._locations)))
+        return game
+
+    def _create_location(self, name, description=''):
+        """
+        Creates a location for a room, reading its description from the
+        store as that of the next room.
+
+        :param string name: The name of the room
+        :param string description: The description of the room (not kept)
+        :return: Created location
+        :rtype: Location
+        """
+        return _StoredLocation(name, self._store, len(self._locations))
+
+    def _describe_location(self, location, description):
+        # Disable 'Access to a protected member _index of a client class'
+        # pylint: disable=W0212
+        """
+        Describes a location created before its room was defined, as the
+        next room.
+
+        :param Location location: The location
+        :param string description: The description of the room (not kept)
+        """
+        location._index = len(self._locations)
+
+
+class _StoredLocation(Location):
+    """
+    A location whose description is read from a description store.
+
+    :param string name: The unique name of the location
+    :param DescriptionStore store: The store holding the description
+    :param int index: The index of the description in the store
+    """
+    __slots__ = ('_store', '_index')
+
+    _keeps_rendered = False
+
+    def __init__(self, name, store, index):
+        super(_StoredLocation, self).__init__(name)
+        self._store = store
+        self._index = index
+
+    @property
+    def description(self):
+        """
+        The description of the location.
+
+        :getter: Returns the location description
+        :type: string
+        """
+        return self._store.description(self._index)
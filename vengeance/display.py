@@ -0,0 +1,94 @@
+"""
+Buffered display.
+
+By default a game displays each piece of text as soon as it is produced,
+which over a network means a separate write for the location, for each
+command's output and for the end of round handler's output. A buffered
+display collects the text instead and writes it in one go: a game flushes
+its display handler before it asks for input and when it ends, so a player
+costs one write per round.
+"""
+import sys
+import time
+
+
+def _write_to_stdout(text):
+    """
+    Writes text to standard output.
+
+    :param string text: The text to write
+    """
+    sys.stdout.write(text)
+    sys.stdout.flush()
+
+
+class BufferedDisplay(object):
+    """
+    A display handler (see Game.display_handler) which collects the text
+    displayed and writes it in batches.
+
+    Text is written when the buffer is flushed: by the game, before it asks
+    for input and when it ends, and also as soon as either limit below is
+    exceeded, if given.
+
+    :param function write: The function which writes text, taking a single
+        string parameter (by default the text is written to standard
+        output)
+    :param int max_size: The number of characters which may be buffered
+        before they are written (by default there is no limit)
+    :param float max_delay: The number of seconds for which text may be
+        buffered before it is written, checked whenever text is displayed
+        (by default there is no limit)
+    :param function clock: The function returning the current time in
+        seconds (by default ``time.time``)
+    """
+    def __init__(self, write=None, max_size=None, max_delay=None,
+                 clock=time.time):
+        self._write = write or _write_to_stdout
+        self._max_size = max_size
+        self._max_delay = max_delay
+        self._clock = clock
+        self._parts = []
+        self._size = 0
+        self._first_buffered_at = None
+
+    def __call__(self, text):
+        """
+        Buffers text, as a line, flushing the buffer if a limit is exceeded.
+
+        :param string text: The text to display
+        """
+        if not self._parts and self._max_delay is not None:
+            self._first_buffered_at = self._clock()
+        self._parts.append(text)
+        self._parts.append(u'\n')
+        self._size += len(text) + 1
+
+        if self._max_size is not None and self._size >= self._max_size:
+            self.flush()
+        elif (self._max_delay is not None and
+              self._clock() - self._first_buffered_at >= self._max_delay):
+            self.flush()
+
+    @property
+    def buffered_size(self):
+        """
+        The number of characters buffered and not yet written.
+
+        :getter: Returns the number of buffered characters
+        :type: int
+        """
+        return self._size
+
+    def flush(self):
+        """
+        Writes any buffered text, in a single call to the write function.
+        """
+        if not self._parts:
+            return
+
+        text = u''.join(self._parts)
+        self._parts = []
+        self._size = 0
+        self._first_buffered_at = None
+        self._write(text)
@@ -3,6 +3,68 @@ Text adventure game engine.
 """
 from __future__ import print_function
 
+import bisect
+
+from vengeance.profiling import DISPLAY
+from vengeance.profiling import END_OF_ROUND
+from vengeance.profiling import INPUT
+from vengeance.profiling import PROCESS_INPUT
+from vengeance.profiling import RENDER
+
+
+class _SymbolTable(object):
+    """
+    The names of directions and commands, shared by every world.
+
+    Each distinct name is held once however many directions and commands
+    use it, so worlds created from separately loaded data (each with its
+    own copy of every name) do not keep their own copies, and matching a
+    name found in an index against the name of a command compares
+    identical strings. The built-in ``intern`` is not used as in Python 2
+    it does not accept unicode strings.
+
+    Names are never removed, so only names of directions and commands
+    should be added, not player input.
+    """
+    __slots__ = ('_names', '_command_names')
+
+    def __init__(self):
+        self._names = {}
+        self._command_names = {}
+
+    def intern(self, name):
+        """
+        Returns the shared copy of a name, adding it if it is new.
+
+        :param string name: The name
+        :return: The shared string equal to ``name``
+        :rtype: string
+        """
+        return self._names.setdefault(name, name)
+
+    def command_names(self, direction_name):
+        """
+        Returns the names which activate the exits in a direction: the
+        direction's name and, if it is longer than one character, its
+        initial letter.
+
+        :param string direction_name: The name of the direction
+        :return: The shared names
+        :rtype: tuple of strings
+        """
+        names = self._command_names.get(direction_name)
+        if names is None:
+            name = self.intern(direction_name)
+            if len(name) > 1:
+                names = (name, self.intern(name[0]))
+            else:
+                names = (name,)
+            self._command_names[name] = names
+        return names
+
+
+_SYMBOLS = _SymbolTable()
+
 
 class _Command(object):
     """
@@ -16,11 +78,14 @@ class _Command(object):
         PlayerCharacter and a context
     :param context: The context to be passed to func when it is called
     """
+    __slots__ = ('_name', '_synonyms', '_func', '_context', '_indexes')
+
     def __init__(self, name, func, context):
-        self._name = name
+        self._name = _SYMBOLS.intern(name)
         self._synonyms = []
         self._func = func
         self._context = context
+        self._indexes = []
 
     @property
     def name(self):
@@ -39,7 +104,12 @@ class _Command(object):
         :param string synonym: Alternative input which will activate
             the command
         """
+        # Disable 'Access to a protected member _add_name of a client class'
+        # pylint: disable=W0212
+        synonym = _SYMBOLS.intern(synonym)
         self._synonyms.append(synonym)
+        for index in self._indexes:
+            index._add_name(synonym, self)
 
     def matches(self, value):
         """
@@ -65,14 +135,253 @@ class _Command(object):
         self._func(game, self._context)
 
 
+class _CommandIndex(object):
+    """
+    An index of commands keyed by name and synonym.
+
+    Commands added to the index are kept up to date as synonyms are
+    added to them, so that finding the commands which match an input
+    value does not depend on the number of commands in the index.
+
+    Exits are indexed as commands under the names of their direction.
+
+    Input which matches no name exactly is matched against the names in
+    lower case (see find_folded and complete). The names in lower case are
+    indexed when first needed, and the index is then kept up to date as
+    names are added.
+    """
+    __slots__ = ('_commands_by_name', '_folded')
+
+    def __init__(self):
+        self._commands_by_name = {}
+        # The names in lower case, sorted, and the commands keyed by them,
+        # built when first needed (see _folded_index)
+        self._folded = None
+
+    def add(self, command):
+        # Disable 'Access to a protected member _indexes of a client class'
+        # Disable 'Access to a protected member _synonyms of a client class'
+        # pylint: disable=W0212
+        """
+        Adds a command to the index.
+
+        :param _Command command: The command to add
+        """
+        command._indexes.append(self)
+        self._add_name(command.name, command)
+        for synonym in command._synonyms:
+            self._add_name(synonym, command)
+
+    def add_exit(self, an_exit):
+        # Disable 'Access to a protected member _command_names of a client
+        # class'
+        # pylint: disable=W0212
+        """
+        Adds an exit to the index.
+
+        :param Exit an_exit: The exit to add
+        """
+        # A direction's name and initial usually activate the same exits,
+        # in which case they share a single tuple of them
+        commands = None
+        extended_commands = None
+        for name in an_exit.direction._command_names:
+            name_commands = self._commands_by_name.get(name, ())
+            if an_exit in name_commands:
+                continue
+            if name_commands is not commands:
+                commands = name_commands
+                extended_commands = name_commands + (an_exit,)
+            self._commands_by_name[name] = extended_commands
+            if self._folded is not None:
+                self._fold_name(name, an_exit)
+
+    def _add_name(self, name, command):
+        """
+        Indexes a command under a name or synonym.
+
+        :param string name: The name or synonym which activates the command
+        :param command: The command to index
+        :type command: _Command or Exit
+        """
+        # Commands are held in tuples, which are smaller than lists and
+        # rarely need to hold more than one command
+        commands = self._commands_by_name.get(name, ())
+        if command not in commands:
+            self._commands_by_name[name] = commands + (command,)
+            if self._folded is not None:
+                self._fold_name(name, command)
+
+    def find(self, value):
+        """
+        Finds the commands which match an input value.
+
+        :param string value: The input value to match
+        :return: The matching commands
+        :rtype: tuple of _Command or Exit objects
+        """
+        return self._commands_by_name.get(value, ())
+
+    def _folded_index(self):
+        """
+        Returns the index of the commands by name in lower case, building
+        it if it has not been built.
+
+        While every name is in lower case (as direction names usually are)
+        the commands are keyed by the same dictionary as by name.
+
+        :return: The names in lower case, sorted, and the commands keyed by
+            them
+        :rtype: tuple of a list and a dict
+        """
+        if self._folded is None:
+            commands_by_name = self._commands_by_name
+            if all(name == name.lower() for name in commands_by_name):
+                commands_by_folded_name = commands_by_name
+            else:
+                commands_by_folded_name = {}
+                for name, commands in commands_by_name.items():
+                    _fold_commands(commands_by_folded_name, name.lower(),
+                                   commands)
+            self._folded = (sorted(commands_by_folded_name),
+                            commands_by_folded_name)
+        return self._folded
+
+    def _fold_name(self, name, command):
+        """
+        Adds a command indexed under a name to the index of the commands by
+        name in lower case.
+
+        :param string name: The name or synonym which activates the command
+        :param command: The command indexed under the name
+        :type command: _Command or Exit
+        """
+        names, commands_by_folded_name = self._folded
+        folded_name = name.lower()
+        if commands_by_folded_name is self._commands_by_name:
+            if folded_name == name:
+                # The command has already been added to the shared
+                # dictionary
+                _insert_name(names, name)
+                return
+            commands_by_folded_name = dict(commands_by_folded_name)
+            del commands_by_folded_name[name]
+            self._folded = (names, commands_by_folded_name)
+        _fold_commands(commands_by_folded_name, folded_name, (command,))
+        _insert_name(names, folded_name)
+
+    def find_folded(self, token):
+        """
+        Finds the commands whose name or synonym, in lower case, is a
+        token.
+
+        :param string token: The token to match, in lower case
+        :return: The matching commands
+        :rtype: tuple of _Command or Exit objects
+        """
+        return self._folded_index()[1].get(token, ())
+
+    def complete(self, prefix):
+        """
+        Finds the commands whose name or synonym, in lower case, starts with
+        a prefix.
+
+        The first name is found by a binary search of the sorted names, and
+        the search stops as soon as two commands are found, so the names
+        are not scanned one by one.
+
+        :param string prefix: The prefix to match, in lower case
+        :return: The matching commands, or two of them if more than two
+            match
+        :rtype: tuple of _Command or Exit objects
+        """
+        names, commands_by_folded_name = self._folded_index()
+        found = ()
+        for index in range(bisect.bisect_left(names, prefix), len(names)):
+            name = names[index]
+            if not name.startswith(prefix):
+                break
+            for command in commands_by_folded_name[name]:
+                if command not in found:
+                    found += (command,)
+            if len(found) > 1:
+                break
+        return found
+
+
+def _fold_commands(commands_by_folded_name, folded_name, commands):
+    """
+    Adds commands to those keyed by a name in lower case.
+
+    :param dict commands_by_folded_name: The commands keyed by name in
+        lower case
+    :param string folded_name: The name in lower case
+    :param tuple commands: The commands to add
+    """
+    folded_commands = commands_by_folded_name.get(folded_name)
+    if folded_commands is None:
+        commands_by_folded_name[folded_name] = commands
+        return
+    for command in commands:
+        if command not in folded_commands:
+            folded_commands += (command,)
+    commands_by_folded_name[folded_name] = folded_commands
+
+
+def _insert_name(names, name):
+    """
+    Inserts a name into a sorted list of names, unless it is already there.
+
+    :param list names: The sorted names
+    :param string name: The name to insert
+    """
+    index = bisect.bisect_left(names, name)
+    if index == len(names) or names[index] != name:
+        names.insert(index, name)
+
+
+class _WorldCommandIndex(_CommandIndex):
+    """
+    The index of the commands of a world, which keeps the world's
+    transition tables (see World.freeze) in step as names are added to it.
+
+    :param World world: The world whose commands are indexed
+    """
+    __slots__ = ('_world',)
+
+    def __init__(self, world):
+        super(_WorldCommandIndex, self).__init__()
+        self._world = world
+
+    def _add_name(self, name, command):
+        # Disable 'Access to a protected member _command_name_added of a
+        # client class'
+        # pylint: disable=W0212
+        """
+        Indexes a command under a name or synonym.
+
+        :param string name: The name or synonym which activates the command
+        :param _Command command: The command to index
+        """
+        super(_WorldCommandIndex, self)._add_name(name, command)
+        if self._world.frozen:
+            self._world._command_name_added(name)
+
+
 class Direction(object):
     """
     A direction in which movement can be made.
 
     :param string name: The unique name of the direction
     """
+    __slots__ = ('_name', '_opposite', '_command_names')
+
     def __init__(self, name):
-        self._name = name
+        # The name and initial letter which activate the exits in this
+        # direction, shared by every such exit and every direction with
+        # the same name
+        self._command_names = _SYMBOLS.command_names(name)
+        self._name = self._command_names[0]
         self._opposite = None
 
     @property
@@ -115,7 +424,12 @@ class Exit(object):
 
     :param Direction direction: The direction in which the exit resides
     :param Location to_location: The location to which the exit leads
+
+    An exit is also the command which moves the character through it,
+    activated by the name of its direction or the first letter thereof.
     """
+    __slots__ = ('_direction', '_to_location')
+
     def __init__(self, direction, to_location):
         self._direction = direction
         self._to_location = to_location
@@ -140,43 +454,65 @@ class Exit(object):
         """
         return self._to_location
 
+    def run(self, game):
+        # Disable 'Access to a protected member _move_character_to of a
+        # client class'
+        # pylint: disable=W0212
+        """
+        Moves the character through the exit.
+
+        :param Game game: The game in which to move the character
+        """
+        game._move_character_to(self._to_location)
+
 
 class Game(object):
     """
     An adventure game.
 
-    :param list locations: The locations in the game. The first location
+    A game holds the state of one player's session: the position of their
+    character and the handlers through which they interact with it. The
+    locations themselves belong to a World, which may be shared by any
+    number of games.
+
+    :param locations: The locations in the game. The first location
         in the list is the one in which the player's character starts
+    :type locations: list of Location objects or World
     :raises: ``ValueError`` if locations does not contain at least one
         location
     :raises: ``ValueError`` if locations contains more than one location with
         the same name
     """
+    __slots__ = ('_world', '_character', '_handlers', '_should_end',
+                 '_pending_quit', '_overlay', '_profiler')
+
     def __init__(self, locations):
-        if not locations:
-            raise ValueError('locations must contain at least one location')
+        if isinstance(locations, World):
+            self._world = locations
+        else:
+            self._world = World(locations)
+
+        self._character = PlayerCharacter(self._world.starting_location)
+        # Games share the default handlers until one of them is changed
+        self._handlers = _DEFAULT_HANDLERS
+        self._should_end = False
+        # Whether quitting has been requested and not yet handled, while
+        # the game is run asynchronously, and None otherwise
+        self._pending_quit = None
+        # The changes made to the world by this game alone, created when
+        # the first change is made
+        self._overlay = None
+        self._profiler = None
 
-        self._locations = []
-        for location in locations:
-            if location.name in [l.name for l in self._locations]:
-                message = u'Redefinition of location named "{0}"'
-                raise ValueError(message.format(location.name))
-            else:
-                self._locations.append(location)
+    @property
+    def world(self):
+        """
+        The world in which the game takes place.
 
-        self._character = PlayerCharacter(locations[0])
-        self._commands = []
-        quit_command = _Command('quit', Game._quit, self)
-        quit_command.add_synonym('q')
-        self._add_command(quit_command)
-        self._handlers = {
-            'display': _default_display_handler,
-            'input': _default_input_handler,
-            'location_renderer': _default_location_renderer,
-            'quit': _default_quit_handler,
-            'end_of_round': _default_end_of_round_handler
-        }
-        self._should_end = False
+        :getter: Returns the game's world
+        :type: World
+        """
+        return self._world
 
     @property
     def character(self):
@@ -196,11 +532,56 @@ class Game(object):
         :return: the found location or None if the location was not found
         :rtype: Location
         """
-        for location in self._locations:
-            if location.name == location_name:
-                return location
+        return self._world.find_location(location_name)
 
-        return None
+    def add_exit(self, location, direction, to_location):
+        """
+        Adds an exit from a location for this game only.
+
+        The exit is two-way. Other games sharing the world do not see it,
+        and the world's locations are not changed, so each game holds only
+        the exits it has added.
+
+        :param Location location: The location from which the exit leads
+        :param Direction direction: The direction in which the exit resides
+        :param Location to_location: The location reached by going through
+            the exit
+        :raises: ``ValueError`` if direction does not have an opposite
+        """
+        if not direction.opposite:
+            raise ValueError('direction must have an opposite')
+
+        self.add_one_way_exit(location, direction, to_location)
+        self.add_one_way_exit(to_location, direction.opposite, location)
+
+    def add_one_way_exit(self, location, direction, to_location):
+        """
+        Adds a one-way exit from a location for this game only (see
+        add_exit).
+
+        :param Location location: The location from which the exit leads
+        :param Direction direction: The direction in which the exit resides
+        :param Location to_location: The location reached by going through
+            the exit
+        """
+        if self._overlay is None:
+            self._overlay = _Overlay()
+        self._overlay.add_exit(location, Exit(direction, to_location))
+
+    def exits(self, location):
+        # Disable 'Access to a protected member _exits of a client class'
+        # pylint: disable=W0212
+        """
+        The exits from a location in this game: those of the location
+        followed by any added by add_exit or add_one_way_exit.
+
+        :param Location location: The location
+        :return: The exits from the location
+        :rtype: tuple of Exit objects
+        """
+        if self._overlay is None:
+            return tuple(location._exits)
+        return tuple(location._exits) + self._overlay.exits(location)
 
     def _find_command(self, command_name):
         """
@@ -208,12 +589,21 @@ class Game(object):
         within this game and the current location of the character.
 
         :param string command_name: The name or synonym of the command to find
-        :return: the first matching command or None if not found
+        :return: the matching command or None if no command or more than
+            one command matches
         :rtype: Command
         """
-        found_commands = self._find_commands(command_name)
-        if len(found_commands) == 1:
-            return found_commands[0]
+        # Disable 'Access to a protected member _commands of a client class'
+        # Disable 'Access to a protected member _current_location of
+        # a client class'
+        # pylint: disable=W0212
+        game_commands = self._world._commands.find(command_name)
+        location = self.character._current_location
+        location_commands = location._commands.find(command_name)
+        if self._overlay is not None:
+            location_commands += self._overlay.find(location, command_name)
+        if len(game_commands) + len(location_commands) == 1:
+            return (game_commands or location_commands)[0]
 
         return None
 
@@ -230,44 +620,137 @@ class Game(object):
         :param string command_name: The name or synonym of the commands to
             find
         :return: all matching commands
-        :rtype: list
+        :rtype: tuple
         """
-        found_commands = []
-
-        for command in self._commands:
-            if command.matches(command_name):
-                found_commands.append(command)
-
-        for command in self.character._current_location._commands:
-            if command.matches(command_name):
-                found_commands.append(command)
+        location = self._character._current_location
+        found_commands = (self._world._commands.find(command_name) +
+                          location._commands.find(command_name))
+        if self._overlay is not None:
+            found_commands += self._overlay.find(location, command_name)
 
         return found_commands
 
     def _add_command(self, command):
+        # Disable 'Access to a protected member _commands of a client class'
+        # pylint: disable=W0212
         """
-        Adds a command to the game.
+        Adds a command to the game's world (and so to every game sharing
+        the world).
 
         :param _Command command: Command to add
         """
-        self._commands.append(command)
+        self._world._commands.add(command)
+
+    def _set_handler(self, name, handler):
+        """
+        Sets one of the game's handlers.
+
+        :param string name: The name of the handler to set
+        :param function handler: The handler
+        """
+        if self._handlers is _DEFAULT_HANDLERS:
+            self._handlers = dict(_DEFAULT_HANDLERS)
+        self._handlers[name] = handler
+
+    def _render_location(self, location):
+        # Disable 'Access to a protected member _rendered of a client class'
+        # Disable 'Access to a protected member _keeps_rendered of a client
+        # class'
+        # pylint: disable=W0212
+        """
+        Renders a location with the location renderer, reusing the text
+        last rendered for the location unless an exit has been added to it
+        or the renderer has changed since (or the location does not keep
+        its rendered text).
+
+        :param Location location: The location to render
+        :return: A textual representation of the location
+        :rtype: string
+        """
+        renderer = self._handlers['location_renderer']
+        if self._overlay is not None and self._overlay.exits(location):
+            # The game's own exits are not shared, so are not cached
+            return renderer(self._overlay.view(location))
+        if not location._keeps_rendered:
+            return renderer(location)
+
+        exit_count = len(location._exits)
+        rendered = location._rendered
+        if (rendered is None or rendered[0] is not renderer or
+                rendered[1] != exit_count):
+            rendered = (renderer, exit_count, renderer(location))
+            location._rendered = rendered
+        return rendered[2]
+
+    def _flush_display(self):
+        """
+        Flushes the display handler, if it buffers its output (see
+        vengeance.display.BufferedDisplay).
+        """
+        flush = getattr(self._handlers['display'], 'flush', None)
+        if flush is not None:
+            flush()
+
+    def _read_input(self):
+        """
+        Retrieves input from the user with the input handler, first
+        flushing the display handler so the user sees any buffered output.
+
+        :return: The input
+        :rtype: string
+        """
+        self._flush_display()
+        return self.input_handler()
 
     def run(self):
         """
         Runs the game.
         """
-        while (True):
-            current_location = self.character.current_location
-            rendered_location = self.location_renderer(current_location)
-            self.display_handler(rendered_location)
+        profiler = self._profiler
+        try:
+            while (True):
+                if profiler is not None:
+                    profiler.start_round()
 
-            user_input = self.input_handler()
-            self.process_input(user_input)
+                current_location = self.character.current_location
+                rendered_location = self._render_location(current_location)
+                if profiler is not None:
+                    profiler.end_phase(RENDER)
+                self.display_handler(rendered_location)
+                if profiler is not None:
+                    profiler.end_phase(DISPLAY)
 
-            self.end_of_round_handler(self)
+                user_input = self._read_input()
+                if profiler is not None:
+                    profiler.end_phase(INPUT)
+                self.process_input(user_input)
+                if profiler is not None:
+                    profiler.end_phase(PROCESS_INPUT)
 
-            if self.should_end:
-                break
+                self.end_of_round_handler(self)
+                if profiler is not None:
+                    profiler.end_phase(END_OF_ROUND)
+                    profiler.end_round()
+
+                if self.should_end:
+                    break
+        finally:
+            self._flush_display()
+
+    def run_async(self):
+        """
+        Runs the game on an asyncio event loop (Python 3.5 and later).
+
+        Each round awaits the asynchronous display, input, quit and end of
+        round handlers (see async_display_handler and so on), so that one
+        event loop can run many games at once. Input is still processed
+        synchronously, without blocking.
+
+        :return: A coroutine which runs the game until it ends
+        :rtype: coroutine
+        """
+        from vengeance._aio import run_game
+        return run_game(self)
 
     @property
     def should_end(self):
@@ -287,12 +770,38 @@ class Game(object):
         """
         self._should_end = value
 
+    @property
+    def profiler(self):
+        """
+        The profiler which times each phase of every round of the game loop,
+        or None (the default) if rounds are not to be timed.
+
+        When the game is run synchronously, asking the user to confirm
+        that they want to quit is timed as part of processing input.
+
+        :getter: Returns the current profiler
+        :setter: Sets the profiler, taking effect when the game is next run
+        :type: vengeance.profiling.RoundProfiler
+        """
+        return self._profiler
+
+    @profiler.setter
+    def profiler(self, value):
+        """
+        See profiler property.
+        """
+        self._profiler = value
+
     @property
     def display_handler(self):
         """
         The function to be called for the game to display some text. This
         function takes a single string parameter (the text to be displayed).
 
+        If the function has a ``flush`` method, as a
+        vengeance.display.BufferedDisplay does, it is called before the game
+        asks for input and when the game ends.
+
         :getter: Returns the current display handler
         :setter: Sets the function to be called when some text is to
             be displayed.
@@ -305,7 +814,7 @@ class Game(object):
         """
         See display_handler property.
         """
-        self._handlers['display'] = value
+        self._set_handler('display', value)
 
     @property
     def input_handler(self):
@@ -325,7 +834,7 @@ class Game(object):
         """
         See input_handler property.
         """
-        self._handlers['input'] = value
+        self._set_handler('input', value)
 
     @property
     def location_renderer(self):
@@ -334,6 +843,10 @@ class Game(object):
         function takes a single Location parameter and returns a string
         representation of the location.
 
+        The representation is reused each time the location is rendered
+        until an exit is added to the location or the renderer is changed,
+        so it should depend only on the location.
+
         :getter: Returns the current location renderer
         :setter: Sets the function to be called when a location is to
             be rendered.
@@ -346,7 +859,7 @@ class Game(object):
         """
         See location_renderer property.
         """
-        self._handlers['location_renderer'] = value
+        self._set_handler('location_renderer', value)
 
     @property
     def quit_handler(self):
@@ -369,7 +882,7 @@ class Game(object):
         """
         See quit_handler property.
         """
-        self._handlers['quit'] = value
+        self._set_handler('quit', value)
 
     @property
     def end_of_round_handler(self):
@@ -389,7 +902,99 @@ class Game(object):
         """
         See end_of_round_handler property.
         """
-        self._handlers['end_of_round'] = value
+        self._set_handler('end_of_round', value)
+
+    @property
+    def async_display_handler(self):
+        """
+        The coroutine function to be awaited for the game to display some
+        text when it is run asynchronously (see run_async). This function
+        takes a single string parameter (the text to be displayed). If None
+        (the default), display_handler is called instead.
+
+        :getter: Returns the current asynchronous display handler
+        :setter: Sets the coroutine function to be awaited when some text is
+            to be displayed
+        :type: coroutine function
+        """
+        return self._handlers['async_display']
+
+    @async_display_handler.setter
+    def async_display_handler(self, value):
+        """
+        See async_display_handler property.
+        """
+        self._set_handler('async_display', value)
+
+    @property
+    def async_input_handler(self):
+        """
+        The coroutine function to be awaited for the game to get input from
+        the user when it is run asynchronously (see run_async). This
+        function takes no parameters and returns a string (the input). If
+        None (the default), input_handler is called in the event loop's
+        default executor instead.
+
+        :getter: Returns the current asynchronous input handler
+        :setter: Sets the coroutine function to be awaited when input is
+            required from the user
+        :type: coroutine function
+        """
+        return self._handlers['async_input']
+
+    @async_input_handler.setter
+    def async_input_handler(self, value):
+        """
+        See async_input_handler property.
+        """
+        self._set_handler('async_input', value)
+
+    @property
+    def async_quit_handler(self):
+        """
+        The coroutine function to be awaited when the game is requested to
+        quit while it is run asynchronously (see run_async). This function
+        takes two parameters - the asynchronous display and input handlers -
+        and returns a bool which is True if the game should quit, or False
+        otherwise. If None (the default), the user is asked for
+        confirmation, unless quit_handler has been set, in which case it is
+        called in the event loop's default executor instead.
+
+        :getter: Returns the current asynchronous quit handler
+        :setter: Sets the coroutine function to be awaited when quit is
+            requested
+        :type: coroutine function
+        """
+        return self._handlers['async_quit']
+
+    @async_quit_handler.setter
+    def async_quit_handler(self, value):
+        """
+        See async_quit_handler property.
+        """
+        self._set_handler('async_quit', value)
+
+    @property
+    def async_end_of_round_handler(self):
+        """
+        The coroutine function to be awaited at the end of one iteration of
+        the game loop when it is run asynchronously (see run_async). This
+        function takes a single Game parameter. If None (the default),
+        end_of_round_handler is called instead.
+
+        :getter: Returns the current asynchronous end of round handler
+        :setter: Sets the coroutine function to be awaited at the end of
+            each iteration of the game loop
+        :type: coroutine function
+        """
+        return self._handlers['async_end_of_round']
+
+    @async_end_of_round_handler.setter
+    def async_end_of_round_handler(self, value):
+        """
+        See async_end_of_round_handler property.
+        """
+        self._set_handler('async_end_of_round', value)
 
     def _move_character_to(self, location):
         """
@@ -407,8 +1012,14 @@ class Game(object):
 
         :param _: The context in which the quit was initiated (ignored)
         """
+        if self._pending_quit is not None:
+            # Running asynchronously, so interaction with the user must wait
+            # until the input has been processed
+            self._pending_quit = True
+            return
+
         self.should_end = self.quit_handler(
-            self.display_handler, self.input_handler)
+            self.display_handler, self._read_input)
 
     def process_input(self, user_input):
         """
@@ -416,9 +1027,173 @@ class Game(object):
 
         :param string user_input: The input command to process
         """
-        command = self._find_command(user_input)
-        if command:
-            command.run(self)
+        # Disable 'Access to a protected member _current_location of a
+        # client class'
+        # Disable 'Access to a protected member _transitions of a client
+        # class'
+        # Disable 'Access to a protected member _exits of a client class'
+        # pylint: disable=W0212
+        location = self._character._current_location
+        transitions = location._transitions
+        if transitions is not None and self._overlay is None:
+            # The checks of _transition_table, made here as calling it takes
+            # longer than the move itself
+            if transitions[0] == len(location._exits):
+                to_location = transitions[1].get(user_input)
+            else:
+                to_location = self._transition_table(location).get(user_input)
+            if to_location is not None:
+                self._character._current_location = to_location
+                return
+
+        commands = self._find_commands(user_input)
+        if len(commands) == 1:
+            commands[0].run(self)
+        elif not commands:
+            command = self._find_command_by_token(user_input)
+            if command:
+                command.run(self)
+
+    def _transition_table(self, location):
+        # Disable 'Access to a protected member _transitions of a client
+        # class'
+        # Disable 'Access to a protected member _exits of a client class'
+        # Disable 'Access to a protected member _compile_transitions of a
+        # client class'
+        # Disable 'Access to a protected member _commands of a client class'
+        # pylint: disable=W0212
+        """
+        Returns the table of the locations to which input moves the
+        character from a location, while the world is frozen (see
+        World.freeze), compiling it again if exits have been added to the
+        location since it was compiled.
+
+        :param Location location: The location
+        :return: The locations keyed by input, or None if the world is not
+            frozen or the game has exits of its own
+        :rtype: dict
+        """
+        transitions = location._transitions
+        if transitions is None or self._overlay is not None:
+            return None
+        if transitions[0] != len(location._exits):
+            transitions = location._compile_transitions(self._world._commands)
+        return transitions[1]
+
+    def _find_command_by_token(self, user_input):
+        # Disable 'Access to a protected member _commands of a client class'
+        # Disable 'Access to a protected member _current_location of
+        # a client class'
+        # pylint: disable=W0212
+        """
+        Finds the command activated by input which does not exactly match
+        the name or synonym of any command.
+
+        The input is trimmed of surrounding whitespace and converted to
+        lower case, then matched against the names and synonyms of the
+        commands within this game and the current location of the
+        character, also in lower case: first in full and, if that matches
+        nothing, as a prefix. For example "North", " n" and "nor" each
+        activate the exit north, unless another command's name also starts
+        with "nor".
+
+        :param string user_input: The input which matches no command
+        :return: the matching command or None if no command or more than
+            one command matches
+        :rtype: Command
+        """
+        token = user_input.strip().lower()
+        if not token:
+            return None
+
+        location = self.character._current_location
+        indexes = [self._world._commands, location._commands]
+        if self._overlay is not None:
+            overlay_commands = self._overlay.commands(location)
+            if overlay_commands is not None:
+                indexes.append(overlay_commands)
+
+        for find in (_CommandIndex.find_folded, _CommandIndex.complete):
+            found = ()
+            for index in indexes:
+                for command in find(index, token):
+                    if command not in found:
+                        found += (command,)
+            if found:
+                return found[0] if len(found) == 1 else None
+
+        return None
+
+    def replay(self, inputs, trajectory=False):
+        # Disable 'Access to a protected member _commands of a client class'
+        # Disable 'Access to a protected member _commands_by_name of a
+        # client class'
+        # Disable 'Access to a protected member _current_location of a
+        # client class'
+        # Disable 'Access to a protected member _to_location of a client
+        # class'
+        # Disable 'Access to a protected member _transitions of a client
+        # class'
+        # pylint: disable=W0212
+        """
+        Processes a sequence of inputs, as if each were passed to
+        process_input in turn.
+
+        Movement is resolved directly from the transition table of each
+        location while the world is frozen (see World.freeze), and otherwise
+        from the command indexes of the world and of each location, so
+        replaying a long script (in a test or by a bot) avoids most of the
+        cost of calling process_input per input.
+
+        :param inputs: The input commands to process
+        :type inputs: iterable of strings
+        :param bool trajectory: Whether to record the location of the
+            character after each input
+        :return: The location of the character after the last input and,
+            if ``trajectory`` is True, a list of the location of the
+            character after each input (otherwise None)
+        :rtype: tuple
+        """
+        find_game_commands = self._world._commands._commands_by_name.get
+        character = self._character
+        location = character._current_location
+        locations = [] if trajectory else None
+        no_commands = ()
+        for user_input in inputs:
+            if location._transitions is not None:
+                transitions = self._transition_table(location) or {}
+                to_location = transitions.get(user_input)
+                if to_location is not None:
+                    location = to_location
+                    if locations is not None:
+                        locations.append(location)
+                    continue
+
+            location_commands = location._commands._commands_by_name.get(
+                user_input, no_commands)
+            game_commands = find_game_commands(user_input, no_commands)
+            if self._overlay is not None:
+                location_commands += self._overlay.find(location, user_input)
+            command_count = len(location_commands) + len(game_commands)
+            if command_count == 1:
+                command = (location_commands or game_commands)[0]
+            elif command_count == 0:
+                character._current_location = location
+                command = self._find_command_by_token(user_input)
+            else:
+                command = None
+            if command is not None:
+                if isinstance(command, Exit):
+                    location = command._to_location
+                else:
+                    character._current_location = location
+                    command.run(self)
+                    location = character._current_location
+            if locations is not None:
+                locations.append(location)
+
+        character._current_location = location
+        return location, locations
 
 
 def _default_display_handler(text):
@@ -445,21 +1220,16 @@ def _default_location_renderer(location):
     :return: A textual representation of the location
     :rtype: string
     """
-    title = location.name
-    title += ' (exits: '
-    exit_count = len(location.exits)
-    if exit_count == 0:
-        title += '<none>'
-    for i in range(exit_count):
-        an_exit = location.exits[i]
-        title += an_exit.direction.name
-        if i < exit_count - 1:
-            title += ', '
-    title += ')'
+    exits = location.exits
+    if exits:
+        exit_names = ', '.join(an_exit.direction.name for an_exit in exits)
+    else:
+        exit_names = '<none>'
+    parts = [location.name, ' (exits: ', exit_names, ')']
     if location.description:
-        title += '\n'
-        title += location.description
-    return title
+        parts.append('\n')
+        parts.append(location.description)
+    return ''.join(parts)
 
 
 def _default_quit_handler(display_handler, input_handler):
@@ -492,6 +1262,19 @@ def _default_end_of_round_handler(game):
     pass
 
 
+_DEFAULT_HANDLERS = {
+    'display': _default_display_handler,
+    'input': _default_input_handler,
+    'location_renderer': _default_location_renderer,
+    'quit': _default_quit_handler,
+    'end_of_round': _default_end_of_round_handler,
+    'async_display': None,
+    'async_input': None,
+    'async_quit': None,
+    'async_end_of_round': None
+}
+
+
 class GameFormatException(Exception):
     """
     Thrown when invalid game data is processed.
@@ -506,11 +1289,48 @@ class Location(object):
     :param string name: The unique name of the location
     :param string description: The description of the location
     """
+    __slots__ = ('_commands', '_exits', '_listeners', '_name', '_description',
+                 '_rendered', '_transitions')
+
+    # Whether the text rendered for the location is kept (see
+    # Game._render_location). Locations which read their description from
+    # elsewhere rather than holding it do not keep the text, which contains
+    # the description.
+    _keeps_rendered = True
+
     def __init__(self, name, description=''):
-        self._commands = []
+        self._commands = _CommandIndex()
         self._exits = []
+        self._listeners = ()
         self._name = name
         self._description = description
+        # The renderer which last rendered the location, the number of
+        # exits the location had and the rendered text (see
+        # Game._render_location)
+        self._rendered = None
+        # The number of exits the location had and the locations to which
+        # input moves the character, while its world is frozen (see
+        # World.freeze)
+        self._transitions = None
+
+    def _add_listener(self, listener):
+        """
+        Adds a function to be called whenever an exit is added to the
+        location.
+
+        :param function listener: The function to call. This function takes
+            two parameters, the location and the added exit
+        """
+        self._listeners += (listener,)
+
+    def _remove_listener(self, listener):
+        """
+        Removes a function added with _add_listener.
+
+        :param function listener: The function to remove
+        """
+        self._listeners = tuple(
+            added for added in self._listeners if added != listener)
 
     def add_exit(self, direction, location):
         """
@@ -531,9 +1351,6 @@ class Location(object):
         location.add_one_way_exit(direction.opposite, self)
 
     def add_one_way_exit(self, direction, location):
-        # Disable 'Access to a protected member _move_character_to of a
-        # client class'
-        # pylint: disable=W0212
         """
         Adds a one-way exit from the location.
 
@@ -544,11 +1361,38 @@ class Location(object):
         :param Location location: The location reached by going through
             the exit
         """
-        self._exits.append(Exit(direction, location))
-        exit_command = _Command(
-            direction.name, Game._move_character_to, location)
-        exit_command.add_synonym(direction.name[0])
-        self._commands.append(exit_command)
+        an_exit = Exit(direction, location)
+        self._exits.append(an_exit)
+        self._commands.add_exit(an_exit)
+        for listener in self._listeners:
+            listener(self, an_exit)
+
+    def _compile_transitions(self, world_commands):
+        # Disable 'Access to a protected member _commands_by_name of a
+        # client class'
+        # Disable 'Access to a protected member _to_location of a client
+        # class'
+        # pylint: disable=W0212
+        """
+        Compiles the table of the locations to which input moves the
+        character from the location.
+
+        Only input which activates a single exit, and no command of the
+        world, is included. Any other input is processed by finding the
+        commands which it activates.
+
+        :param _CommandIndex world_commands: The commands of the world
+            containing the location
+        :return: The number of exits the location has and the table
+        :rtype: tuple
+        """
+        table = {}
+        for name, commands in self._commands._commands_by_name.items():
+            if (len(commands) == 1 and isinstance(commands[0], Exit) and
+                    not world_commands.find(name)):
+                table[name] = commands[0]._to_location
+        self._transitions = (len(self._exits), table)
+        return self._transitions
 
     @property
     def name(self):
@@ -581,6 +1425,80 @@ class Location(object):
         return tuple(self._exits)
 
 
+class _Overlay(object):
+    """
+    The exits added to a shared world by one game (see Game.add_exit).
+
+    Only the locations to which the game has added exits are recorded, so
+    the overlay's size depends on the changes made rather than on the size
+    of the world.
+    """
+    __slots__ = ('_exits', '_commands')
+
+    def __init__(self):
+        self._exits = {}
+        self._commands = {}
+
+    def add_exit(self, location, an_exit):
+        """
+        Adds an exit from a location.
+
+        :param Location location: The location from which the exit leads
+        :param Exit an_exit: The exit to add
+        """
+        if location not in self._exits:
+            self._exits[location] = ()
+            self._commands[location] = _CommandIndex()
+        self._exits[location] += (an_exit,)
+        self._commands[location].add_exit(an_exit)
+
+    def exits(self, location):
+        """
+        :param Location location: A location
+        :return: The exits added from the location
+        :rtype: tuple of Exit objects
+        """
+        return self._exits.get(location, ())
+
+    def commands(self, location):
+        """
+        :param Location location: A location
+        :return: The index of the commands added to the location, or None
+            if there are none
+        :rtype: _CommandIndex
+        """
+        return self._commands.get(location)
+
+    def find(self, location, value):
+        """
+        Finds the commands added to a location which match an input value.
+
+        :param Location location: The location
+        :param string value: The input value to match
+        :return: The matching commands
+        :rtype: tuple
+        """
+        commands = self._commands.get(location)
+        if commands is None:
+            return ()
+        return commands.find(value)
+
+    def view(self, location):
+        # Disable 'Access to a protected member _exits of a client class'
+        # pylint: disable=W0212
+        """
+        Creates a location with the name and description of a location and
+        both its own exits and those added to it, for rendering.
+
+        :param Location location: The location
+        :return: The combined location
+        :rtype: Location
+        """
+        view = Location(location.name, location.description)
+        view._exits = location._exits + list(self.exits(location))
+        return view
+
+
 class PlayerCharacter(object):
     # Disable 'Too few public methods'
     # pylint: disable=R0903
@@ -590,6 +1508,8 @@ class PlayerCharacter(object):
     :param Location starting_location: The location in which the
         character starts
     """
+    __slots__ = ('_current_location',)
+
     def __init__(self, starting_location):
         self._current_location = starting_location
 
@@ -611,3 +1531,146 @@ class PlayerCharacter(object):
             will move
         """
         self._current_location = location
+
+
+class World(object):
+    """
+    The locations of an adventure game, which can be shared by many games.
+
+    Each game played in a world holds only its own character position and
+    handlers, so a server can run a game per player without copying the
+    world. Changes to the world (such as adding exits) are seen by every
+    game played in it.
+
+    :param list locations: The locations in the world. The first location
+        in the list is the one in which players' characters start
+    :raises: ``ValueError`` if locations does not contain at least one
+        location
+    :raises: ``ValueError`` if locations contains more than one location with
+        the same name
+    """
+    def __init__(self, locations):
+        if not locations:
+            raise ValueError('locations must contain at least one location')
+
+        self._locations = []
+        self._locations_by_name = {}
+        for location in locations:
+            if location.name in self._locations_by_name:
+                message = u'Redefinition of location named "{0}"'
+                raise ValueError(message.format(location.name))
+            else:
+                self._locations.append(location)
+                self._locations_by_name[location.name] = location
+
+        # Built when first needed (see _location_index)
+        self._location_indexes = None
+        self._frozen = False
+
+        self._commands = _WorldCommandIndex(self)
+        quit_command = _Command('quit', Game._quit, None)
+        quit_command.add_synonym('q')
+        self._commands.add(quit_command)
+
+    @property
+    def starting_location(self):
+        """
+        The location in which players' characters start.
+
+        :getter: Returns the starting location
+        :type: Location
+        """
+        return self._locations[0]
+
+    def find_location(self, location_name):
+        """
+        Finds a location by name.
+
+        :param string location_name: The name of the location to find
+        :return: the found location or None if the location was not found
+        :rtype: Location
+        """
+        return self._locations_by_name.get(location_name)
+
+    @property
+    def frozen(self):
+        """
+        Whether or not the world is frozen (see freeze).
+
+        :getter: Returns True if the world is frozen, False otherwise
+        :type: bool
+        """
+        return self._frozen
+
+    def freeze(self):
+        # Disable 'Access to a protected member _compile_transitions of a
+        # client class'
+        # pylint: disable=W0212
+        """
+        Compiles, for each location, a table of the locations to which
+        input moves the character, so that Game.process_input moves the
+        character with a single lookup rather than by finding and running
+        the command which the input activates.
+
+        Each location's table takes about as much memory as its command
+        index. Exits can still be added to a frozen world: a location's
+        table is compiled again the next time input is processed there.
+        Names added to the world's commands are removed from the tables.
+        Games with exits of their own (see Game.add_exit) do not use the
+        tables.
+        """
+        for location in self._locations:
+            location._compile_transitions(self._commands)
+        self._frozen = True
+
+    def thaw(self):
+        # Disable 'Access to a protected member _transitions of a client
+        # class'
+        # pylint: disable=W0212
+        """
+        Discards the tables compiled by freeze.
+        """
+        for location in self._locations:
+            location._transitions = None
+        self._frozen = False
+
+    def _command_name_added(self, name):
+        # Disable 'Access to a protected member _transitions of a client
+        # class'
+        # pylint: disable=W0212
+        """
+        Removes a name, which now activates a command of the world, from
+        the tables compiled by freeze, so that input of the name is
+        processed by finding the commands which it activates.
+
+        :param string name: The name added to the world's commands
+        """
+        for location in self._locations:
+            transitions = location._transitions
+            if transitions is not None:
+                transitions[1].pop(name, None)
+
+    def _location_index(self, location):
+        """
+        Finds the position of a location in the world's list of locations.
+
+        :param Location location: The location to find
+        :return: The index of the location, or None if it is not in the
+            world
+        :rtype: int
+        """
+        if self._location_indexes is None:
+            self._location_indexes = dict(
+                (a_location, index)
+                for index, a_location in enumerate(self._locations))
+        return self._location_indexes.get(location)
+
+    def create_game(self):
+        """
+        Creates a game in the world, with its character at the starting
+        location.
+
+        :return: Created game
+        :rtype: Game
+        """
+        return Game(self)
@@ -0,0 +1,428 @@
+"""
+Array-backed location graphs.
+
+A location graph numbers the locations and directions of a game and keeps
+its exits in flat arrays, in compressed sparse row (CSR) form, so that
+analyses of the whole world can work on arrays of integers rather than
+following millions of object references. When NumPy is installed the
+arrays can be viewed as NumPy arrays and analyses are vectorised.
+
+The graph is kept in step with the game: exits added with
+``Location.add_exit`` or ``Location.add_one_way_exit`` after the graph is
+created are added to it as well.
+"""
+from array import array
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Typecode of the arrays holding location and direction ids
+_ID_TYPECODE = 'i'
+
+# Number of locations in a breadth-first search layer from which the layer
+# is expanded using NumPy
+_VECTORISE_LAYER_SIZE = 256
+
+
+def _numpy_view(ids):
+    """
+    Views an array of ids as a NumPy array without copying it.
+
+    :param array ids: The ids to view
+    :return: The NumPy view of ``ids``
+    :rtype: numpy.ndarray
+    """
+    if not ids:
+        return numpy.zeros(0, dtype=numpy.intc)
+    return numpy.frombuffer(ids, dtype=numpy.intc)
+
+
+class LocationGraph(object):
+    """
+    The locations of a game and the exits between them, held in arrays.
+
+    Locations and directions are identified by integer ids. Location ids
+    follow the order of the game's locations, so the character starts in
+    location 0. Locations outside the game which are reached by an exit are
+    given the next free id.
+
+    :param Game game: The game whose locations the graph holds
+    """
+    def __init__(self, game):
+        # Disable 'Access to a protected member _locations of a client class'
+        # pylint: disable=W0212
+        self._locations = []
+        self._location_ids = {}
+        self._directions = []
+        self._direction_ids = {}
+        self._sources = array(_ID_TYPECODE)
+        self._targets = array(_ID_TYPECODE)
+        self._exit_directions = array(_ID_TYPECODE)
+        self._version = 0
+        self._adjacency = None
+
+        for location in game.world._locations:
+            self._add_location(location)
+        # Locations outside the game reached by an exit are appended as
+        # their exits are added, so their exits are added in turn. This is
+        # _exit_added unrolled, as it dominates the time taken to build the
+        # graphs of large worlds
+        location_ids = self._location_ids
+        direction_ids = self._direction_ids
+        append_source = self._sources.append
+        append_target = self._targets.append
+        append_direction = self._exit_directions.append
+        location_id = 0
+        while location_id < len(self._locations):
+            for an_exit in self._locations[location_id]._exits:
+                target = location_ids.get(an_exit._to_location)
+                if target is None:
+                    target = self._add_location(an_exit._to_location)
+                direction_id = direction_ids.get(an_exit._direction)
+                if direction_id is None:
+                    direction_id = self._add_direction(an_exit._direction)
+                append_source(location_id)
+                append_target(target)
+                append_direction(direction_id)
+            location_id += 1
+        self._version = len(self._sources)
+
+    def close(self):
+        # Disable 'Access to a protected member _remove_listener of a client
+        # class'
+        # pylint: disable=W0212
+        """
+        Stops keeping the graph in step with the game's locations.
+        """
+        for location in self._locations:
+            location._remove_listener(self._exit_added)
+
+    def _add_location(self, location):
+        # Disable 'Access to a protected member _add_listener of a client
+        # class'
+        # pylint: disable=W0212
+        """
+        Numbers a location and listens for exits added to it.
+
+        :param Location location: The location to add
+        :return: The id of the location
+        :rtype: int
+        """
+        location_id = len(self._locations)
+        self._locations.append(location)
+        self._location_ids[location] = location_id
+        location._add_listener(self._exit_added)
+        return location_id
+
+    def _exit_added(self, location, an_exit):
+        """
+        Adds an exit to the graph.
+
+        :param Location location: The location the exit leads from
+        :param Exit an_exit: The added exit
+        """
+        to_location = an_exit.to_location
+        if to_location not in self._location_ids:
+            self._add_location(to_location)
+
+        self._sources.append(self._location_ids[location])
+        self._targets.append(self._location_ids[to_location])
+        self._exit_directions.append(self._add_direction(an_exit.direction))
+        self._version += 1
+        self._adjacency = None
+
+    def _add_direction(self, direction):
+        """
+        Numbers a direction and its opposite, if not already numbered.
+
+        :param Direction direction: The direction to number
+        :return: The id of the direction
+        :rtype: int
+        """
+        direction_id = self._direction_ids.get(direction)
+        if direction_id is None:
+            direction_id = len(self._directions)
+            self._directions.append(direction)
+            self._direction_ids[direction] = direction_id
+            if direction.opposite is not None:
+                self._add_direction(direction.opposite)
+        return direction_id
+
+    @property
+    def version(self):
+        """
+        A number which changes whenever an exit is added to the graph, for
+        caching the results of analyses.
+
+        :getter: Returns the version of the graph
+        :type: int
+        """
+        return self._version
+
+    @property
+    def location_count(self):
+        """
+        The number of locations in the graph.
+
+        :getter: Returns the number of locations
+        :type: int
+        """
+        return len(self._locations)
+
+    @property
+    def direction_count(self):
+        """
+        The number of directions in which the graph's exits lead.
+
+        :getter: Returns the number of directions
+        :type: int
+        """
+        return len(self._directions)
+
+    @property
+    def exit_count(self):
+        """
+        The number of (one-way) exits in the graph.
+
+        :getter: Returns the number of exits
+        :type: int
+        """
+        return len(self._sources)
+
+    def location(self, location_id):
+        """
+        :param int location_id: The id of a location
+        :return: The location with the id
+        :rtype: Location
+        """
+        return self._locations[location_id]
+
+    def location_id(self, location):
+        """
+        :param Location location: A location in the graph
+        :return: The id of the location
+        :rtype: int
+        :raises: ``KeyError`` if the location is not in the graph
+        """
+        return self._location_ids[location]
+
+    def direction(self, direction_id):
+        """
+        :param int direction_id: The id of a direction
+        :return: The direction with the id
+        :rtype: Direction
+        """
+        return self._directions[direction_id]
+
+    def direction_id(self, direction):
+        """
+        :param Direction direction: A direction of an exit in the graph
+        :return: The id of the direction
+        :rtype: int
+        :raises: ``KeyError`` if no exit in the graph is in the direction
+        """
+        return self._direction_ids[direction]
+
+    def adjacency(self):
+        """
+        Returns the exits of the graph in compressed sparse row form.
+
+        The exits from location ``i`` are those from index ``offsets[i]``
+        up to (but not including) ``offsets[i + 1]`` of ``targets`` (the ids
+        of the locations to which they lead) and ``directions`` (the ids of
+        their directions), in the order in which they were added.
+
+        :return: ``offsets``, ``targets`` and ``directions``
+        :rtype: tuple of arrays
+        """
+        if self._adjacency is None:
+            self._adjacency = self._build_adjacency()
+        return self._adjacency
+
+    def _build_adjacency(self):
+        """
+        Sorts the exits by the location they lead from (see adjacency).
+
+        :return: ``offsets``, ``targets`` and ``directions``
+        :rtype: tuple of arrays
+        """
+        location_count = len(self._locations)
+        offsets = array(_ID_TYPECODE, [0]) * (location_count + 1)
+        for source in self._sources:
+            offsets[source + 1] += 1
+        for location_id in range(location_count):
+            offsets[location_id + 1] += offsets[location_id]
+
+        exit_count = len(self._sources)
+        targets = array(_ID_TYPECODE, [0]) * exit_count
+        directions = array(_ID_TYPECODE, [0]) * exit_count
+        next_index = offsets[:-1]
+        for source, target, direction in zip(
+                self._sources, self._targets, self._exit_directions):
+            index = next_index[source]
+            targets[index] = target
+            directions[index] = direction
+            next_index[source] = index + 1
+
+        return offsets, targets, directions
+
+    def numpy_adjacency(self):
+        """
+        Returns the exits of the graph in compressed sparse row form (see
+        adjacency) as NumPy arrays which share memory with the graph.
+
+        :return: ``offsets``, ``targets`` and ``directions``
+        :rtype: tuple of numpy.ndarray
+        :raises: ``ImportError`` if NumPy is not installed
+        """
+        if numpy is None:
+            raise ImportError('numpy is required for numpy_adjacency')
+        return tuple(_numpy_view(ids) for ids in self.adjacency())
+
+    def exits(self, location_id):
+        """
+        Returns the exits from a location.
+
+        :param int location_id: The id of the location
+        :return: The id of the direction of each exit and of the location to
+            which it leads
+        :rtype: list of tuples
+        """
+        offsets, targets, directions = self.adjacency()
+        start = offsets[location_id]
+        end = offsets[location_id + 1]
+        return list(zip(directions[start:end], targets[start:end]))
+
+    def out_degrees(self):
+        """
+        Returns the number of exits from each location.
+
+        :return: The number of exits, indexed by location id
+        :rtype: array (or numpy.ndarray if NumPy is installed)
+        """
+        offsets = self.adjacency()[0]
+        if numpy is not None:
+            offsets = _numpy_view(offsets)
+            return offsets[1:] - offsets[:-1]
+        return array(_ID_TYPECODE, [offsets[i + 1] - offsets[i]
+                                    for i in range(len(self._locations))])
+
+    def transition_table(self):
+        """
+        Returns the location reached from each location in each direction.
+
+        Entry ``location_id * direction_count + direction_id`` is the id of
+        the location reached, or -1 if there is no exit in that direction.
+        As with the game itself, a direction in which a location has more
+        than one exit does not lead anywhere.
+
+        :return: The transition table
+        :rtype: array (or numpy.ndarray if NumPy is installed)
+        """
+        direction_count = len(self._directions)
+        table = array(_ID_TYPECODE, [-1]) * (
+            len(self._locations) * direction_count)
+        seen = set()
+        for source, target, direction in zip(
+                self._sources, self._targets, self._exit_directions):
+            entry = source * direction_count + direction
+            if entry in seen:
+                table[entry] = -1
+            else:
+                seen.add(entry)
+                table[entry] = target
+
+        if numpy is not None:
+            return _numpy_view(table)
+        return table
+
+    def reachable(self, location_id=0):
+        """
+        Determines which locations can be reached from a location.
+
+        :param int location_id: The id of the location from which to start
+            (by default the one in which the character starts)
+        :return: For each location id, whether the location can be reached
+        :rtype: list of bool (or numpy.ndarray if NumPy is installed)
+        """
+        offsets, targets, _ = self.adjacency()
+        visited = bytearray(len(self._locations))
+        visited[location_id] = 1
+        frontier = [location_id]
+        if numpy is None:
+            while frontier:
+                frontier = _next_layer(offsets, targets, visited, frontier)
+            return [bool(is_visited) for is_visited in visited]
+
+        numpy_offsets, numpy_targets, _ = self.numpy_adjacency()
+        numpy_visited = numpy.frombuffer(visited, dtype=numpy.bool_)
+        while len(frontier):
+            # Vectorising a layer only pays off once it is large enough to
+            # outweigh NumPy's per-call overhead
+            if len(frontier) < _VECTORISE_LAYER_SIZE:
+                if isinstance(frontier, numpy.ndarray):
+                    frontier = frontier.tolist()
+                frontier = _next_layer(offsets, targets, visited, frontier)
+            else:
+                frontier = _numpy_next_layer(numpy_offsets, numpy_targets,
+                                             numpy_visited,
+                                             numpy.asarray(frontier))
+        return numpy_visited
+
+
+def _next_layer(offsets, targets, visited, frontier):
+    """
+    Finds the unvisited locations reached by the exits from a breadth-first
+    search layer, marking them as visited.
+
+    :param array offsets: The offsets of the graph (see adjacency)
+    :param array targets: The targets of the graph (see adjacency)
+    :param bytearray visited: For each location id, whether the location
+        has been visited
+    :param list frontier: The ids of the locations in the layer
+    :return: The ids of the locations in the next layer
+    :rtype: list
+    """
+    next_layer = []
+    for current in frontier:
+        for index in range(offsets[current], offsets[current + 1]):
+            target = targets[index]
+            if not visited[target]:
+                visited[target] = 1
+                next_layer.append(target)
+    return next_layer
+
+
+def _numpy_next_layer(offsets, targets, visited, frontier):
+    """
+    Finds the unvisited locations reached by the exits from a breadth-first
+    search layer using NumPy, marking them as visited (see _next_layer).
+
+    :param numpy.ndarray offsets: The offsets of the graph
+    :param numpy.ndarray targets: The targets of the graph
+    :param numpy.ndarray visited: For each location id, whether the
+        location has been visited
+    :param numpy.ndarray frontier: The ids of the locations in the layer
+    :return: The ids of the locations in the next layer
+    :rtype: numpy.ndarray
+    """
+    starts = offsets[frontier]
+    counts = offsets[frontier + 1] - starts
+    has_exits = counts > 0
+    if not has_exits.any():
+        return frontier[:0]
+    starts = starts[has_exits]
+    counts = counts[has_exits]
+    # The indexes of the exits from every location in the layer, found as
+    # the running total of steps which are 1 within the exits of one
+    # location and jump to the first exit of the next
+    steps = numpy.ones(int(counts.sum()), dtype=numpy.intp)
+    steps[0] = starts[0]
+    steps[numpy.cumsum(counts)[:-1]] = (
+        starts[1:] - starts[:-1] - counts[:-1] + 1)
+    neighbours = targets[numpy.cumsum(steps)]
+    neighbours = numpy.unique(neighbours[~visited[neighbours]])
+    visited[neighbours] = True
+    return neighbours
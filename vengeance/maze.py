@@ -0,0 +1,359 @@
+"""
+Generating mazes.
+
+A maze is a rectangular grid of cells, each of which becomes a location,
+with passages between neighbouring cells. Mazes are perfect: there is
+exactly one route between any two cells. Several algorithms are available,
+each of which runs in time proportional to the number of cells and uses an
+explicit stack or list rather than recursion, so mazes of millions of cells
+can be generated.
+"""
+import random
+
+import vengeance
+from vengeance.directions import EAST
+from vengeance.directions import NORTH
+from vengeance.directions import SOUTH
+from vengeance.directions import WEST
+from vengeance.game import Game
+from vengeance.game import Location
+
+# Bits of a cell's openings which are set when it has a passage in each
+# direction
+_NORTH = 1
+_EAST = 2
+_SOUTH = 4
+_WEST = 8
+
+# The bits of the directions in turn, such that the bits of opposite
+# directions are two positions apart
+_OPENINGS = (_NORTH, _EAST, _SOUTH, _WEST)
+
+_OPENING_BITS = {
+    NORTH: _NORTH,
+    EAST: _EAST,
+    SOUTH: _SOUTH,
+    WEST: _WEST
+}
+
+# Tables translating a cell's openings into the characters drawn for its
+# south and east walls
+_SOUTH_WALLS = bytes(bytearray(
+    ord(' ') if openings & _SOUTH else ord('_') for openings in range(256)))
+_EAST_WALLS = bytes(bytearray(
+    ord(' ') if openings & _EAST else ord('|') for openings in range(256)))
+
+
+class Maze(object):
+    """
+    A rectangular maze.
+
+    Cell (0, 0) is at the bottom left (south west) of the maze. Cells are
+    indexed in rows from south to north, each from west to east, so cell
+    (x, y) has index ``y * width + x``.
+
+    :param int width: The number of cells from west to east
+    :param int height: The number of cells from south to north
+    :param bytearray openings: For each cell index, the bits of the
+        directions in which the cell has a passage
+    """
+    def __init__(self, width, height, openings):
+        self._width = width
+        self._height = height
+        self._openings = openings
+
+    @property
+    def width(self):
+        """
+        The number of cells from west to east.
+
+        :getter: Returns the width of the maze
+        :type: int
+        """
+        return self._width
+
+    @property
+    def height(self):
+        """
+        The number of cells from south to north.
+
+        :getter: Returns the height of the maze
+        :type: int
+        """
+        return self._height
+
+    def has_passage(self, x, y, direction):
+        """
+        :param int x: The distance of a cell from the west of the maze
+        :param int y: The distance of a cell from the south of the maze
+        :param Direction direction: NORTH, EAST, SOUTH or WEST
+        :return: True if there is a passage from the cell in the direction
+        :rtype: bool
+        """
+        return bool(
+            self._openings[y * self._width + x] & _OPENING_BITS[direction])
+
+    @staticmethod
+    def location_name(x, y):
+        """
+        :param int x: The distance of a cell from the west of the maze
+        :param int y: The distance of a cell from the south of the maze
+        :return: The name of the location created for the cell
+        :rtype: string
+        """
+        return u'Location {0}, {1}'.format(x, y)
+
+    @classmethod
+    def from_locations(cls, locations, width):
+        """
+        Creates a maze from a grid of locations, such as those of a game
+        created from a maze, with a passage wherever an exit leads north,
+        east, south or west to the neighbouring location.
+
+        :param list locations: The locations, in the order of the cells of
+            the maze (see Maze)
+        :param int width: The number of locations from west to east
+        :return: The maze
+        :rtype: Maze
+        :raises: ``ValueError`` if the locations do not fill a rectangle
+            of the given width
+        """
+        if width < 1 or not locations or len(locations) % width:
+            raise ValueError(u'Locations must fill a rectangle')
+
+        indexes = dict((location, index)
+                       for index, location in enumerate(locations))
+        steps = {
+            NORTH.name: (_NORTH, width),
+            EAST.name: (_EAST, 1),
+            SOUTH.name: (_SOUTH, -width),
+            WEST.name: (_WEST, -1)
+        }
+        openings = bytearray(len(locations))
+        for index, location in enumerate(locations):
+            for an_exit in location.exits:
+                bit, step = steps.get(an_exit.direction.name, (0, None))
+                if bit and indexes.get(an_exit.to_location) == index + step:
+                    openings[index] |= bit
+        return cls(width, len(locations) // width, openings)
+
+    def render_rows(self):
+        """
+        Draws the maze as text, one row of cells at a time, with walls
+        drawn as ``_`` and ``|``.
+
+        Each row is written into the same buffer, using tables which
+        translate whole rows of cells into their walls at once.
+
+        :return: The lines of the drawing, each ending with a newline, from
+            north to south
+        :rtype: generator of strings
+        """
+        width = self._width
+        yield u' ' + u'_ ' * width + u'\n'
+
+        row = bytearray(b'|' + b' ' * (2 * width) + b'\n')
+        for y in range(self._height - 1, -1, -1):
+            cells = self._openings[y * width:(y + 1) * width]
+            row[1:-1:2] = cells.translate(_SOUTH_WALLS)
+            row[2:-1:2] = cells.translate(_EAST_WALLS)
+            yield row.decode('ascii')
+
+    def render(self, stream=None):
+        """
+        Draws the maze as text (see render_rows).
+
+        :param stream: A file-like object to which to write the drawing a
+            row at a time, rather than holding the drawing of a large maze
+            in memory (by default the drawing is returned)
+        :return: The drawing, if stream is not given
+        :rtype: string
+        """
+        if stream is None:
+            return u''.join(self.render_rows())
+
+        for row in self.render_rows():
+            stream.write(row)
+
+    def create_game(self):
+        """
+        Creates a game whose locations are the cells of the maze, with exits
+        along its passages. The character starts in cell (0, 0).
+
+        :return: The game
+        :rtype: Game
+        """
+        # Disable 'Access to a protected member _without_garbage_collection
+        # of a client class'
+        # pylint: disable=W0212
+        return vengeance._without_garbage_collection(self._create_game)
+
+    def _create_game(self):
+        """
+        Creates a game from the maze (see create_game).
+
+        :return: The game
+        :rtype: Game
+        """
+        width = self._width
+        locations = [Location(self.location_name(index % width,
+                                                 index // width))
+                     for index in range(len(self._openings))]
+        for index, openings in enumerate(self._openings):
+            if openings & _EAST:
+                locations[index].add_exit(EAST, locations[index + 1])
+            if openings & _NORTH:
+                locations[index].add_exit(NORTH, locations[index + width])
+        return Game(locations)
+
+
+def generate_maze(width, height, algorithm='backtracker', seed=None):
+    """
+    Generates a maze.
+
+    The algorithms are:
+
+    * ``'backtracker'``: a random walk which backtracks from dead ends,
+      giving long, winding passages
+    * ``'prim'``: grows the maze from a random cell by opening random
+      walls on its edge, giving many short dead ends
+    * ``'binary_tree'``: opens a passage north or east from every cell,
+      giving a maze biased towards the north east
+
+    :param int width: The number of cells from west to east
+    :param int height: The number of cells from south to north
+    :param string algorithm: The algorithm with which to generate the maze
+    :param seed: The seed for the random choices of the algorithm, so that
+        the same seed generates the same maze
+    :return: The maze
+    :rtype: Maze
+    :raises: ``ValueError`` if the maze has no cells or the algorithm is
+        unknown
+    """
+    if width < 1 or height < 1:
+        raise ValueError(u'Maze must have at least one cell')
+    if algorithm not in _ALGORITHMS:
+        raise ValueError(u'Unknown maze algorithm "{0}"'.format(algorithm))
+
+    openings = bytearray(width * height)
+    _ALGORITHMS[algorithm](width, height, openings, random.Random(seed))
+    return Maze(width, height, openings)
+
+
+def _neighbour_directions(index, width, cell_count):
+    """
+    :param int index: The index of a cell
+    :param int width: The width of the maze
+    :param int cell_count: The number of cells in the maze
+    :return: The positions in _OPENINGS of the directions in which the cell
+        has neighbouring cells
+    :rtype: list of ints
+    """
+    directions = []
+    if index + width < cell_count:
+        directions.append(0)
+    if index % width < width - 1:
+        directions.append(1)
+    if index >= width:
+        directions.append(2)
+    if index % width:
+        directions.append(3)
+    return directions
+
+
+def _backtracker(width, height, openings, generator):
+    """
+    Opens passages by a random walk which backtracks from dead ends.
+
+    :param int width: The width of the maze
+    :param int height: The height of the maze
+    :param bytearray openings: The openings of each cell, which are set
+    :param random.Random generator: The source of random choices
+    """
+    cell_count = width * height
+    steps = (width, 1, -width, -1)
+    visited = bytearray(cell_count)
+    start = generator.randrange(cell_count)
+    visited[start] = 1
+    stack = [start]
+    while stack:
+        index = stack[-1]
+        unvisited = [direction for direction
+                     in _neighbour_directions(index, width, cell_count)
+                     if not visited[index + steps[direction]]]
+        if not unvisited:
+            stack.pop()
+            continue
+
+        direction = unvisited[int(generator.random() * len(unvisited))]
+        neighbour = index + steps[direction]
+        openings[index] |= _OPENINGS[direction]
+        openings[neighbour] |= _OPENINGS[direction ^ 2]
+        visited[neighbour] = 1
+        stack.append(neighbour)
+
+
+def _prim(width, height, openings, generator):
+    """
+    Opens passages by growing the maze from a random cell, opening a random
+    wall between a cell in the maze and one outside it each time.
+
+    :param int width: The width of the maze
+    :param int height: The height of the maze
+    :param bytearray openings: The openings of each cell, which are set
+    :param random.Random generator: The source of random choices
+    """
+    cell_count = width * height
+    steps = (width, 1, -width, -1)
+    in_maze = bytearray(cell_count)
+    start = generator.randrange(cell_count)
+    in_maze[start] = 1
+    # Each wall is held as four times the index of the cell in the maze plus
+    # the position of its direction in _OPENINGS
+    walls = [start * 4 + direction for direction
+             in _neighbour_directions(start, width, cell_count)]
+    while walls:
+        # Remove a random wall by moving the last wall into its place
+        position = int(generator.random() * len(walls))
+        wall = walls[position]
+        walls[position] = walls[-1]
+        walls.pop()
+        index, direction = divmod(wall, 4)
+        neighbour = index + steps[direction]
+        if in_maze[neighbour]:
+            continue
+
+        openings[index] |= _OPENINGS[direction]
+        openings[neighbour] |= _OPENINGS[direction ^ 2]
+        in_maze[neighbour] = 1
+        walls.extend(neighbour * 4 + next_direction for next_direction
+                     in _neighbour_directions(neighbour, width, cell_count)
+                     if not in_maze[neighbour + steps[next_direction]])
+
+
+def _binary_tree(width, height, openings, generator):
+    """
+    Opens a passage north or east from every cell, where there is a cell in
+    that direction.
+
+    :param int width: The width of the maze
+    :param int height: The height of the maze
+    :param bytearray openings: The openings of each cell, which are set
+    :param random.Random generator: The source of random choices
+    """
+    for index in range(width * height):
+        can_go_north = index + width < width * height
+        can_go_east = index % width < width - 1
+        if can_go_north and (not can_go_east or generator.random() < 0.5):
+            openings[index] |= _NORTH
+            openings[index + width] |= _SOUTH
+        elif can_go_east:
+            openings[index] |= _EAST
+            openings[index + 1] |= _WEST
+
+
+_ALGORITHMS = {
+    'backtracker': _backtracker,
+    'prim': _prim,
+    'binary_tree': _binary_tree
+}
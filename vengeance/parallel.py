@@ -0,0 +1,290 @@
+"""
+Creating games using several processes.
+
+Checking that the rooms and exits of a very large game are well formed can
+be shared between processes: each checks a contiguous shard of the rooms
+and reports the first problem it finds, and the problems are merged in
+input order so that the error raised is exactly the one which
+vengeance.create_game would raise. The locations and exits are then
+created, without checking them again, in the calling process.
+
+Where it is safe to start processes by forking, the rooms are passed to
+the processes as they start, so are read from the memory they inherit
+rather than being copied to them. Forking a process which has started other
+threads can leave locks held by those threads locked for ever in the child,
+so such processes instead start their workers by the forkserver or spawn
+method, and each worker is sent a copy of its shard.
+
+Only checking is shared between processes: locations and exits are Python
+objects, so must be created in the calling process. On the world of
+benchmarks/create_game.py checking is only about 15% of the time taken to
+create a game, so sharing it saves at most that 15% however many processes
+are used: the time taken does not scale with the number of processes.
+"""
+import multiprocessing
+import sys
+import threading
+
+import vengeance
+from vengeance.game import Game
+from vengeance.game import GameFormatException
+from vengeance.game import Location
+
+try:
+    from concurrent.futures import ProcessPoolExecutor
+except ImportError:
+    ProcessPoolExecutor = None
+
+# Stages of checking a room, in the order in which create_game checks them
+_NAMED = 0
+_NOT_REDEFINED = 1
+_DESCRIBED = 2
+
+# The rooms being checked, in a worker process started by forking (see
+# _share_location_data)
+_shared_location_data = None
+
+
+def create_game_in_parallel(game_data, max_workers=None):
+    """
+    Creates a game, checking its rooms and exits in several processes.
+
+    The game created, and any error raised, are the same as those of
+    vengeance.create_game. Where processes are not available (as in Python
+    2, which lacks concurrent.futures) the game is created by
+    vengeance.create_game.
+
+    :param dict game_data: Details of the game (see run_game)
+    :param int max_workers: The number of processes to use (by default the
+        number of processors)
+    :return: Created game
+    :rtype: Game
+    :raises: ``GameFormatException`` if ``game_data`` is invalid
+    """
+    if ProcessPoolExecutor is None:
+        return vengeance.create_game(game_data)
+
+    if not isinstance(game_data, dict):
+        raise GameFormatException(u'game_data must be a dictionary')
+
+    if 'directions' not in game_data:
+        raise GameFormatException(u'Missing directions list')
+
+    # Disable 'Access to a protected member _create_directions of a client
+    # class'
+    # Disable 'Access to a protected member _get_location_data of a client
+    # class'
+    # pylint: disable=W0212
+    directions = vengeance._create_directions(game_data['directions'])
+    location_data = vengeance._get_location_data(game_data)
+
+    shards = _check_shards(location_data,
+                           max_workers or multiprocessing.cpu_count())
+    _raise_first_error(location_data, shards)
+
+    # Disable 'Access to a protected member _without_garbage_collection
+    # of a client class'
+    # pylint: disable=W0212
+    return vengeance._without_garbage_collection(
+        _build_game, directions, location_data)
+
+
+def _check_shards(location_data, worker_count):
+    """
+    Checks shards of the rooms of a game in separate processes.
+
+    :param list location_data: Details of the locations in the game
+    :param int worker_count: The number of processes to use
+    :return: The results of _check_rooms for each shard, in order
+    :rtype: list of tuples
+    """
+    shard_size = -(-len(location_data) // worker_count)
+    starts = list(range(0, len(location_data), shard_size))
+    stops = [start + shard_size for start in starts]
+
+    context = _worker_context()
+    if context is not None and context.get_start_method() == 'fork':
+        # Each process inherits all of the rooms, and checks its shard
+        with ProcessPoolExecutor(len(starts), mp_context=context,
+                                 initializer=_share_location_data,
+                                 initargs=(location_data,)) as executor:
+            return list(executor.map(_check_shared_rooms, starts, stops))
+
+    # Each process is sent a copy of its shard
+    shards = [location_data[start:stop]
+              for start, stop in zip(starts, stops)]
+    if context is None:
+        executor = ProcessPoolExecutor(len(starts))
+    else:
+        executor = ProcessPoolExecutor(len(starts), mp_context=context)
+    with executor:
+        return list(executor.map(_check_rooms, shards, starts))
+
+
+def _worker_context():
+    """
+    Chooses how to start the processes which check rooms.
+
+    Processes are started by forking unless this process has started other
+    threads (which may hold locks when it forks), in which case they are
+    started by the forkserver or spawn method.
+
+    :return: The context with which to start processes, or None if the
+        method cannot be chosen (before Python 3.7)
+    :rtype: multiprocessing.context.BaseContext
+    """
+    if sys.version_info < (3, 7):
+        return None
+
+    methods = multiprocessing.get_all_start_methods()
+    if 'fork' in methods and threading.active_count() == 1:
+        return multiprocessing.get_context('fork')
+    for method in ('forkserver', 'spawn'):
+        if method in methods:
+            return multiprocessing.get_context(method)
+    return None
+
+
+def _share_location_data(location_data):
+    # Disable 'Using the global statement'
+    # pylint: disable=W0603
+    """
+    Keeps the rooms of a game in a worker process started by forking, which
+    inherits them from the process which started it.
+
+    :param list location_data: Details of the locations in the game
+    """
+    global _shared_location_data
+    _shared_location_data = location_data
+
+
+def _check_shared_rooms(start, stop):
+    """
+    Checks a shard of the rooms kept by _share_location_data.
+
+    :param int start: The index of the first room in the shard
+    :param int stop: The index after that of the last room in the shard
+    :return: See _check_rooms
+    :rtype: tuple
+    """
+    return _check_rooms(_shared_location_data[start:stop], start)
+
+
+def _check_rooms(location_data, offset):
+    # Disable 'Access to a protected member _check_location_named of a
+    # client class'
+    # Disable 'Access to a protected member _check_location_described of a
+    # client class'
+    # Disable 'Access to a protected member _check_exit_well_formed of a
+    # client class'
+    # pylint: disable=W0212
+    """
+    Checks a shard of the rooms of a game, and their exits.
+
+    Whether a room's name is a redefinition depends on the rooms in other
+    shards, so is not checked.
+
+    :param list location_data: Details of the locations in the shard
+    :param int offset: The index of the first room in the shard
+    :return: The first error found in a room, as a tuple of its index,
+        stage and message (or None) and, if no room has an error, the first
+        error found in an exit, as a tuple of its room's index, its index
+        and message (or None)
+    :rtype: tuple
+    """
+    exit_error = None
+    for index, location_datum in enumerate(location_data, offset):
+        # create_game stops at the first room with an error, so rooms after
+        # it in the shard need not be checked
+        try:
+            name = vengeance._check_location_named(location_datum)
+        except GameFormatException as e:
+            return (index, _NAMED, e.args[0]), None
+        try:
+            vengeance._check_location_described(location_datum)
+        except GameFormatException as e:
+            return (index, _DESCRIBED, e.args[0]), None
+
+        if exit_error is not None:
+            continue
+
+        for exit_index, exit_datum in enumerate(
+                location_datum.get('exits', ())):
+            try:
+                vengeance._check_exit_well_formed(exit_datum, name)
+            except GameFormatException as e:
+                exit_error = (index, exit_index, e.args[0])
+                break
+
+    return None, exit_error
+
+
+def _raise_first_error(location_data, shards):
+    """
+    Raises the error which create_game would raise first, if any, from the
+    results of checking the shards of a game's rooms.
+
+    :param list location_data: Details of the locations in the game
+    :param list shards: The results of _check_rooms for each shard, in
+        order
+    :raises: ``GameFormatException`` if any room or exit is invalid
+    """
+    room_errors = [room_error for room_error, _ in shards if room_error]
+    exit_errors = [exit_error for _, exit_error in shards if exit_error]
+
+    # Rooms are only checked for redefinition up to the first room with
+    # another error, as create_game stops there. Every room before it has
+    # a name which is a string.
+    first_error = min(room_errors) if room_errors else None
+    if first_error is None:
+        stop = len(location_data)
+    elif first_error[1] == _NAMED:
+        stop = first_error[0]
+    else:
+        stop = first_error[0] + 1
+    names = set()
+    for index in range(stop):
+        name = location_data[index]['name']
+        if name in names:
+            message = u'Redefinition of room "{0}"'
+            room_errors.append((index, _NOT_REDEFINED, message.format(name)))
+            break
+        names.add(name)
+
+    if room_errors:
+        raise GameFormatException(min(room_errors)[2])
+    if exit_errors:
+        raise GameFormatException(min(exit_errors)[2])
+
+
+def _build_game(directions, location_data):
+    # Disable 'Access to a protected member _resolve_exit of a client class'
+    # pylint: disable=W0212
+    """
+    Creates a game from details already checked to be well formed.
+
+    :param dict directions: The directions in the game, keyed by name
+    :param list location_data: Details of the locations in the game
+    :return: Created game
+    :rtype: Game
+    :raises: ``GameFormatException`` if an exit leads to an unknown room or
+        in an unknown direction
+    """
+    locations = [Location(location_datum['name'],
+                          location_datum['description'])
+                 for location_datum in location_data]
+    game = Game(locations)
+    for from_location, location_datum in zip(locations, location_data):
+        for exit_datum in location_datum.get('exits', ()):
+            to_location, direction, message = vengeance._resolve_exit(
+                game, directions, from_location.name, exit_datum['to'],
+                exit_datum['direction'])
+            if message is not None:
+                raise GameFormatException(message)
+
+            if exit_datum.get('one_way', False):
+                from_location.add_one_way_exit(direction, to_location)
+            else:
+                from_location.add_exit(direction, to_location)
+
+    return game
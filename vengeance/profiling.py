@@ -0,0 +1,211 @@
+"""
+Profiling the rounds of a game.
+
+A game given a profiler (see Game.profiler) times each phase of every round
+it runs: rendering the current location, displaying it, waiting for input,
+processing the input and calling the end of round handler. The timings are
+kept as histograms, from which slow phases and their distribution can be
+read, and can also be passed to a sink, such as a function which forwards
+them to a metrics service. A game without a profiler does no timing.
+"""
+import bisect
+import time
+
+# The phases of a round, in the order in which they happen
+RENDER = 'render'
+DISPLAY = 'display'
+INPUT = 'input'
+PROCESS_INPUT = 'process_input'
+QUIT = 'quit'
+END_OF_ROUND = 'end_of_round'
+ROUND = 'round'
+
+PHASES = (RENDER, DISPLAY, INPUT, PROCESS_INPUT, QUIT, END_OF_ROUND, ROUND)
+
+# The upper bounds, in seconds, of all but the last bucket of a histogram:
+# one microsecond, doubling up to about half an hour
+_BUCKET_BOUNDS = tuple(1e-6 * 2 ** i for i in range(32))
+
+# The most accurate clock available which never goes backwards (Python 2
+# lacks one, so the time of day is used)
+_clock = getattr(time, 'perf_counter', time.time)
+
+
+class Histogram(object):
+    """
+    A histogram of durations, counted in buckets whose bounds double from
+    one microsecond upwards.
+    """
+    def __init__(self):
+        self._counts = [0] * (len(_BUCKET_BOUNDS) + 1)
+        self._count = 0
+        self._total = 0.0
+        self._max = 0.0
+
+    def record(self, duration):
+        """
+        Records a duration.
+
+        :param float duration: The duration in seconds
+        """
+        self._counts[bisect.bisect_left(_BUCKET_BOUNDS, duration)] += 1
+        self._count += 1
+        self._total += duration
+        if duration > self._max:
+            self._max = duration
+
+    @property
+    def count(self):
+        """
+        The number of durations recorded.
+
+        :getter: Returns the number of durations
+        :type: int
+        """
+        return self._count
+
+    @property
+    def total(self):
+        """
+        The sum of the durations recorded.
+
+        :getter: Returns the total duration in seconds
+        :type: float
+        """
+        return self._total
+
+    @property
+    def mean(self):
+        """
+        The mean of the durations recorded.
+
+        :getter: Returns the mean duration in seconds, or 0 if none has
+            been recorded
+        :type: float
+        """
+        if not self._count:
+            return 0.0
+        return self._total / self._count
+
+    @property
+    def max(self):
+        """
+        The longest duration recorded.
+
+        :getter: Returns the longest duration in seconds, or 0 if none has
+            been recorded
+        :type: float
+        """
+        return self._max
+
+    @property
+    def buckets(self):
+        """
+        The number of durations in each bucket which is not empty.
+
+        :getter: Returns the upper bound of each bucket in seconds (None
+            for the last, which is unbounded) and the number of durations
+            in it
+        :type: list of tuples
+        """
+        bounds = _BUCKET_BOUNDS + (None,)
+        return [(bounds[index], count)
+                for index, count in enumerate(self._counts) if count]
+
+    def quantile(self, fraction):
+        """
+        Estimates a quantile of the durations recorded, such as the median
+        (0.5) or the 99th percentile (0.99).
+
+        :param float fraction: The fraction of durations which are at most
+            the quantile
+        :return: The upper bound of the bucket containing the quantile, in
+            seconds (or the longest duration if that is smaller), or 0 if
+            none has been recorded
+        :rtype: float
+        :raises: ``ValueError`` if ``fraction`` is not between 0 and 1
+        """
+        if not 0 <= fraction <= 1:
+            raise ValueError(u'fraction must be between 0 and 1')
+        if not self._count:
+            return 0.0
+
+        rank = fraction * self._count
+        seen = 0
+        for index, count in enumerate(self._counts[:-1]):
+            seen += count
+            if seen and seen >= rank:
+                return min(_BUCKET_BOUNDS[index], self._max)
+        return self._max
+
+
+class RoundProfiler(object):
+    """
+    Times the phases of each round of a game (see Game.profiler).
+
+    :param function sink: A function called at the end of each round with
+        the timings of the round, as a dictionary of the duration in seconds
+        of each phase which happened in the round keyed by phase (see
+        PHASES). It is called in the game loop, so should be quick
+    :param function clock: The function returning the current time in
+        seconds (by default the most accurate clock available)
+    """
+    def __init__(self, sink=None, clock=_clock):
+        self._sink = sink
+        self._clock = clock
+        self._histograms = dict((phase, Histogram()) for phase in PHASES)
+        self._round_started_at = None
+        self._phase_started_at = None
+        self._timings = None
+
+    @property
+    def histograms(self):
+        """
+        The durations of each phase.
+
+        :getter: Returns the histogram of the durations of each phase,
+            keyed by phase (see PHASES)
+        :type: dict
+        """
+        return self._histograms
+
+    @property
+    def round_count(self):
+        """
+        The number of rounds timed.
+
+        :getter: Returns the number of rounds
+        :type: int
+        """
+        return self._histograms[ROUND].count
+
+    def start_round(self):
+        """
+        Starts timing a round, and its first phase.
+        """
+        now = self._clock()
+        self._round_started_at = now
+        self._phase_started_at = now
+        self._timings = {}
+
+    def end_phase(self, phase):
+        """
+        Ends a phase of the round, and starts timing the next.
+
+        :param string phase: The phase which has ended (see PHASES)
+        """
+        now = self._clock()
+        self._timings[phase] = now - self._phase_started_at
+        self._phase_started_at = now
+
+    def end_round(self):
+        """
+        Ends the round, recording the duration of each of its phases and
+        passing them to the sink (if any).
+        """
+        timings = self._timings
+        timings[ROUND] = self._phase_started_at - self._round_started_at
+        for phase, duration in timings.items():
+            self._histograms[phase].record(duration)
+        if self._sink is not None:
+            self._sink(timings)
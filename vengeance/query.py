@@ -0,0 +1,366 @@
+"""
+Queries about the routes between locations.
+
+A location query answers questions such as whether one location can be
+reached from another and what the shortest route between them is, by
+breadth-first search over a LocationGraph. The most recently used results
+are cached until an exit is added to the game.
+"""
+import collections
+from array import array
+
+from vengeance.graph import LocationGraph
+from vengeance.graph import _next_layer
+
+
+_DEFAULT_CACHE_SIZE = 64
+
+
+class LocationQuery(object):
+    """
+    Answers queries about the routes between the locations of a game.
+
+    Many results (such as the distances from a location) take memory
+    proportional to the number of locations, so only a bounded number of
+    the most recently used results are cached.
+
+    A query keeps its graph in step with the game's locations by listening
+    for exits added to them, so should be closed (or used as a context
+    manager) when no longer needed.
+
+    :param Game game: The game whose locations to query
+    :param int cache_size: The number of results to cache
+    :raises: ``ValueError`` if ``cache_size`` is negative
+    """
+    def __init__(self, game, cache_size=_DEFAULT_CACHE_SIZE):
+        if cache_size < 0:
+            raise ValueError(u'cache_size must not be negative')
+
+        self._graph = LocationGraph(game)
+        self._cache_size = cache_size
+        # Results keyed by query, least recently used first
+        self._cache = collections.OrderedDict()
+        self._cache_version = self._graph.version
+        # The exits indexed by the location they lead to, built when first
+        # needed (see _shortest_route)
+        self._reverse = None
+
+    def close(self):
+        """
+        Stops keeping the query's graph in step with the game's locations,
+        and discards any cached results.
+        """
+        self._graph.close()
+        self._cache.clear()
+        self._reverse = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    @property
+    def cached_count(self):
+        """
+        The number of results currently cached.
+
+        :getter: Returns the number of cached results
+        :type: int
+        """
+        return len(self._cache)
+
+    @property
+    def graph(self):
+        """
+        The graph over which queries are answered, which maps between
+        locations and their ids.
+
+        :getter: Returns the graph
+        :type: LocationGraph
+        """
+        return self._graph
+
+    def _cached(self, key, compute, *args):
+        """
+        Returns a cached result, computing it if it is not cached or the
+        graph has changed since it was.
+
+        :param key: The key of the result in the cache
+        :param function compute: The function computing the result
+        :param args: The arguments to pass to ``compute``
+        :return: The result
+        """
+        cache = self._cache
+        if self._cache_version != self._graph.version:
+            cache.clear()
+            self._reverse = None
+            self._cache_version = self._graph.version
+
+        if key in cache:
+            result = cache.pop(key)
+        else:
+            result = compute(*args)
+            if not self._cache_size:
+                return result
+            if len(cache) >= self._cache_size:
+                cache.popitem(last=False)
+        cache[key] = result
+        return result
+
+    def is_reachable(self, from_location, to_location):
+        """
+        :param Location from_location: The location from which to start
+        :param Location to_location: The location to reach
+        :return: True if to_location can be reached from from_location
+        :rtype: bool
+        :raises: ``KeyError`` if either location is not in the game
+        """
+        to_id = self._graph.location_id(to_location)
+        return bool(self._reachable(from_location)[to_id])
+
+    def reachable_locations(self, from_location):
+        """
+        :param Location from_location: The location from which to start
+        :return: The locations which can be reached from from_location
+            (including itself), in order of location id
+        :rtype: list of Location objects
+        :raises: ``KeyError`` if the location is not in the game
+        """
+        return [self._graph.location(location_id) for location_id, is_reachable
+                in enumerate(self._reachable(from_location)) if is_reachable]
+
+    def _reachable(self, from_location):
+        """
+        :param Location from_location: The location from which to start
+        :return: For each location id, whether the location can be reached
+        :rtype: list of bool (or numpy.ndarray if NumPy is installed)
+        """
+        from_id = self._graph.location_id(from_location)
+        return self._cached(('reachable', from_id), self._graph.reachable,
+                            from_id)
+
+    def distance(self, from_location, to_location):
+        """
+        :param Location from_location: The location from which to start
+        :param Location to_location: The location to reach
+        :return: The smallest number of exits taken to reach to_location
+            from from_location, or None if it cannot be reached
+        :rtype: int
+        :raises: ``KeyError`` if either location is not in the game
+        """
+        from_id = self._graph.location_id(from_location)
+        to_id = self._graph.location_id(to_location)
+        hops = self._distances(from_id)[to_id]
+        if hops < 0:
+            return None
+        return hops
+
+    def distances(self, from_location):
+        """
+        :param Location from_location: The location from which to start
+        :return: The smallest number of exits taken to reach each location
+            which can be reached from from_location
+        :rtype: dict of Location to int
+        :raises: ``KeyError`` if the location is not in the game
+        """
+        from_id = self._graph.location_id(from_location)
+        return dict((self._graph.location(location_id), hops)
+                    for location_id, hops
+                    in enumerate(self._distances(from_id)) if hops >= 0)
+
+    def _distances(self, from_id):
+        """
+        :param int from_id: The id of the location from which to start
+        :return: The hop distance to each location, or -1 if it cannot be
+            reached, indexed by location id
+        :rtype: array
+        """
+        return self._cached(('distances', from_id), _hop_distances,
+                            self._graph, from_id)
+
+    def all_pairs_distances(self):
+        """
+        Finds the hop distances between every pair of locations.
+
+        This takes time and memory proportional to the square of the number
+        of locations, so for large worlds prefer distances or
+        shortest_route. The distances are not cached.
+
+        :return: For each location id, the hop distance to each location,
+            or -1 if it cannot be reached, indexed by location id (see
+            graph)
+        :rtype: list of arrays
+        """
+        return [_hop_distances(self._graph, from_id)
+                for from_id in range(self._graph.location_count)]
+
+    def shortest_route(self, from_location, to_location):
+        """
+        Finds the shortest route from one location to another.
+
+        The route is found by a breadth-first search from both ends, which
+        visits far fewer locations than a search from one end in large
+        worlds.
+
+        :param Location from_location: The location from which to start
+        :param Location to_location: The location to reach
+        :return: The directions of the exits to take in turn, or None if
+            to_location cannot be reached
+        :rtype: list of Direction objects
+        :raises: ``KeyError`` if either location is not in the game
+        """
+        from_id = self._graph.location_id(from_location)
+        to_id = self._graph.location_id(to_location)
+        route = self._cached(('route', from_id, to_id), self._shortest_route,
+                             from_id, to_id)
+        if route is None:
+            return None
+        return [self._graph.direction(direction_id)
+                for direction_id in route]
+
+    def _shortest_route(self, from_id, to_id):
+        """
+        Finds the shortest route between two locations (see shortest_route).
+
+        :param int from_id: The id of the location from which to start
+        :param int to_id: The id of the location to reach
+        :return: The ids of the directions of the exits to take in turn, or
+            None if to_location cannot be reached
+        :rtype: list of ints
+        """
+        forward = self._graph.adjacency()
+        # Called through _cached, which discards the reverse adjacency if
+        # the graph has changed
+        if self._reverse is None:
+            self._reverse = _reverse_adjacency(self._graph)
+        backward = self._reverse
+        # Each search records, for each location it has visited, its
+        # distance from its starting location and the exit by which it was
+        # reached (a location id and direction id)
+        forward_visited = {from_id: (0, None)}
+        backward_visited = {to_id: (0, None)}
+        forward_frontier = [from_id]
+        backward_frontier = [to_id]
+        meeting = from_id if from_id == to_id else None
+
+        while meeting is None and forward_frontier and backward_frontier:
+            # Expand the smaller frontier
+            if len(forward_frontier) <= len(backward_frontier):
+                forward_frontier, meeting = _expand_layer(
+                    forward, forward_frontier, forward_visited,
+                    backward_visited)
+            else:
+                backward_frontier, meeting = _expand_layer(
+                    backward, backward_frontier, backward_visited,
+                    forward_visited)
+
+        if meeting is None:
+            return None
+
+        route = []
+        location_id = meeting
+        while forward_visited[location_id][1] is not None:
+            location_id, direction_id = forward_visited[location_id][1]
+            route.append(direction_id)
+        route.reverse()
+        location_id = meeting
+        while backward_visited[location_id][1] is not None:
+            location_id, direction_id = backward_visited[location_id][1]
+            route.append(direction_id)
+        return route
+
+
+def _hop_distances(graph, from_id):
+    """
+    Finds the hop distance from a location to every location by
+    breadth-first search.
+
+    :param LocationGraph graph: The graph to search
+    :param int from_id: The id of the location from which to start
+    :return: The hop distance to each location, or -1 if it cannot be
+        reached, indexed by location id
+    :rtype: array
+    """
+    offsets, targets, _ = graph.adjacency()
+    location_count = graph.location_count
+    distances = array('i', [-1]) * location_count
+    visited = bytearray(location_count)
+    visited[from_id] = 1
+    frontier = [from_id]
+    hops = 0
+    while frontier:
+        for location_id in frontier:
+            distances[location_id] = hops
+        frontier = _next_layer(offsets, targets, visited, frontier)
+        hops += 1
+    return distances
+
+
+def _reverse_adjacency(graph):
+    """
+    Returns the exits of a graph in compressed sparse row form (see
+    LocationGraph.adjacency) indexed by the location they lead to, rather
+    than the location they lead from.
+
+    :param LocationGraph graph: The graph
+    :return: ``offsets``, ``sources`` and ``directions``
+    :rtype: tuple of arrays
+    """
+    offsets, targets, directions = graph.adjacency()
+    location_count = graph.location_count
+    reverse_offsets = array('i', [0]) * (location_count + 1)
+    for target in targets:
+        reverse_offsets[target + 1] += 1
+    for location_id in range(location_count):
+        reverse_offsets[location_id + 1] += reverse_offsets[location_id]
+
+    sources = array('i', [0]) * len(targets)
+    reverse_directions = array('i', [0]) * len(targets)
+    next_index = reverse_offsets[:-1]
+    for source in range(location_count):
+        for index in range(offsets[source], offsets[source + 1]):
+            target = targets[index]
+            reverse_index = next_index[target]
+            sources[reverse_index] = source
+            reverse_directions[reverse_index] = directions[index]
+            next_index[target] = reverse_index + 1
+
+    return reverse_offsets, sources, reverse_directions
+
+
+def _expand_layer(adjacency, frontier, visited, other_visited):
+    """
+    Expands one layer of one end of a bidirectional breadth-first search.
+
+    :param tuple adjacency: The offsets, neighbouring location ids and
+        direction ids of the exits to follow
+    :param list frontier: The ids of the locations in the layer
+    :param dict visited: The distance and exit by which each location
+        visited by this end of the search was reached
+    :param dict other_visited: The same, for the other end of the search
+    :return: The ids of the locations in the next layer and the id of the
+        location at which the shortest route found through the layer meets
+        the other end of the search (or None)
+    :rtype: tuple
+    """
+    offsets, neighbours, directions = adjacency
+    next_layer = []
+    meeting = None
+    shortest = None
+    for location_id in frontier:
+        hops = visited[location_id][0] + 1
+        for index in range(offsets[location_id], offsets[location_id + 1]):
+            neighbour = neighbours[index]
+            if neighbour in visited:
+                continue
+            visited[neighbour] = (hops, (location_id, directions[index]))
+            next_layer.append(neighbour)
+            # Locations met through the layer may be different distances
+            # from the other end, so the whole layer is checked
+            if neighbour in other_visited:
+                length = hops + other_visited[neighbour][0]
+                if shortest is None or length < shortest:
+                    meeting = neighbour
+                    shortest = length
+    return next_layer, meeting
@@ -0,0 +1,91 @@
+"""
+Serving many players from one world.
+"""
+from vengeance.game import World
+
+
+class GameServer(object):
+    """
+    Runs a game for each connected player, all in one shared world.
+
+    Each game holds only its player's character position and handlers, so
+    connecting a player costs a few hundred bytes however large the world.
+
+    :param world: The world in which players' games take place
+    :type world: World or list of Location objects
+    """
+    def __init__(self, world):
+        if not isinstance(world, World):
+            world = World(world)
+        self._world = world
+        self._games = {}
+
+    @property
+    def world(self):
+        """
+        The world shared by the players' games.
+
+        :getter: Returns the world
+        :type: World
+        """
+        return self._world
+
+    @property
+    def session_count(self):
+        """
+        The number of connected players.
+
+        :getter: Returns the number of connected players
+        :type: int
+        """
+        return len(self._games)
+
+    def connect(self, session_id):
+        """
+        Starts a game for a player.
+
+        :param session_id: A hashable value identifying the player
+        :return: The player's game, with its character at the starting
+            location
+        :rtype: Game
+        :raises: ``ValueError`` if the player is already connected
+        """
+        if session_id in self._games:
+            message = u'Session "{0}" is already connected'
+            raise ValueError(message.format(session_id))
+
+        game = self._world.create_game()
+        self._games[session_id] = game
+        return game
+
+    def disconnect(self, session_id):
+        """
+        Ends a player's game.
+
+        :param session_id: The value identifying the player
+        :return: The player's game
+        :rtype: Game
+        :raises: ``KeyError`` if the player is not connected
+        """
+        return self._games.pop(session_id)
+
+    def game(self, session_id):
+        """
+        Finds a player's game.
+
+        :param session_id: The value identifying the player
+        :return: The player's game
+        :rtype: Game
+        :raises: ``KeyError`` if the player is not connected
+        """
+        return self._games[session_id]
+
+    def process_input(self, session_id, user_input):
+        """
+        Processes input from a player.
+
+        :param session_id: The value identifying the player
+        :param string user_input: The input command to process
+        :raises: ``KeyError`` if the player is not connected
+        """
+        self._games[session_id].process_input(user_input)
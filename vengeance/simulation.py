@@ -0,0 +1,216 @@
+"""
+Simulating many players at once.
+
+A simulation moves a number of independent characters (agents) through a
+game's world at the same time. At each step every agent tries a direction
+chosen at random, as a player typing directions at random would, and the
+location it reaches is looked up in the world's transition table (see
+LocationGraph.transition_table). When NumPy is installed all agents are
+moved together with array operations.
+"""
+import random
+
+from vengeance.graph import LocationGraph
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class SimulationResult(object):
+    """
+    The outcome of a simulation.
+
+    :param list locations: The locations of the world, indexed by id
+    :param visits: The number of times agents were in each location
+    :param steps_to_goal: The number of steps each agent took to reach a
+        goal, or -1 if it did not reach one
+    :param set dead_end_ids: The ids of the locations with no exits
+    """
+    def __init__(self, locations, visits, steps_to_goal, dead_end_ids):
+        self._locations = locations
+        self._visits = visits
+        self._steps_to_goal = steps_to_goal
+        self._dead_end_ids = dead_end_ids
+
+    @property
+    def visits(self):
+        """
+        The number of times agents were in each location, counting their
+        starting location and their location after each step.
+
+        :getter: Returns the visit counts, indexed by location id (in the
+            order of the game's locations)
+        :type: list of ints (or numpy.ndarray if NumPy is installed)
+        """
+        return self._visits
+
+    def location_visits(self):
+        """
+        :return: The number of times agents were in each location
+        :rtype: dict of Location to int
+        """
+        return dict((self._locations[location_id], int(count))
+                    for location_id, count in enumerate(self._visits))
+
+    @property
+    def steps_to_goal(self):
+        """
+        The number of steps each agent took to reach a goal location (0 if
+        it started at one), or -1 if it did not reach one.
+
+        :getter: Returns the steps to the goal, indexed by agent
+        :type: list of ints (or numpy.ndarray if NumPy is installed)
+        """
+        return self._steps_to_goal
+
+    @property
+    def dead_ends(self):
+        """
+        The locations with no exits which agents reached (and so could not
+        leave).
+
+        :getter: Returns the dead ends, in order of location id
+        :type: list of Location objects
+        """
+        return [self._locations[location_id]
+                for location_id in sorted(self._dead_end_ids)
+                if self._visits[location_id]]
+
+
+def simulate(game, agent_count, step_count, goal=None, seed=None):
+    # Disable 'Too many local variables'
+    # pylint: disable=R0914
+    """
+    Moves agents through a game's world at random.
+
+    All agents start at the location of the game's character. An agent
+    which reaches a goal location stops there, as a game would end once its
+    end of round handler found the goal reached.
+
+    :param Game game: The game whose world to simulate
+    :param int agent_count: The number of agents
+    :param int step_count: The number of steps each agent takes
+    :param function goal: A function which takes a single Location parameter
+        and returns True if the location is a goal (by default no location
+        is a goal). It is called once per location
+    :param seed: The seed for the random choice of directions
+    :return: The outcome of the simulation
+    :rtype: SimulationResult
+    """
+    graph = LocationGraph(game)
+    try:
+        locations = [graph.location(location_id)
+                     for location_id in range(graph.location_count)]
+        start_id = graph.location_id(game.character.current_location)
+        table = graph.transition_table()
+        direction_count = graph.direction_count
+        dead_end_ids = set(
+            location_id for location_id, degree in
+            enumerate(graph.out_degrees()) if degree == 0)
+    finally:
+        graph.close()
+
+    goals = [bool(goal and goal(location)) for location in locations]
+    if numpy is not None:
+        simulate_agents = _numpy_simulate
+    else:
+        simulate_agents = _python_simulate
+    visits, steps_to_goal = simulate_agents(
+        table, direction_count, goals, start_id, agent_count, step_count,
+        seed)
+    return SimulationResult(locations, visits, steps_to_goal, dead_end_ids)
+
+
+def _python_simulate(table, direction_count, goals, start_id, agent_count,
+                     step_count, seed):
+    # Disable 'Too many arguments'
+    # pylint: disable=R0913
+    """
+    Moves agents one at a time (see simulate).
+
+    :param array table: The transition table of the world
+    :param int direction_count: The number of directions in the world
+    :param list goals: Whether each location is a goal
+    :param int start_id: The id of the location in which agents start
+    :param int agent_count: The number of agents
+    :param int step_count: The number of steps each agent takes
+    :param seed: The seed for the random choice of directions
+    :return: The visit counts for each location and steps to the goal for
+        each agent
+    :rtype: tuple of lists
+    """
+    generator = random.Random(seed)
+    visits = [0] * len(goals)
+    steps_to_goal = [-1] * agent_count
+    for agent in range(agent_count):
+        location_id = start_id
+        visits[location_id] += 1
+        if goals[location_id]:
+            steps_to_goal[agent] = 0
+            continue
+
+        for step in range(1, step_count + 1):
+            if direction_count:
+                direction_id = generator.randrange(direction_count)
+                target = table[location_id * direction_count + direction_id]
+                if target >= 0:
+                    location_id = target
+            visits[location_id] += 1
+            if goals[location_id]:
+                steps_to_goal[agent] = step
+                break
+
+    return visits, steps_to_goal
+
+
+def _numpy_simulate(table, direction_count, goals, start_id, agent_count,
+                    step_count, seed):
+    # Disable 'Too many arguments'
+    # pylint: disable=R0913
+    """
+    Moves all agents at once using NumPy (see simulate).
+
+    :param numpy.ndarray table: The transition table of the world
+    :param int direction_count: The number of directions in the world
+    :param list goals: Whether each location is a goal
+    :param int start_id: The id of the location in which agents start
+    :param int agent_count: The number of agents
+    :param int step_count: The number of steps each agent takes
+    :param seed: The seed for the random choice of directions
+    :return: The visit counts for each location and steps to the goal for
+        each agent
+    :rtype: tuple of numpy.ndarray
+    """
+    generator = numpy.random.RandomState(seed)
+    location_count = len(goals)
+    goals = numpy.array(goals, dtype=bool)
+    visits = numpy.zeros(location_count, dtype=numpy.int64)
+    steps_to_goal = numpy.full(agent_count, -1, dtype=numpy.int64)
+
+    positions = numpy.full(agent_count, start_id, dtype=numpy.intp)
+    visits[start_id] += agent_count
+    if goals[start_id]:
+        steps_to_goal[:] = 0
+        return visits, steps_to_goal
+
+    # The agents which have not yet reached a goal
+    active = numpy.arange(agent_count)
+    for step in range(1, step_count + 1):
+        if not active.size:
+            break
+
+        if direction_count:
+            directions = generator.randint(0, direction_count, active.size)
+            targets = table[positions * direction_count + directions]
+            positions = numpy.where(targets >= 0, targets, positions)
+        visits += numpy.bincount(positions, minlength=location_count)
+
+        reached = goals[positions]
+        if reached.any():
+            steps_to_goal[active[reached]] = step
+            active = active[~reached]
+            positions = positions[~reached]
+
+    return visits, steps_to_goal
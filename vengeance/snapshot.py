@@ -0,0 +1,126 @@
+"""
+Saving and restoring games.
+
+A game is saved in two parts. Its world, which rarely changes and is shared
+by many games, is saved as a compiled world (see vengeance.compiled) and
+identified by a digest of its contents, so each distinct world need only be
+stored once. The session, the state of one game within its world, is saved
+as a few bytes: the index of the character's location and flags such as
+whether the game should end. Sessions can then be checkpointed cheaply and
+restored in another process which has loaded the same world.
+"""
+import hashlib
+import struct
+
+from vengeance.compiled import CompiledWorld
+from vengeance.compiled import compile_world
+from vengeance.game import Game
+
+_SESSION_VERSION = 1
+
+# Session format version, index of the character's location within the
+# world and flags
+_SESSION = struct.Struct('<BIB')
+
+# Flag set when the game should end
+_SHOULD_END = 1
+
+
+def snapshot_session(game):
+    # Disable 'Access to a protected member _location_index of a client
+    # class'
+    # pylint: disable=W0212
+    """
+    Saves the state of a game within its world.
+
+    Exits added to the game alone (see Game.add_exit) are not saved.
+
+    :param Game game: The game to save
+    :return: The saved session
+    :rtype: bytes
+    :raises: ``ValueError`` if the character is at a location outside the
+        game's world
+    """
+    location = game.character.current_location
+    location_index = game.world._location_index(location)
+    if location_index is None:
+        message = u'Character at location "{0}" outside the world'
+        raise ValueError(message.format(location.name))
+
+    flags = _SHOULD_END if game.should_end else 0
+    return _SESSION.pack(_SESSION_VERSION, location_index, flags)
+
+
+def restore_session(world, session):
+    # Disable 'Access to a protected member _locations of a client class'
+    # Disable 'Access to a protected member _current_location of a client
+    # class'
+    # pylint: disable=W0212
+    """
+    Creates a game in a world from a saved session.
+
+    :param World world: The world in which the session was saved, or one
+        loaded from it
+    :param bytes session: The session saved by snapshot_session
+    :return: The restored game
+    :rtype: Game
+    :raises: ``ValueError`` if the session is invalid or its location is not
+        in the world
+    """
+    if len(session) != _SESSION.size:
+        raise ValueError(u'Invalid session')
+    version, location_index, flags = _SESSION.unpack(session)
+    if version != _SESSION_VERSION:
+        raise ValueError(u'Unsupported session version {0}'.format(version))
+    if location_index >= len(world._locations):
+        raise ValueError(
+            u'Unknown location index {0}'.format(location_index))
+
+    game = Game(world)
+    game.character._current_location = world._locations[location_index]
+    game.should_end = bool(flags & _SHOULD_END)
+    return game
+
+
+def save_world(world):
+    """
+    Saves a world as a compiled world.
+
+    :param World world: The world to save
+    :return: The digest identifying the saved world and the saved world
+    :rtype: tuple of string and bytes
+    :raises: ``ValueError`` if an exit leads to a location outside the
+        world
+    """
+    blob = compile_world(world.create_game())
+    return world_digest(blob), blob
+
+
+def world_digest(blob):
+    """
+    :param bytes blob: A world saved by save_world
+    :return: The SHA-256 digest of the saved world, in hexadecimal
+    :rtype: string
+    """
+    return hashlib.sha256(blob).hexdigest()
+
+
+def load_world(blob, digest=None):
+    """
+    Loads a world saved by save_world.
+
+    The descriptions of the world's locations are read from ``blob`` as
+    they are needed.
+
+    :param bytes blob: The saved world
+    :param string digest: The digest identifying the saved world, which is
+        checked if given
+    :return: The world
+    :rtype: World
+    :raises: ``ValueError`` if the digest does not match the saved world
+    :raises: ``GameFormatException`` if blob is not a saved world
+    """
+    if digest is not None and world_digest(blob) != digest:
+        raise ValueError(u'World does not match digest')
+
+    return CompiledWorld(blob).create_game().world
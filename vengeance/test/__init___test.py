@@ -275,12 +275,51 @@ class InitTest(unittest.TestCase):
             ]
         }, 'Unknown exit direction "up" from room "A Room"')
 
+    def test_malformed_exit_reported_before_unknown_exit_room(self):
+        self.assert_run_game_raises({
+            'directions': [
+                {'name': 'north', 'opposite': 'south'}
+            ],
+            'rooms': [
+                {'name': 'A Room',
+                 'description': 'An empty room',
+                 'exits': [
+                     {'to': 'Nowhere', 'direction': 'north'}
+                 ]},
+                {'name': 'B Room',
+                 'description': 'Another empty room',
+                 'exits': [
+                     {'direction': 'south'}
+                 ]}
+            ]
+        }, 'Missing to room from exit with direction '
+           '"south" from room "B Room"')
+
+    def test_first_unknown_exit_reported(self):
+        self.assert_run_game_raises({
+            'directions': [
+                {'name': 'north', 'opposite': 'south'}
+            ],
+            'rooms': [
+                {'name': 'A Room',
+                 'description': 'An empty room',
+                 'exits': [
+                     {'to': 'B Room', 'direction': 'up'}
+                 ]},
+                {'name': 'B Room',
+                 'description': 'Another empty room',
+                 'exits': [
+                     {'to': 'Nowhere', 'direction': 'north'}
+                 ]}
+            ]
+        }, 'Unknown exit direction "up" from room "A Room"')
+
     def assert_run_game_raises(self, game_data, expected_message):
         try:
             vengeance.run_game(game_data)
             self.fail()
         except game.GameFormatException as e:
-            self.assertEqual(expected_message, e.message)
+            self.assertEqual(expected_message, str(e))
 
     def test_one_way_exit(self):
         game = vengeance.create_game({
@@ -303,6 +342,25 @@ class InitTest(unittest.TestCase):
         room_b = game.find_location('Room B')
         self.assertEqual(0, len(room_b.exits))
 
+    def test_game_data_not_modified(self):
+        room_a_exit = {'to': 'Room B', 'direction': 'down'}
+        room_b = {'name': 'Room B', 'description': 'B'}
+
+        vengeance.create_game({
+            'directions': [
+                {'name': 'up', 'opposite': 'down'},
+            ],
+            'rooms': [
+                {'name': 'Room A',
+                 'description': 'A',
+                 'exits': [room_a_exit]},
+                room_b
+            ]
+        })
+
+        self.assertEqual({'to': 'Room B', 'direction': 'down'}, room_a_exit)
+        self.assertEqual({'name': 'Room B', 'description': 'B'}, room_b)
+
     def test_two_way_exit(self):
         game = vengeance.create_game({
             'directions': [
@@ -389,5 +447,119 @@ class InitTest(unittest.TestCase):
         self.assertEqual('Room B', game.character.current_location.name)
 
 
+class CreateGameFromRecordsTest(unittest.TestCase):
+
+    def test_exit_to_room_defined_later(self):
+        game = vengeance.create_game_from_records([
+            {'type': 'direction', 'name': 'up', 'opposite': 'down'},
+            {'type': 'room', 'name': 'Room A', 'description': 'A',
+             'exits': [{'to': 'Room B', 'direction': 'down'}]},
+            {'type': 'room', 'name': 'Room B', 'description': 'B'}
+        ])
+
+        game.process_input('d')
+
+        room_b = game.character.current_location
+        self.assertEqual('Room B', room_b.name)
+        self.assertEqual('B', room_b.description)
+        self.assertEqual('Room A', room_b.exits[0].to_location.name)
+
+    def test_exit_record(self):
+        game = vengeance.create_game_from_records([
+            {'type': 'direction', 'name': 'in', 'opposite': 'out'},
+            {'type': 'exit', 'from': 'Room B', 'to': 'Room A',
+             'direction': 'out', 'one_way': True},
+            {'type': 'room', 'name': 'Room A', 'description': 'A'},
+            {'type': 'room', 'name': 'Room B', 'description': 'B'}
+        ])
+
+        self.assertEqual('Room A', game.character.current_location.name)
+        self.assertEqual(0, len(game.find_location('Room A').exits))
+        self.assertEqual(1, len(game.find_location('Room B').exits))
+
+    def test_json_lines(self):
+        game = vengeance.create_game_from_json_lines([
+            '{"type": "direction", "name": "west", "opposite": "east"}\n',
+            '\n',
+            '{"type": "room", "name": "Room A", "description": "A",'
+            ' "exits": [{"to": "Room B", "direction": "west"}]}\n',
+            '{"type": "room", "name": "Room B", "description": "B"}\n'
+        ])
+
+        game.process_input('west')
+
+        self.assertEqual('Room B', game.character.current_location.name)
+
+    def test_invalid_json_raises(self):
+        self.assert_create_game_from_json_lines_raises([
+            '{"type": "direction", "name": "west", "opposite": "east"}',
+            '{"type": "room"'
+        ], 'Invalid JSON on line 2')
+
+    def test_first_undefined_room_raises(self):
+        self.assert_create_game_from_records_raises([
+            {'type': 'direction', 'name': 'up', 'opposite': 'down'},
+            {'type': 'room', 'name': 'Room A', 'description': 'A',
+             'exits': [{'to': 'Room B', 'direction': 'down'},
+                       {'to': 'Room C', 'direction': 'up'}]},
+            {'type': 'room', 'name': 'Room C', 'description': 'C'}
+        ], 'Unknown exit room "Room B" from "Room A"')
+
+    def test_undefined_exit_from_room_raises(self):
+        self.assert_create_game_from_records_raises([
+            {'type': 'direction', 'name': 'up', 'opposite': 'down'},
+            {'type': 'room', 'name': 'Room A', 'description': 'A'},
+            {'type': 'exit', 'from': 'Room B', 'to': 'Room A',
+             'direction': 'down'}
+        ], 'Unknown exit from room "Room B"')
+
+    def test_redefinition_of_room_referred_to_by_exit_raises(self):
+        self.assert_create_game_from_records_raises([
+            {'type': 'direction', 'name': 'up', 'opposite': 'down'},
+            {'type': 'room', 'name': 'Room A', 'description': 'A',
+             'exits': [{'to': 'Room B', 'direction': 'down'}]},
+            {'type': 'room', 'name': 'Room B', 'description': 'B'},
+            {'type': 'room', 'name': 'Room B', 'description': 'B again'}
+        ], 'Redefinition of room "Room B"')
+
+    def test_direction_used_before_definition_raises(self):
+        self.assert_create_game_from_records_raises([
+            {'type': 'room', 'name': 'Room A', 'description': 'A',
+             'exits': [{'to': 'Room A', 'direction': 'up'}]},
+            {'type': 'direction', 'name': 'up', 'opposite': 'down'}
+        ], 'Unknown exit direction "up" from room "Room A"')
+
+    def test_unknown_record_type_raises(self):
+        self.assert_create_game_from_records_raises([
+            {'type': 'monster', 'name': 'Grue'}
+        ], 'Unknown record type "monster"')
+
+    def test_missing_record_type_raises(self):
+        self.assert_create_game_from_records_raises([
+            {'name': 'Room A', 'description': 'A'}
+        ], 'Missing type from record')
+
+    def test_no_rooms_raises(self):
+        self.assert_create_game_from_records_raises([
+            {'type': 'direction', 'name': 'up', 'opposite': 'down'}
+        ], 'Records must contain at least one room')
+
+    def assert_create_game_from_records_raises(self, records,
+                                               expected_message):
+        try:
+            vengeance.create_game_from_records(records)
+            self.fail()
+        except game.GameFormatException as e:
+            self.assertEqual(expected_message, str(e))
+
+    def assert_create_game_from_json_lines_raises(self, lines,
+                                                  expected_message):
+        try:
+            vengeance.create_game_from_json_lines(lines)
+            self.fail()
+        except game.GameFormatException as e:
+            self.assertEqual(expected_message, str(e))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,162 @@
+import sys
+import unittest
+
+from vengeance.directions import NORTH
+from vengeance.display import BufferedDisplay
+from vengeance.game import Game
+from vengeance.game import Location
+from vengeance.profiling import QUIT
+from vengeance.profiling import RoundProfiler
+
+try:
+    import asyncio
+except ImportError:
+    asyncio = None
+
+
+def _completed(loop, result=None):
+    future = loop.create_future()
+    future.set_result(result)
+    return future
+
+
+@unittest.skipIf(asyncio is None or sys.version_info < (3, 5),
+                 'asyncio games require Python 3.5 or later')
+class RunAsyncTest(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        start = Location('Start')
+        start.add_exit(NORTH, Location('End'))
+        self.game = Game([start])
+        self.displayed = []
+        self.inputs = []
+
+        def display_handler(text):
+            self.displayed.append(text)
+            return _completed(self.loop)
+
+        def input_handler():
+            return _completed(self.loop, self.inputs.pop(0))
+
+        self.game.async_display_handler = display_handler
+        self.game.async_input_handler = input_handler
+
+    def tearDown(self):
+        self.loop.close()
+
+    def run_game(self):
+        self.loop.run_until_complete(self.game.run_async())
+
+    def test_async_handlers_awaited(self):
+        self.inputs = ['n', 'quit', 'yes']
+
+        self.run_game()
+
+        self.assertEqual('End', self.game.character.current_location.name)
+        self.assertEqual('Are you sure you want to quit?', self.displayed[-1])
+        self.assertTrue(self.displayed[1].startswith('End'))
+
+    def test_quit_not_confirmed(self):
+        self.inputs = ['q', 'no', 'q', 'y']
+
+        self.run_game()
+
+        self.assertEqual(4, len(self.displayed))
+
+    def test_async_quit_handler(self):
+        self.inputs = ['q']
+
+        def quit_handler(display_handler, input_handler):
+            return _completed(self.loop, True)
+
+        self.game.async_quit_handler = quit_handler
+
+        self.run_game()
+
+        self.assertTrue(self.game.should_end)
+
+    def test_sync_quit_handler_used(self):
+        self.inputs = ['q']
+        self.game.quit_handler = lambda display, input_handler: True
+
+        self.run_game()
+
+        self.assertTrue(self.game.should_end)
+
+    def test_sync_handlers_used_by_default(self):
+        game = Game([Location('Only')])
+        displayed = []
+        game.display_handler = displayed.append
+        game.input_handler = lambda: 'q'
+        ended = []
+        game.end_of_round_handler = ended.append
+        game.quit_handler = lambda display, input_handler: True
+
+        self.loop.run_until_complete(game.run_async())
+
+        self.assertEqual('Only (exits: <none>)', displayed[0])
+        self.assertEqual([game], ended)
+
+    def test_buffered_display_flushed(self):
+        game = Game([Location('Only')])
+        written = []
+        game.display_handler = BufferedDisplay(written.append)
+        inputs = ['q', 'y']
+
+        def input_handler():
+            written.append('<input>')
+            return inputs.pop(0)
+
+        game.input_handler = input_handler
+
+        self.loop.run_until_complete(game.run_async())
+
+        self.assertEqual(['Only (exits: <none>)\n', '<input>',
+                          'Are you sure you want to quit?\n', '<input>'],
+                         written)
+
+    def test_rounds_profiled(self):
+        self.inputs = ['n', 'q', 'y']
+        ticks = iter(range(100))
+        profiler = RoundProfiler(clock=lambda: next(ticks))
+        self.game.profiler = profiler
+
+        self.run_game()
+
+        self.assertEqual(2, profiler.round_count)
+        self.assertEqual(1, profiler.histograms[QUIT].count)
+        self.assertEqual(1, profiler.histograms[QUIT].total)
+
+    def test_async_end_of_round_handler(self):
+        self.inputs = ['n']
+
+        def end_of_round_handler(game):
+            game.should_end = True
+            return _completed(self.loop)
+
+        self.game.async_end_of_round_handler = end_of_round_handler
+
+        self.run_game()
+
+        self.assertEqual('End', self.game.character.current_location.name)
+
+    def test_process_input_quit_handled_synchronously_after_run(self):
+        self.inputs = ['n']
+        self.game.async_end_of_round_handler = (
+            lambda game: _completed(self.loop))
+        self.game.should_end = True
+        self.run_game()
+        quit_called = []
+
+        def quit_handler(display_handler, input_handler):
+            quit_called.append(True)
+            return False
+
+        self.game.quit_handler = quit_handler
+        self.game.process_input('q')
+
+        self.assertEqual([True], quit_called)
+
+
+if __name__ == '__main__':
+    unittest.main()
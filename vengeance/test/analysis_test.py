@@ -0,0 +1,106 @@
+import unittest
+
+from vengeance.analysis import analyse_world
+from vengeance.analysis import strongly_connected_components
+from vengeance.directions import EAST
+from vengeance.directions import NORTH
+from vengeance.game import Direction
+from vengeance.game import Game
+from vengeance.game import Location
+from vengeance.graph import LocationGraph
+
+
+class AnalyseWorldTest(unittest.TestCase):
+    def setUp(self):
+        # The hall and kitchen lead to each other, a one-way exit leads
+        # north from the kitchen into the garden and shed (which lead to
+        # each other) and a one-way exit leads down from the hall into the
+        # cellar. The attic cannot be reached.
+        self.hall = Location('Hall')
+        self.kitchen = Location('Kitchen')
+        self.garden = Location('Garden')
+        self.shed = Location('Shed')
+        self.cellar = Location('Cellar')
+        self.attic = Location('Attic')
+        self.hall.add_exit(EAST, self.kitchen)
+        self.kitchen.add_one_way_exit(NORTH, self.garden)
+        self.garden.add_exit(EAST, self.shed)
+        self.hall.add_one_way_exit(Direction('down'), self.cellar)
+        self.attic.add_one_way_exit(Direction('down'), self.hall)
+        self.game = Game([self.hall, self.kitchen, self.garden, self.shed,
+                          self.cellar, self.attic])
+
+    def test_unreachable_locations(self):
+        analysis = analyse_world(self.game)
+
+        self.assertEqual([self.attic], analysis.unreachable_locations)
+
+    def test_sink_components(self):
+        analysis = analyse_world(self.game)
+
+        self.assertEqual([[self.garden, self.shed], [self.cellar]],
+                         analysis.sink_components)
+
+    def test_dead_ends(self):
+        analysis = analyse_world(self.game)
+
+        self.assertEqual([self.cellar], analysis.dead_ends)
+
+    def test_not_sound(self):
+        self.assertFalse(analyse_world(self.game).is_sound)
+
+    def test_sound(self):
+        self.shed.add_one_way_exit(NORTH, self.hall)
+        self.cellar.add_one_way_exit(Direction('up'), self.hall)
+        self.hall.add_one_way_exit(Direction('up'), self.attic)
+
+        analysis = analyse_world(self.game)
+
+        self.assertTrue(analysis.is_sound)
+        self.assertEqual([], analysis.sink_components)
+
+    def test_location_outside_game(self):
+        well = Location('Well')
+        self.shed.add_one_way_exit(Direction('down'), well)
+
+        analysis = analyse_world(self.game)
+
+        self.assertEqual([self.cellar, well], analysis.dead_ends)
+        self.assertEqual([[self.cellar], [well]], analysis.sink_components)
+
+
+class StronglyConnectedComponentsTest(unittest.TestCase):
+    def test_components(self):
+        rooms = [Location(str(i)) for i in range(5)]
+        rooms[0].add_exit(EAST, rooms[1])
+        rooms[1].add_one_way_exit(NORTH, rooms[2])
+        rooms[2].add_one_way_exit(NORTH, rooms[3])
+        rooms[3].add_one_way_exit(EAST, rooms[2])
+        graph = LocationGraph(Game(rooms))
+
+        components, count = strongly_connected_components(graph)
+        graph.close()
+
+        self.assertEqual(3, count)
+        self.assertEqual(components[0], components[1])
+        self.assertEqual(components[2], components[3])
+        # Components are numbered in reverse topological order
+        self.assertTrue(components[2] < components[0])
+        self.assertNotEqual(components[4], components[0])
+
+    def test_long_chain(self):
+        rooms = [Location(str(i)) for i in range(5000)]
+        for i in range(4999):
+            rooms[i].add_one_way_exit(EAST, rooms[i + 1])
+        rooms[4999].add_one_way_exit(NORTH, rooms[0])
+        graph = LocationGraph(Game(rooms))
+
+        components, count = strongly_connected_components(graph)
+        graph.close()
+
+        self.assertEqual(1, count)
+        self.assertEqual([0] * 5000, list(components))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,185 @@
+import os
+import shutil
+import struct
+import tempfile
+import unittest
+
+import vengeance
+from vengeance.compiled import CompiledWorld
+from vengeance.compiled import _pack_buckets
+from vengeance.compiled import compile_world
+from vengeance.compiled import load_compiled_world
+from vengeance.compiled import save_compiled_world
+from vengeance.directions import UP
+from vengeance.game import Direction
+from vengeance.game import Game
+from vengeance.game import GameFormatException
+from vengeance.game import Location
+
+
+class CompiledWorldTest(unittest.TestCase):
+    def setUp(self):
+        self.world = CompiledWorld(compile_world(self.game_data))
+
+    def test_counts(self):
+        self.assertEqual(4, self.world.direction_count)
+        self.assertEqual(3, self.world.location_count)
+        self.assertEqual(3, self.world.exit_count)
+
+    def test_find_location(self):
+        location_id = self.world.find_location('The Crypt')
+
+        self.assertEqual('The Crypt', self.world.location_name(location_id))
+        self.assertEqual('Dusty tomb',
+                         self.world.location_description(location_id))
+
+    def test_find_unknown_location_returns_none(self):
+        self.assertEqual(None, self.world.find_location('The Vestry'))
+
+    def test_location_exits(self):
+        crypt_id = self.world.find_location('The Crypt')
+
+        location_exits = self.world.location_exits(crypt_id)
+
+        exits = [(self.world.direction_name(direction_id),
+                  self.world.location_name(to_id))
+                 for direction_id, to_id in location_exits]
+
+        self.assertEqual([('up', 'A Church'), ('in', 'A Coffin')], exits)
+
+    def test_direction_opposite(self):
+        church_id = self.world.find_location('A Church')
+        direction_id = self.world.location_exits(church_id)[0][0]
+
+        opposite_id = self.world.direction_opposite(direction_id)
+
+        self.assertEqual('up', self.world.direction_name(opposite_id))
+
+    def test_create_game(self):
+        game = self.world.create_game()
+
+        game.process_input('d')
+        game.process_input('i')
+
+        coffin = game.character.current_location
+        self.assertEqual('A Coffin', coffin.name)
+        self.assertEqual('Pitch dark', coffin.description)
+        self.assertEqual(0, len(coffin.exits))
+
+    def test_created_location_is_rendered_afresh(self):
+        game = self.world.create_game()
+        location = game.character.current_location
+
+        game._render_location(location)
+
+        self.assertEqual(None, location._rendered)
+        self.assertEqual(game._render_location(location),
+                         game.location_renderer(location))
+
+    def test_compile_game(self):
+        church = Location('A Church', 'Tiny place of worship')
+        tower = Location('The Tower')
+        church.add_exit(UP, tower)
+        church.add_one_way_exit(Direction('around'), church)
+        world = CompiledWorld(compile_world(Game([church, tower])))
+
+        game = world.create_game()
+
+        exits = game.find_location('A Church').exits
+        self.assertEqual(['up', 'around'], [e.direction.name for e in exits])
+        self.assertEqual('down', exits[0].direction.opposite.name)
+        self.assertEqual(None, exits[1].direction.opposite)
+        self.assertEqual('', game.find_location('The Tower').description)
+
+    def test_not_compiled_world_raises(self):
+        try:
+            CompiledWorld(b'Not a compiled world at all, no sirree' * 2)
+            self.fail()
+        except GameFormatException as e:
+            self.assertEqual('Not a compiled world', str(e))
+
+    def test_truncated_compiled_world_raises(self):
+        compiled = compile_world(self.game_data)
+        strings_offset = struct.unpack_from('<Q', compiled, 56)[0]
+
+        try:
+            # Truncated within the name hash table
+            CompiledWorld(compiled[:strings_offset - 4])
+            self.fail()
+        except GameFormatException as e:
+            self.assertEqual('Compiled world is truncated', str(e))
+
+    def test_corrupt_table_offset_raises(self):
+        compiled = bytearray(compile_world(self.game_data))
+        # Move the location table before the direction table
+        struct.pack_into('<Q', compiled, 32, 0)
+
+        try:
+            CompiledWorld(bytes(compiled))
+            self.fail()
+        except GameFormatException as e:
+            self.assertEqual('Compiled world is corrupt', str(e))
+
+    def test_buckets_packed_little_endian(self):
+        self.assertEqual(b'\x01\x00\x00\x00\x00\x01\x00\x00',
+                         _pack_buckets([1, 256]))
+
+    def test_invalid_game_data_raises(self):
+        try:
+            compile_world({'directions': []})
+            self.fail()
+        except GameFormatException as e:
+            self.assertEqual('Missing rooms list', str(e))
+
+    @property
+    def game_data(self):
+        return {
+            'directions': [
+                {'name': 'up', 'opposite': 'down'},
+                {'name': 'in', 'opposite': 'out'}
+            ],
+            'rooms': [
+                {'name': 'A Church',
+                 'description': 'Tiny place of worship',
+                 'exits': [
+                     {'to': 'The Crypt', 'direction': 'down'}
+                 ]},
+                {'name': 'The Crypt',
+                 'description': 'Dusty tomb',
+                 'exits': [
+                     {'to': 'A Coffin', 'direction': 'in', 'one_way': True}
+                 ]},
+                {'name': 'A Coffin',
+                 'description': 'Pitch dark'}
+            ]
+        }
+
+
+class CompiledWorldFileTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'world.bin')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_save_and_load(self):
+        game = vengeance.create_game({
+            'directions': [],
+            'rooms': [
+                {'name': 'Only Room', 'description': 'Nowhere to go'}
+            ]
+        })
+        save_compiled_world(game, self.path)
+
+        world = load_compiled_world(self.path)
+        try:
+            loaded_game = world.create_game()
+            location = loaded_game.character.current_location
+            self.assertEqual('Nowhere to go', location.description)
+        finally:
+            world.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
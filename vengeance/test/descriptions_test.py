@@ -0,0 +1,157 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import vengeance
+from vengeance.descriptions import DescriptionStore
+from vengeance.descriptions import create_game_from_json_lines
+from vengeance.descriptions import create_game_from_records
+from vengeance.descriptions import load_descriptions
+from vengeance.descriptions import save_descriptions
+from vengeance.game import GameFormatException
+
+
+class DescriptionStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'descriptions.bin')
+        self.game = vengeance.create_game(self.game_data)
+        save_descriptions(self.game, self.path)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_load(self):
+        with load_descriptions(self.path) as store:
+            self.assertEqual(3, len(store))
+            self.assertEqual('Tiny place of worship', store.description(0))
+            self.assertEqual('', store.description(2))
+
+    def test_unknown_index_raises(self):
+        with load_descriptions(self.path) as store:
+            self.assertRaises(IndexError, store.description, 3)
+            self.assertRaises(IndexError, store.description, -1)
+
+    def test_least_recently_read_description_is_evicted(self):
+        with load_descriptions(self.path, cache_size=2) as store:
+            store.description(0)
+            store.description(1)
+            store.description(0)
+            store.description(2)
+
+            self.assertEqual(2, store.cached_count)
+            self.assertEqual([0, 2], list(store._cache))
+
+    def test_zero_cache_size_keeps_nothing(self):
+        with load_descriptions(self.path, cache_size=0) as store:
+            self.assertEqual('Dusty tomb', store.description(1))
+            self.assertEqual(0, store.cached_count)
+
+    def test_negative_cache_size_raises(self):
+        with open(self.path, 'rb') as descriptions_file:
+            data = descriptions_file.read()
+
+        self.assertRaises(ValueError, DescriptionStore, data, -1)
+
+    def test_not_descriptions_raises(self):
+        try:
+            DescriptionStore(b'Not descriptions at all')
+            self.fail()
+        except GameFormatException as e:
+            self.assertEqual('Not a descriptions file', str(e))
+
+    def test_truncated_descriptions_raise(self):
+        with open(self.path, 'rb') as descriptions_file:
+            data = descriptions_file.read()
+
+        try:
+            DescriptionStore(data[:20])
+            self.fail()
+        except GameFormatException as e:
+            self.assertEqual('Descriptions are truncated', str(e))
+
+    def test_create_game_from_records(self):
+        with load_descriptions(self.path) as store:
+            game = create_game_from_records(self.records, store)
+
+            self.assert_stored_game(game)
+
+    def test_create_game_from_json_lines(self):
+        lines = [json.dumps(record) for record in self.records]
+        with load_descriptions(self.path) as store:
+            game = create_game_from_json_lines(lines, store)
+
+            self.assert_stored_game(game)
+
+    def test_stored_location_is_rendered_afresh(self):
+        with load_descriptions(self.path) as store:
+            game = create_game_from_records(self.records, store)
+            location = game.character.current_location
+
+            game._render_location(location)
+
+            self.assertEqual(None, location._rendered)
+            self.assertEqual(game._render_location(location),
+                             game.location_renderer(location))
+
+    def test_mismatched_store_raises(self):
+        records = [{'type': 'room', 'name': 'Only Room',
+                    'description': 'Nowhere'}]
+        with load_descriptions(self.path) as store:
+            self.assertRaises(ValueError, create_game_from_records,
+                              records, store)
+
+    def assert_stored_game(self, game):
+        game.process_input('d')
+
+        crypt = game.character.current_location
+        self.assertEqual('The Crypt', crypt.name)
+        self.assertEqual('Dusty tomb', crypt.description)
+        self.assertEqual(['up', 'in'],
+                         [e.direction.name for e in crypt.exits])
+        self.assertIs(game.find_location('A Coffin'),
+                      crypt.exits[1].to_location)
+
+    @property
+    def records(self):
+        return [
+            {'type': 'direction', 'name': 'up', 'opposite': 'down'},
+            {'type': 'direction', 'name': 'in', 'opposite': 'out'},
+            {'type': 'room', 'name': 'A Church',
+             'description': 'Tiny place of worship',
+             'exits': [{'to': 'The Crypt', 'direction': 'down'}]},
+            {'type': 'room', 'name': 'The Crypt',
+             'description': 'Dusty tomb',
+             'exits': [{'to': 'A Coffin', 'direction': 'in',
+                        'one_way': True}]},
+            {'type': 'room', 'name': 'A Coffin', 'description': ''}
+        ]
+
+    @property
+    def game_data(self):
+        return {
+            'directions': [
+                {'name': 'up', 'opposite': 'down'},
+                {'name': 'in', 'opposite': 'out'}
+            ],
+            'rooms': [
+                {'name': 'A Church',
+                 'description': 'Tiny place of worship',
+                 'exits': [
+                     {'to': 'The Crypt', 'direction': 'down'}
+                 ]},
+                {'name': 'The Crypt',
+                 'description': 'Dusty tomb',
+                 'exits': [
+                     {'to': 'A Coffin', 'direction': 'in', 'one_way': True}
+                 ]},
+                {'name': 'A Coffin',
+                 'description': ''}
+            ]
+        }
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import unittest
+
+from vengeance.display import BufferedDisplay
+from vengeance.game import Game
+from vengeance.game import Location
+
+
+class BufferedDisplayTest(unittest.TestCase):
+    def setUp(self):
+        self.writes = []
+        self.now = [0.0]
+
+    def display(self, **kwargs):
+        return BufferedDisplay(self.writes.append, clock=lambda: self.now[0],
+                               **kwargs)
+
+    def test_text_buffered_until_flushed(self):
+        display = self.display()
+
+        display('Hall')
+        display('You see a lamp.')
+
+        self.assertEqual([], self.writes)
+        self.assertEqual(21, display.buffered_size)
+        display.flush()
+        self.assertEqual(['Hall\nYou see a lamp.\n'], self.writes)
+        self.assertEqual(0, display.buffered_size)
+
+    def test_flush_with_nothing_buffered(self):
+        display = self.display()
+
+        display.flush()
+
+        self.assertEqual([], self.writes)
+
+    def test_flushed_when_max_size_reached(self):
+        display = self.display(max_size=10)
+
+        display('Hall')
+        display('Kitchen')
+        display('Garden')
+
+        self.assertEqual(['Hall\nKitchen\n'], self.writes)
+
+    def test_flushed_when_max_delay_passed(self):
+        display = self.display(max_delay=1.0)
+
+        display('Hall')
+        self.now[0] = 0.5
+        display('Kitchen')
+        self.assertEqual([], self.writes)
+        self.now[0] = 1.0
+        display('Garden')
+
+        self.assertEqual(['Hall\nKitchen\nGarden\n'], self.writes)
+
+    def test_delay_measured_from_first_buffered_text(self):
+        display = self.display(max_delay=1.0)
+        display('Hall')
+        self.now[0] = 5.0
+        display.flush()
+
+        display('Kitchen')
+
+        self.assertEqual(['Hall\n'], self.writes)
+
+
+class GameBufferedDisplayTest(unittest.TestCase):
+    def setUp(self):
+        self.writes = []
+        self.inputs = ['look', 'q']
+        self.game = Game([Location('Hall')])
+        self.game.display_handler = BufferedDisplay(self.writes.append)
+
+        def input_handler():
+            # Record how many writes preceded each request for input
+            self.writes.append('<input>')
+            return self.inputs.pop(0)
+
+        self.game.input_handler = input_handler
+
+    def test_flushed_once_per_round(self):
+        def end_of_round_handler(game):
+            game.display_handler('Time passes.')
+
+        self.game.end_of_round_handler = end_of_round_handler
+        self.game.quit_handler = lambda display, input_handler: True
+
+        self.game.run()
+
+        self.assertEqual(['Hall (exits: <none>)\n', '<input>',
+                          'Time passes.\nHall (exits: <none>)\n', '<input>',
+                          'Time passes.\n'], self.writes)
+
+    def test_flushed_before_quit_input(self):
+        self.inputs = ['q', 'y']
+
+        self.game.run()
+
+        self.assertEqual(['Hall (exits: <none>)\n', '<input>',
+                          'Are you sure you want to quit?\n', '<input>'],
+                         self.writes)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,9 +1,12 @@
 import unittest
 
+from vengeance.directions import NORTH
+from vengeance.game import _Command
 from vengeance.game import Direction
 from vengeance.game import Game
 from vengeance.game import Location
 from vengeance.game import PlayerCharacter
+from vengeance.game import World
 
 
 class DirectionTest(unittest.TestCase):
@@ -23,6 +26,14 @@ class DirectionTest(unittest.TestCase):
 
         self.assertEquals(east.name, west.opposite.name)
 
+    def test_directions_share_names(self):
+        # Built at run time, so that the two names are separate strings
+        east = Direction(''.join(['ea', 'st']))
+        another_east = Direction(''.join(['eas', 't']))
+
+        self.assertTrue(east.name is another_east.name)
+        self.assertTrue(east._command_names is another_east._command_names)
+
 
 class GameTest(unittest.TestCase):
     def test_find_location(self):
@@ -34,6 +45,11 @@ class GameTest(unittest.TestCase):
 
         self.assertEqual(description, location.description)
 
+    def test_find_unknown_location_returns_none(self):
+        game = Game([Location('one'), Location('two')])
+
+        self.assertEqual(None, game.find_location('three'))
+
     def test_first_location_is_character_start(self):
         first_location_name = 'one'
         first_location = Location(first_location_name)
@@ -84,6 +100,189 @@ class GameTest(unittest.TestCase):
 
         game.process_input('q')
 
+    def test_process_input_single_letter_direction(self):
+        location_one = Location('L1')
+        location_two = Location('L2')
+        location_one.add_one_way_exit(Direction('u'), location_two)
+        game = Game([location_one, location_two])
+
+        game.process_input('u')
+
+        self.assertEqual('L2', game.character.current_location.name)
+
+    def test_process_input_with_many_exits(self):
+        hub = Location('Hub')
+        locations = [hub]
+        for i in range(500):
+            location = Location('L' + str(i))
+            hub.add_one_way_exit(Direction('passage' + str(i)), location)
+            locations.append(location)
+        game = Game(locations)
+
+        game.process_input('passage321')
+
+        self.assertEqual('L321', game.character.current_location.name)
+
+    def test_process_input_synonym_added_after_command(self):
+        quit_called = {'yes': False}
+        game = self._arbitrary_game(quit_called)
+        game._find_command('quit').add_synonym('exit')
+
+        game.process_input('exit')
+
+        self.assertTrue(quit_called['yes'])
+
+    def test_process_input_ignores_case_and_whitespace(self):
+        game = self._corridor_game('north')
+
+        game.process_input(' North ')
+
+        self.assertEqual('L2', game.character.current_location.name)
+
+    def test_process_input_unique_prefix(self):
+        game = self._corridor_game('north')
+
+        game.process_input('NOR')
+
+        self.assertEqual('L2', game.character.current_location.name)
+
+    def test_process_input_ambiguous_prefix_ignored(self):
+        game = self._corridor_game('north')
+        game.character.current_location.add_one_way_exit(
+            Direction('nowhere'), game.character.current_location)
+
+        game.process_input('no')
+
+        self.assertEqual('L1', game.character.current_location.name)
+
+    def test_process_input_exact_match_preferred_to_prefix(self):
+        game = self._corridor_game('inside')
+        game.character.current_location.add_one_way_exit(
+            Direction('in'), game.character.current_location)
+
+        game.process_input('in')
+
+        self.assertEqual('L1', game.character.current_location.name)
+
+    def test_process_input_folded_match_preferred_to_prefix(self):
+        game = self._corridor_game('inside')
+        game.character.current_location.add_one_way_exit(
+            Direction('in'), game.character.current_location)
+
+        game.process_input('In')
+
+        self.assertEqual('L1', game.character.current_location.name)
+
+    def test_process_input_exact_ambiguous_match_not_completed(self):
+        game = self._corridor_game('quick')
+
+        game.process_input('q')
+
+        self.assertEqual('L1', game.character.current_location.name)
+
+    def test_process_input_command_by_prefix(self):
+        quit_called = {'yes': False}
+        game = self._arbitrary_game(quit_called)
+
+        game.process_input('Qu')
+
+        self.assertTrue(quit_called['yes'])
+
+    def test_process_input_prefix_of_many_exits_ignored(self):
+        game = self._corridor_game('pit')
+        location = game.character.current_location
+        for name in ['pass', 'passage', 'path']:
+            location.add_one_way_exit(Direction(name), location)
+
+        game.process_input('pa')
+        game.process_input('pi')
+
+        self.assertEqual('L2', game.character.current_location.name)
+
+    def test_process_input_prefix_after_exit_added(self):
+        game = self._corridor_game('North')
+        location = game.character.current_location
+        location.add_one_way_exit(Direction('down'), location)
+        game.process_input('DO')
+
+        location.add_one_way_exit(Direction('door'), location)
+        game.process_input('do')
+        game.process_input('no')
+
+        self.assertEqual('L2', game.character.current_location.name)
+
+    def test_process_input_folded_synonym_added_after_lookup(self):
+        quit_called = {'yes': False}
+        game = self._arbitrary_game(quit_called)
+        game.process_input('QUIT')
+        quit_called['yes'] = False
+
+        game._find_command('quit').add_synonym('Leave')
+        game.process_input('leave')
+
+        self.assertTrue(quit_called['yes'])
+
+    def test_process_input_blank_ignored(self):
+        game = self._corridor_game('north')
+
+        game.process_input('   ')
+
+        self.assertEqual('L1', game.character.current_location.name)
+
+    def test_replay_normalises_input(self):
+        game = self._corridor_game('north')
+
+        location, _ = game.replay(['Nor'])
+
+        self.assertEqual('L2', location.name)
+
+    def test_replay(self):
+        location_one = Location('L1')
+        location_two = Location('L2')
+        west = Direction('west')
+        west.opposite = Direction('east')
+        location_one.add_exit(west, location_two)
+        game = Game([location_one, location_two])
+
+        location, trajectory = game.replay(['w', 'unknown', 'e', 'west'],
+                                           trajectory=True)
+
+        self.assertEqual(location_two, location)
+        self.assertEqual(location_two, game.character.current_location)
+        self.assertEqual([location_two, location_two, location_one,
+                          location_two], trajectory)
+
+    def test_replay_without_trajectory(self):
+        game = self._arbitrary_game()
+
+        location, trajectory = game.replay(['x', 'y'])
+
+        self.assertEqual(game.character.current_location, location)
+        self.assertEqual(None, trajectory)
+
+    def test_replay_runs_commands(self):
+        quit_called = {'yes': False}
+        game = self._arbitrary_game(quit_called)
+
+        game.replay(['q'])
+
+        self.assertTrue(quit_called['yes'])
+        self.assertTrue(game.should_end)
+
+    def test_replay_ignores_ambiguous_input(self):
+        location_one = Location('L1')
+        location_two = Location('L2')
+        location_one.add_one_way_exit(Direction('quick'), location_two)
+        game = Game([location_one, location_two])
+        quit_called = {}
+        game.quit_handler = lambda display, input_handler: \
+            quit_called.setdefault('yes', True)
+
+        location, _ = game.replay(['q'])
+
+        self.assertEqual(location_one, location)
+        self.assertEqual({}, quit_called)
+
     def test_no_locations_raises(self):
         try:
             Game([])
@@ -171,6 +370,44 @@ class GameTest(unittest.TestCase):
     def render(self, game, location):
         return game.location_renderer(location)
 
+    def test_rendered_location_reused(self):
+        location = Location(self.arbitrary_name)
+        game = Game([location])
+        renders = []
+
+        def location_renderer(location):
+            renders.append(location)
+            return location.name
+
+        game.location_renderer = location_renderer
+
+        game._render_location(location)
+        self.assertEqual(self.arbitrary_name,
+                         game._render_location(location))
+        self.assertEqual(1, len(renders))
+
+    def test_rendered_location_updated_when_exit_added(self):
+        location = Location(self.arbitrary_name)
+        game = Game([location])
+        game._render_location(location)
+
+        location.add_one_way_exit(Direction('north'), location)
+
+        self.assertEqual(self.arbitrary_name + " (exits: north)",
+                         game._render_location(location))
+
+    def test_rendered_location_updated_when_renderer_changed(self):
+        location = Location(self.arbitrary_name)
+        game = Game([location])
+        game._render_location(location)
+
+        def location_renderer(location):
+            return 'Renamed'
+
+        game.location_renderer = location_renderer
+
+        self.assertEqual('Renamed', game._render_location(location))
+
     def test_end_of_round_handler_called_at_end_of_game_loop_iteration(self):
         game = self._no_interaction_single_loop_game()
 
@@ -231,6 +468,12 @@ class GameTest(unittest.TestCase):
 
         return game
 
+    def _corridor_game(self, direction_name):
+        location_one = Location('L1')
+        location_two = Location('L2')
+        location_one.add_one_way_exit(Direction(direction_name), location_two)
+        return Game([location_one, location_two])
+
     def _arbitrary_game(self, quit_called={}):
         game = Game([Location('L1')])
 
@@ -242,6 +485,273 @@ class GameTest(unittest.TestCase):
         return game
 
 
+class ExitTest(unittest.TestCase):
+    def test_exits_indexed_as_commands(self):
+        direction = Direction('north')
+        location_one = Location('L1')
+        location_two = Location('L2')
+
+        location_one.add_one_way_exit(direction, location_two)
+        location_two.add_one_way_exit(direction, location_one)
+
+        self.assertTrue(location_one._commands.find('n')[0] is
+                        location_one.exits[0])
+        self.assertTrue(location_two._commands.find('north')[0] is
+                        location_two.exits[0])
+
+    def test_name_and_initial_share_commands(self):
+        location_one = Location('L1')
+        location_two = Location('L2')
+
+        location_one.add_one_way_exit(Direction('north'), location_two)
+
+        self.assertTrue(location_one._commands.find('n') is
+                        location_one._commands.find('north'))
+
+    def test_initial_shared_by_directions(self):
+        location_one = Location('L1')
+        location_two = Location('L2')
+        location_one.add_one_way_exit(Direction('north'), location_two)
+
+        location_one.add_one_way_exit(Direction('nowhere'), location_one)
+
+        self.assertEqual(location_one.exits,
+                         location_one._commands.find('n'))
+        self.assertEqual(location_one.exits[:1],
+                         location_one._commands.find('north'))
+        self.assertEqual(location_one.exits[1:],
+                         location_one._commands.find('nowhere'))
+
+    def test_run_moves_character(self):
+        location_one = Location('L1')
+        location_two = Location('L2')
+        location_one.add_one_way_exit(Direction('down'), location_two)
+        game = Game([location_one, location_two])
+
+        location_one.exits[0].run(game)
+
+        self.assertEqual('L2', game.character.current_location.name)
+
+
+class WorldTest(unittest.TestCase):
+    def test_games_share_world(self):
+        world = World([Location('L1')])
+
+        self.assertTrue(world.create_game().world is Game(world).world)
+
+    def test_games_move_independently(self):
+        location_one = Location('L1')
+        location_two = Location('L2')
+        location_one.add_one_way_exit(Direction('west'), location_two)
+        world = World([location_one, location_two])
+        game_one = world.create_game()
+        game_two = world.create_game()
+
+        game_one.process_input('w')
+
+        self.assertEqual('L2', game_one.character.current_location.name)
+        self.assertEqual('L1', game_two.character.current_location.name)
+
+    def test_handlers_not_shared(self):
+        world = World([Location('L1')])
+        game_one = world.create_game()
+        game_two = world.create_game()
+
+        def display_handler(text):
+            pass
+
+        game_one.display_handler = display_handler
+
+        self.assertEqual(display_handler, game_one.display_handler)
+        self.assertNotEqual(display_handler, game_two.display_handler)
+
+    def test_find_location(self):
+        location = Location('L1')
+        world = World([location])
+
+        self.assertEqual(location, world.find_location('L1'))
+
+    def test_duplicate_locations_raises(self):
+        try:
+            World([Location('L1'), Location('L1')])
+            self.fail()
+        except ValueError:
+            # Success
+            pass
+
+
+class FrozenWorldTest(unittest.TestCase):
+    def setUp(self):
+        self.location_one = Location('L1')
+        self.location_two = Location('L2')
+        self.location_one.add_exit(NORTH, self.location_two)
+        self.world = World([self.location_one, self.location_two])
+        self.game = self.world.create_game()
+
+    def test_freeze(self):
+        self.world.freeze()
+
+        self.assertTrue(self.world.frozen)
+        self.assertEqual({'north': self.location_two, 'n': self.location_two},
+                         self.location_one._transitions[1])
+
+    def test_movement(self):
+        self.world.freeze()
+
+        self.game.process_input('n')
+
+        self.assertEqual('L2', self.game.character.current_location.name)
+
+    def test_ambiguous_input_ignored(self):
+        self.location_one.add_one_way_exit(Direction('nowhere'),
+                                           self.location_one)
+        self.world.freeze()
+
+        self.game.process_input('n')
+
+        self.assertEqual('L1', self.game.character.current_location.name)
+        self.assertFalse('n' in self.location_one._transitions[1])
+
+    def test_input_matching_world_command_not_compiled(self):
+        quit_called = []
+        self.game.quit_handler = lambda display, read_input: (
+            quit_called.append(True))
+        self.location_one.add_one_way_exit(Direction('quiet'),
+                                           self.location_two)
+        self.world.freeze()
+
+        self.game.process_input('q')
+
+        self.assertEqual('L1', self.game.character.current_location.name)
+        self.assertEqual([], quit_called)
+
+    def test_exit_added_after_freeze(self):
+        self.world.freeze()
+
+        self.location_one.add_one_way_exit(Direction('up'), self.location_two)
+        self.game.process_input('u')
+
+        self.assertEqual('L2', self.game.character.current_location.name)
+        self.assertEqual(2, self.location_one._transitions[0])
+
+    def test_replay_uses_tables(self):
+        self.world.freeze()
+        self.location_one.add_one_way_exit(Direction('up'), self.location_two)
+
+        location, trajectory = self.game.replay(['u', 's', 'x'],
+                                                trajectory=True)
+
+        self.assertEqual([self.location_two, self.location_one,
+                          self.location_one], trajectory)
+        self.assertEqual(2, self.location_one._transitions[0])
+
+    def test_command_added_after_freeze(self):
+        self.world.freeze()
+
+        self.game._add_command(_Command('north', lambda game, _: None, None))
+        self.game.process_input('north')
+
+        self.assertEqual('L1', self.game.character.current_location.name)
+
+    def test_synonym_added_after_freeze(self):
+        self.game.quit_handler = lambda display, read_input: None
+        self.world.freeze()
+
+        self.world._commands.find('quit')[0].add_synonym('n')
+        self.game.process_input('n')
+
+        self.assertEqual('L1', self.game.character.current_location.name)
+        self.assertFalse('n' in self.location_one._transitions[1])
+        self.assertEqual(self.location_one, self.game.replay(['n'])[0])
+
+    def test_game_exits_bypass_tables(self):
+        self.world.freeze()
+
+        self.game.add_one_way_exit(self.location_one, Direction('nook'),
+                                   self.location_one)
+        self.game.process_input('n')
+
+        self.assertEqual('L1', self.game.character.current_location.name)
+
+    def test_thaw(self):
+        self.world.freeze()
+
+        self.world.thaw()
+
+        self.assertFalse(self.world.frozen)
+        self.assertEqual(None, self.location_one._transitions)
+
+
+class GameExitTest(unittest.TestCase):
+    def setUp(self):
+        self.hall = Location('Hall')
+        self.study = Location('Study')
+        self.world = World([self.hall, self.study])
+        self.game = self.world.create_game()
+        self.other_game = self.world.create_game()
+        self.secret = Direction('secret')
+        self.secret.opposite = Direction('back')
+
+    def test_exit_seen_by_game_only(self):
+        self.game.add_exit(self.hall, self.secret, self.study)
+
+        self.game.process_input('secret')
+        self.other_game.process_input('secret')
+
+        self.assertEqual(self.study, self.game.character.current_location)
+        self.assertEqual(self.hall,
+                         self.other_game.character.current_location)
+        self.assertEqual((), self.hall.exits)
+
+    def test_exit_is_two_way(self):
+        self.game.add_exit(self.hall, self.secret, self.study)
+
+        self.game.process_input('secret')
+        self.game.process_input('back')
+
+        self.assertEqual(self.hall, self.game.character.current_location)
+
+    def test_exit_without_opposite_raises(self):
+        self.assertRaises(ValueError, self.game.add_exit, self.hall,
+                          Direction('up'), self.study)
+
+    def test_exits(self):
+        north = Direction('north')
+        self.hall.add_one_way_exit(north, self.study)
+        self.game.add_one_way_exit(self.hall, self.secret, self.study)
+
+        self.assertEqual(['north', 'secret'],
+                         [e.direction.name
+                          for e in self.game.exits(self.hall)])
+        self.assertEqual(['north'],
+                         [e.direction.name
+                          for e in self.other_game.exits(self.hall)])
+
+    def test_rendered_with_game_exits(self):
+        self.game.add_one_way_exit(self.hall, self.secret, self.study)
+
+        self.assertEqual('Hall (exits: secret)',
+                         self.game._render_location(self.hall))
+        self.assertEqual('Hall (exits: <none>)',
+                         self.other_game._render_location(self.hall))
+
+    def test_ambiguous_with_world_exit(self):
+        self.hall.add_one_way_exit(self.secret, self.hall)
+        self.game.add_one_way_exit(self.hall, self.secret, self.study)
+
+        self.game.process_input('secret')
+
+        self.assertEqual(self.hall, self.game.character.current_location)
+        self.assertEqual(2, len(self.game._find_commands('secret')))
+
+    def test_replay_uses_game_exits(self):
+        self.game.add_exit(self.hall, self.secret, self.study)
+
+        location, _ = self.game.replay(['secret', 'back', 's'])
+
+        self.assertEqual(self.study, location)
+
+
 class LocationTest(unittest.TestCase):
     def test_name(self):
         name = 'a name'
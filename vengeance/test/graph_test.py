@@ -0,0 +1,146 @@
+import unittest
+
+from vengeance import graph
+from vengeance.directions import EAST
+from vengeance.directions import NORTH
+from vengeance.game import Direction
+from vengeance.game import Game
+from vengeance.game import Location
+from vengeance.graph import LocationGraph
+
+
+class LocationGraphTest(unittest.TestCase):
+    def setUp(self):
+        self.hall = Location('Hall')
+        self.kitchen = Location('Kitchen')
+        self.garden = Location('Garden')
+        self.cellar = Location('Cellar')
+        self.hall.add_exit(EAST, self.kitchen)
+        self.kitchen.add_one_way_exit(NORTH, self.garden)
+        self.game = Game([self.hall, self.kitchen, self.garden, self.cellar])
+        self.graph = LocationGraph(self.game)
+
+    def tearDown(self):
+        self.graph.close()
+
+    def test_location_ids_follow_game_order(self):
+        self.assertEqual(0, self.graph.location_id(self.hall))
+        self.assertEqual(self.cellar, self.graph.location(3))
+
+    def test_counts(self):
+        self.assertEqual(4, self.graph.location_count)
+        self.assertEqual(3, self.graph.exit_count)
+        self.assertEqual(4, self.graph.direction_count)
+
+    def test_exits(self):
+        kitchen_id = self.graph.location_id(self.kitchen)
+
+        exits = [(self.graph.direction(d).name, self.graph.location(t).name)
+                 for d, t in self.graph.exits(kitchen_id)]
+
+        self.assertEqual([('west', 'Hall'), ('north', 'Garden')], exits)
+
+    def test_adjacency(self):
+        offsets, targets, directions = self.graph.adjacency()
+
+        self.assertEqual([0, 1, 3, 3, 3], list(offsets))
+        self.assertEqual([1, 0, 2], list(targets))
+        self.assertEqual(3, len(directions))
+
+    def test_exit_added_after_creation(self):
+        version = self.graph.version
+
+        self.cellar.add_one_way_exit(Direction('up'), self.hall)
+
+        up_id = self.graph.direction_id(self.cellar.exits[0].direction)
+        self.assertNotEqual(version, self.graph.version)
+        self.assertEqual([(up_id, 0)], self.graph.exits(3))
+
+    def test_location_outside_game_added(self):
+        attic = Location('Attic')
+        self.garden.add_one_way_exit(Direction('up'), attic)
+
+        self.assertEqual(4, self.graph.location_id(attic))
+        self.assertEqual(5, self.graph.location_count)
+
+    def test_close_stops_updates(self):
+        self.graph.close()
+
+        self.cellar.add_one_way_exit(Direction('up'), self.hall)
+
+        self.assertEqual(3, self.graph.exit_count)
+
+    def test_out_degrees(self):
+        self.assertEqual([1, 2, 0, 0], list(self.graph.out_degrees()))
+
+    def test_transition_table(self):
+        table = self.graph.transition_table()
+
+        directions = self.graph.direction_count
+        east = self.graph.direction_id(EAST)
+        north = self.graph.direction_id(NORTH)
+        self.assertEqual(1, table[0 * directions + east])
+        self.assertEqual(2, table[1 * directions + north])
+        self.assertEqual(-1, table[2 * directions + north])
+
+    def test_transition_table_ambiguous_direction(self):
+        self.garden.add_one_way_exit(NORTH, self.hall)
+        self.garden.add_one_way_exit(NORTH, self.cellar)
+
+        table = self.graph.transition_table()
+
+        north = self.graph.direction_id(NORTH)
+        self.assertEqual(-1, table[2 * self.graph.direction_count + north])
+
+    def test_reachable(self):
+        self.assertEqual([True, True, True, False],
+                         [bool(r) for r in self.graph.reachable()])
+
+    def test_reachable_from_location(self):
+        garden_id = self.graph.location_id(self.garden)
+
+        self.assertEqual([False, False, True, False],
+                         [bool(r) for r in self.graph.reachable(garden_id)])
+
+    def test_reachable_many_locations(self):
+        locations = [Location(str(i)) for i in range(100)]
+        for i in range(0, 98, 3):
+            locations[i].add_one_way_exit(EAST, locations[i + 1])
+            locations[i].add_one_way_exit(NORTH, locations[i + 2])
+            locations[i + 2].add_one_way_exit(EAST, locations[i + 3])
+        a_graph = LocationGraph(Game(locations))
+
+        reachable = a_graph.reachable()
+
+        expected = [i % 3 != 1 or i < 98 for i in range(100)]
+        self.assertEqual(expected, [bool(r) for r in reachable])
+        a_graph.close()
+
+    def test_reachable_wide_layers(self):
+        hub = Location('Hub')
+        rooms = [Location('Room ' + str(i)) for i in range(600)]
+        for i in range(300):
+            hub.add_one_way_exit(Direction(str(i)), rooms[i])
+            rooms[i].add_one_way_exit(EAST, rooms[300 + i // 2])
+        a_graph = LocationGraph(Game([hub] + rooms))
+
+        reachable = a_graph.reachable()
+
+        expected = [True] * 451 + [False] * 150
+        self.assertEqual(expected, [bool(r) for r in reachable])
+        a_graph.close()
+
+
+class PurePythonLocationGraphTest(LocationGraphTest):
+    def setUp(self):
+        self.numpy = graph.numpy
+        graph.numpy = None
+        LocationGraphTest.setUp(self)
+
+    def tearDown(self):
+        LocationGraphTest.tearDown(self)
+        graph.numpy = self.numpy
+
+
+if __name__ == '__main__':
+    unittest.main()
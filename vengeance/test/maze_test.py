@@ -0,0 +1,160 @@
+import unittest
+
+from vengeance.directions import EAST
+from vengeance.directions import NORTH
+from vengeance.directions import SOUTH
+from vengeance.directions import WEST
+from vengeance.game import Direction
+from vengeance.game import Location
+from vengeance.graph import LocationGraph
+from vengeance.maze import Maze
+from vengeance.maze import generate_maze
+
+ALGORITHMS = ['backtracker', 'prim', 'binary_tree']
+
+
+def passages(maze):
+    return [(x, y, direction.name)
+            for y in range(maze.height) for x in range(maze.width)
+            for direction in [NORTH, EAST, SOUTH, WEST]
+            if maze.has_passage(x, y, direction)]
+
+
+class GenerateMazeTest(unittest.TestCase):
+    def test_mazes_are_perfect(self):
+        for algorithm in ALGORITHMS:
+            maze = generate_maze(12, 7, algorithm, seed=3)
+            game = maze.create_game()
+            graph = LocationGraph(game)
+
+            # A connected maze with one passage fewer than it has cells has
+            # exactly one route between any two cells
+            self.assertEqual((12 * 7 - 1) * 2, graph.exit_count, algorithm)
+            self.assertTrue(all(graph.reachable()), algorithm)
+            graph.close()
+
+    def test_passages_are_two_way(self):
+        maze = generate_maze(6, 6, seed=1)
+
+        for x, y, name in passages(maze):
+            if name == 'north':
+                self.assertTrue(maze.has_passage(x, y + 1, SOUTH))
+            elif name == 'east':
+                self.assertTrue(maze.has_passage(x + 1, y, WEST))
+
+    def test_no_passages_out_of_maze(self):
+        for algorithm in ALGORITHMS:
+            maze = generate_maze(5, 4, algorithm, seed=2)
+
+            for x, y, name in passages(maze):
+                self.assertFalse(name == 'north' and y == 3)
+                self.assertFalse(name == 'east' and x == 4)
+                self.assertFalse(name == 'south' and y == 0)
+                self.assertFalse(name == 'west' and x == 0)
+
+    def test_same_seed_same_maze(self):
+        for algorithm in ALGORITHMS:
+            self.assertEqual(
+                passages(generate_maze(8, 8, algorithm, seed=5)),
+                passages(generate_maze(8, 8, algorithm, seed=5)))
+
+    def test_single_cell(self):
+        maze = generate_maze(1, 1)
+
+        self.assertEqual([], passages(maze))
+
+    def test_no_cells(self):
+        self.assertRaises(ValueError, generate_maze, 0, 5)
+
+    def test_unknown_algorithm(self):
+        try:
+            generate_maze(3, 3, 'eller')
+            self.fail()
+        except ValueError as e:
+            self.assertEqual('Unknown maze algorithm "eller"', str(e))
+
+    def test_large_maze(self):
+        maze = generate_maze(300, 300, seed=1)
+
+        self.assertEqual(300 * 300 - 1, len(passages(maze)) // 2)
+
+
+class MazeCreateGameTest(unittest.TestCase):
+    def test_create_game(self):
+        maze = generate_maze(3, 2, 'binary_tree', seed=4)
+
+        game = maze.create_game()
+
+        start = game.character.current_location
+        self.assertEqual('Location 0, 0', start.name)
+        exits = sorted(e.direction.name for e in start.exits)
+        expected = sorted(name for x, y, name in passages(maze)
+                          if (x, y) == (0, 0))
+        self.assertEqual(expected, exits)
+        self.assertNotEqual(None, game.find_location(maze.location_name(2, 1)))
+
+
+class MazeRenderTest(unittest.TestCase):
+    def setUp(self):
+        # A U-shaped passage: up the west column, east along the top row
+        # and down the east column
+        self.maze = Maze.from_locations(self.create_locations(), 3)
+
+    def create_locations(self):
+        locations = [Location(str(i)) for i in range(6)]
+        locations[0].add_exit(NORTH, locations[3])
+        locations[3].add_exit(EAST, locations[4])
+        locations[4].add_exit(EAST, locations[5])
+        locations[5].add_exit(SOUTH, locations[2])
+        return locations
+
+    def test_from_locations(self):
+        self.assertEqual(2, self.maze.height)
+        self.assertTrue(self.maze.has_passage(0, 0, NORTH))
+        self.assertTrue(self.maze.has_passage(2, 0, NORTH))
+        self.assertFalse(self.maze.has_passage(0, 0, EAST))
+
+    def test_from_locations_ignores_other_exits(self):
+        locations = self.create_locations()
+        locations[0].add_one_way_exit(EAST, locations[2])
+        locations[1].add_one_way_exit(Direction('up'), locations[4])
+
+        maze = Maze.from_locations(locations, 3)
+
+        self.assertFalse(maze.has_passage(0, 0, EAST))
+        self.assertFalse(maze.has_passage(1, 0, NORTH))
+
+    def test_from_locations_not_rectangle(self):
+        self.assertRaises(ValueError, Maze.from_locations,
+                          self.create_locations(), 4)
+
+    def test_render(self):
+        self.assertEqual(' _ _ _ \n'
+                         '|  _  |\n'
+                         '|_|_|_|\n', self.maze.render())
+
+    def test_render_to_stream(self):
+        lines = []
+
+        class Stream(object):
+            def write(self, text):
+                lines.append(text)
+
+        self.assertEqual(None, self.maze.render(Stream()))
+        self.assertEqual([' _ _ _ \n', '|  _  |\n', '|_|_|_|\n'], lines)
+
+    def test_render_generated_maze(self):
+        maze = generate_maze(40, 30, seed=2)
+
+        rows = maze.render().split('\n')
+
+        self.assertEqual(32, len(rows))
+        self.assertTrue(all(len(row) == 81 for row in rows[1:-1]))
+        # The outer walls are always drawn
+        self.assertTrue(all(row[0] == '|' and row[-1] == '|'
+                            for row in rows[1:-1]))
+        self.assertEqual('_' * 40, rows[-2][1::2])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,162 @@
+import threading
+import unittest
+
+import vengeance
+from vengeance import parallel
+from vengeance.game import GameFormatException
+from vengeance.parallel import create_game_in_parallel
+
+
+def _room(name, exits=None):
+    room = {'name': name, 'description': 'Room ' + name}
+    if exits is not None:
+        room['exits'] = exits
+    return room
+
+
+def _game_data(rooms):
+    return {
+        'directions': [{'name': 'north', 'opposite': 'south'}],
+        'rooms': rooms
+    }
+
+
+class CreateGameInParallelTest(unittest.TestCase):
+    def assert_same_error(self, game_data):
+        try:
+            vengeance.create_game(game_data)
+            self.fail('create_game did not raise')
+        except GameFormatException as e:
+            expected = str(e)
+
+        for max_workers in [1, 2, 3]:
+            try:
+                create_game_in_parallel(game_data, max_workers)
+                self.fail('create_game_in_parallel did not raise')
+            except GameFormatException as e:
+                self.assertEqual(expected, str(e))
+
+    def test_game_created(self):
+        rooms = [_room(str(i), [{'to': str(i + 1), 'direction': 'north'}])
+                 for i in range(9)] + [_room('9')]
+
+        game = create_game_in_parallel(_game_data(rooms), 3)
+
+        self.assertEqual('0', game.character.current_location.name)
+        game.process_input('n')
+        game.process_input('n')
+        game.process_input('s')
+        self.assertEqual('1', game.character.current_location.name)
+        self.assertEqual('Room 9', game.find_location('9').description)
+
+    def test_game_created_while_other_thread_runs(self):
+        rooms = [_room(str(i), [{'to': str(i + 1), 'direction': 'north'}])
+                 for i in range(5)] + [_room('5')]
+        stop = threading.Event()
+        thread = threading.Thread(target=stop.wait)
+        thread.start()
+        try:
+            context = parallel._worker_context()
+            game = create_game_in_parallel(_game_data(rooms), 2)
+        finally:
+            stop.set()
+            thread.join()
+
+        if context is not None:
+            self.assertNotEqual('fork', context.get_start_method())
+        game.process_input('n')
+        self.assertEqual('1', game.character.current_location.name)
+
+    def test_rooms_not_kept_after_checking(self):
+        create_game_in_parallel(_game_data([_room('A'), _room('B')]), 2)
+
+        self.assertEqual(None, parallel._shared_location_data)
+
+    def test_one_way_exit(self):
+        rooms = [_room('A', [{'to': 'B', 'direction': 'north',
+                              'one_way': True}]),
+                 _room('B')]
+
+        game = create_game_in_parallel(_game_data(rooms), 2)
+
+        self.assertEqual((), game.find_location('B').exits)
+
+    def test_first_room_error_in_input_order(self):
+        rooms = [_room(str(i)) for i in range(8)]
+        rooms[6] = {'name': '6'}
+        rooms[2] = {'description': 'No name'}
+
+        self.assert_same_error(_game_data(rooms))
+
+    def test_description_error_before_name_error(self):
+        rooms = [_room(str(i)) for i in range(8)]
+        rooms[1]['description'] = 5
+        rooms[5] = {'description': 'No name'}
+
+        self.assert_same_error(_game_data(rooms))
+
+    def test_redefinition_across_shards(self):
+        rooms = [_room(str(i)) for i in range(8)]
+        rooms[6] = _room('1')
+        rooms[7] = {'description': 'No name'}
+
+        self.assert_same_error(_game_data(rooms))
+
+    def test_redefinition_before_description_error(self):
+        rooms = [_room(str(i)) for i in range(8)]
+        rooms[5] = {'name': '0', 'description': 5}
+
+        self.assert_same_error(_game_data(rooms))
+
+    def test_name_error_before_redefinition(self):
+        rooms = [_room(str(i)) for i in range(8)]
+        rooms[3] = {'name': 3, 'description': 'Not a string name'}
+        rooms[6] = _room('0')
+
+        self.assert_same_error(_game_data(rooms))
+
+    def test_room_error_before_exit_error(self):
+        rooms = [_room(str(i)) for i in range(8)]
+        rooms[0]['exits'] = [{'to': '1'}]
+        rooms[7] = {'name': '7'}
+
+        self.assert_same_error(_game_data(rooms))
+
+    def test_first_exit_error_in_input_order(self):
+        rooms = [_room(str(i)) for i in range(8)]
+        rooms[6]['exits'] = [{'direction': 'north'}]
+        rooms[3]['exits'] = [{'to': '4', 'direction': 'north'},
+                             {'to': '4', 'direction': 7}]
+
+        self.assert_same_error(_game_data(rooms))
+
+    def test_exit_error_before_unknown_room(self):
+        rooms = [_room(str(i)) for i in range(8)]
+        rooms[1]['exits'] = [{'to': 'Nowhere', 'direction': 'north'}]
+        rooms[6]['exits'] = [{'to': '1', 'direction': 'north',
+                              'one_way': 'yes'}]
+
+        self.assert_same_error(_game_data(rooms))
+
+    def test_first_unknown_exit(self):
+        rooms = [_room(str(i)) for i in range(8)]
+        rooms[2]['exits'] = [{'to': '3', 'direction': 'up'}]
+        rooms[5]['exits'] = [{'to': 'Nowhere', 'direction': 'north'}]
+
+        self.assert_same_error(_game_data(rooms))
+
+    def test_direction_error(self):
+        game_data = _game_data([_room('A')])
+        game_data['directions'] = [{'name': 'north'}]
+
+        self.assert_same_error(game_data)
+
+    def test_no_rooms(self):
+        self.assert_same_error(_game_data([]))
+
+    def test_not_a_dictionary(self):
+        self.assert_same_error([])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+import unittest
+
+from vengeance.game import Game
+from vengeance.game import Location
+from vengeance.profiling import DISPLAY
+from vengeance.profiling import END_OF_ROUND
+from vengeance.profiling import Histogram
+from vengeance.profiling import INPUT
+from vengeance.profiling import PROCESS_INPUT
+from vengeance.profiling import QUIT
+from vengeance.profiling import RENDER
+from vengeance.profiling import ROUND
+from vengeance.profiling import RoundProfiler
+
+
+class HistogramTest(unittest.TestCase):
+    def test_empty(self):
+        histogram = Histogram()
+
+        self.assertEqual(0, histogram.count)
+        self.assertEqual(0, histogram.mean)
+        self.assertEqual(0, histogram.quantile(0.5))
+        self.assertEqual([], histogram.buckets)
+
+    def test_record(self):
+        histogram = Histogram()
+
+        histogram.record(1e-6)
+        histogram.record(3e-6)
+        histogram.record(3e-6)
+        histogram.record(5e-6)
+
+        self.assertEqual(4, histogram.count)
+        self.assertAlmostEqual(12e-6, histogram.total)
+        self.assertAlmostEqual(3e-6, histogram.mean)
+        self.assertEqual(5e-6, histogram.max)
+        self.assertEqual([(1e-6, 1), (4e-6, 2), (8e-6, 1)],
+                         histogram.buckets)
+
+    def test_quantile(self):
+        histogram = Histogram()
+        for _ in range(98):
+            histogram.record(1e-6)
+        histogram.record(1e-3)
+        histogram.record(5e-3)
+
+        self.assertEqual(1e-6, histogram.quantile(0.5))
+        self.assertEqual(1e-6, histogram.quantile(0.98))
+        self.assertAlmostEqual(1.024e-3, histogram.quantile(0.99))
+        self.assertEqual(5e-3, histogram.quantile(1))
+
+    def test_long_duration_in_last_bucket(self):
+        histogram = Histogram()
+
+        histogram.record(1e6)
+
+        self.assertEqual([(None, 1)], histogram.buckets)
+        self.assertEqual(1e6, histogram.quantile(0.5))
+
+    def test_invalid_quantile_raises(self):
+        self.assertRaises(ValueError, Histogram().quantile, 1.5)
+
+
+class RoundProfilerTest(unittest.TestCase):
+    def setUp(self):
+        self.now = 0
+        self.rounds = []
+        self.profiler = RoundProfiler(sink=self.rounds.append,
+                                      clock=lambda: self.now)
+
+    def test_round(self):
+        self.profiler.start_round()
+        self.now = 1
+        self.profiler.end_phase(RENDER)
+        self.now = 4
+        self.profiler.end_phase(INPUT)
+        self.profiler.end_round()
+
+        self.assertEqual([{RENDER: 1, INPUT: 3, ROUND: 4}], self.rounds)
+        self.assertEqual(1, self.profiler.round_count)
+        self.assertEqual(3, self.profiler.histograms[INPUT].total)
+        self.assertEqual(0, self.profiler.histograms[DISPLAY].count)
+
+
+class GameProfilingTest(unittest.TestCase):
+    def setUp(self):
+        self.game = Game([Location('L1')])
+        self.inputs = ['look', 'quit']
+        self.game.display_handler = lambda text: None
+        self.game.input_handler = lambda: self.inputs.pop(0)
+        self.game.quit_handler = lambda display, read_input: True
+        ticks = iter(range(100))
+        self.rounds = []
+        self.profiler = RoundProfiler(sink=self.rounds.append,
+                                      clock=lambda: next(ticks))
+
+    def test_run_profiles_each_phase(self):
+        self.game.profiler = self.profiler
+
+        self.game.run()
+
+        self.assertEqual(2, self.profiler.round_count)
+        expected = {RENDER: 1, DISPLAY: 1, INPUT: 1, PROCESS_INPUT: 1,
+                    END_OF_ROUND: 1, ROUND: 5}
+        self.assertEqual([expected, expected], self.rounds)
+        self.assertEqual(0, self.profiler.histograms[QUIT].count)
+
+    def test_not_profiled_by_default(self):
+        self.game.run()
+
+        self.assertEqual(None, self.game.profiler)
+        self.assertEqual(0, self.profiler.round_count)
+
+
+if __name__ == '__main__':
+    unittest.main()
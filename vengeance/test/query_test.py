@@ -0,0 +1,157 @@
+import unittest
+
+from vengeance import graph
+from vengeance.directions import EAST
+from vengeance.directions import NORTH
+from vengeance.game import Direction
+from vengeance.game import Game
+from vengeance.game import Location
+from vengeance.query import LocationQuery
+
+
+class LocationQueryTest(unittest.TestCase):
+    def setUp(self):
+        # Hall - Kitchen - Pantry in a row from west to east, a one-way exit
+        # north from the kitchen to the garden and a cellar with no exits
+        self.hall = Location('Hall')
+        self.kitchen = Location('Kitchen')
+        self.pantry = Location('Pantry')
+        self.garden = Location('Garden')
+        self.cellar = Location('Cellar')
+        self.hall.add_exit(EAST, self.kitchen)
+        self.kitchen.add_exit(EAST, self.pantry)
+        self.kitchen.add_one_way_exit(NORTH, self.garden)
+        self.game = Game([self.hall, self.kitchen, self.pantry, self.garden,
+                          self.cellar])
+        self.query = LocationQuery(self.game)
+
+    def tearDown(self):
+        self.query.close()
+
+    def test_is_reachable(self):
+        self.assertTrue(self.query.is_reachable(self.hall, self.garden))
+        self.assertFalse(self.query.is_reachable(self.garden, self.hall))
+        self.assertFalse(self.query.is_reachable(self.hall, self.cellar))
+
+    def test_reachable_locations(self):
+        self.assertEqual([self.hall, self.kitchen, self.pantry, self.garden],
+                         self.query.reachable_locations(self.pantry))
+
+    def test_distance(self):
+        self.assertEqual(0, self.query.distance(self.hall, self.hall))
+        self.assertEqual(2, self.query.distance(self.hall, self.garden))
+        self.assertEqual(None, self.query.distance(self.hall, self.cellar))
+
+    def test_distances(self):
+        self.assertEqual({self.garden: 0},
+                         self.query.distances(self.garden))
+        self.assertEqual({self.hall: 1, self.kitchen: 0, self.pantry: 1,
+                          self.garden: 1},
+                         self.query.distances(self.kitchen))
+
+    def test_all_pairs_distances(self):
+        distances = self.query.all_pairs_distances()
+
+        self.assertEqual(5, len(distances))
+        self.assertEqual([0, 1, 2, 2, -1], list(distances[0]))
+        self.assertEqual([-1, -1, -1, -1, 0], list(distances[4]))
+
+    def test_shortest_route(self):
+        route = self.query.shortest_route(self.pantry, self.garden)
+
+        self.assertEqual(['west', 'north'], [d.name for d in route])
+
+    def test_shortest_route_to_same_location(self):
+        self.assertEqual([], self.query.shortest_route(self.hall, self.hall))
+
+    def test_shortest_route_unreachable(self):
+        self.assertEqual(None,
+                         self.query.shortest_route(self.garden, self.hall))
+
+    def test_shortest_route_takes_shortcut(self):
+        shortcut = Direction('shortcut')
+        self.hall.add_one_way_exit(shortcut, self.garden)
+
+        route = self.query.shortest_route(self.hall, self.garden)
+
+        self.assertEqual([shortcut], route)
+
+    def test_shortest_route_long_corridor(self):
+        rooms = [Location(str(i)) for i in range(50)]
+        for i in range(49):
+            rooms[i].add_exit(EAST, rooms[i + 1])
+        rooms[10].add_one_way_exit(NORTH, rooms[40])
+        query = LocationQuery(Game(rooms))
+
+        route = query.shortest_route(rooms[0], rooms[49])
+
+        self.assertEqual(['east'] * 10 + ['north'] + ['east'] * 9,
+                         [d.name for d in route])
+        query.close()
+
+    def test_cache_invalidated_by_new_exit(self):
+        self.assertFalse(self.query.is_reachable(self.hall, self.cellar))
+        self.assertEqual(None, self.query.shortest_route(self.hall,
+                                                         self.cellar))
+
+        self.garden.add_one_way_exit(Direction('down'), self.cellar)
+
+        self.assertTrue(self.query.is_reachable(self.hall, self.cellar))
+        self.assertEqual(3, self.query.distance(self.hall, self.cellar))
+        self.assertEqual(['east', 'north', 'down'],
+                         [d.name for d in self.query.shortest_route(
+                             self.hall, self.cellar)])
+
+    def test_unknown_location(self):
+        self.assertRaises(KeyError, self.query.distance, self.hall,
+                          Location('Attic'))
+
+    def test_least_recently_used_result_is_evicted(self):
+        query = LocationQuery(self.game, cache_size=2)
+        query.distances(self.hall)
+        query.distances(self.kitchen)
+        query.distances(self.hall)
+        query.distances(self.pantry)
+
+        self.assertEqual(2, query.cached_count)
+        self.assertEqual([('distances', 0), ('distances', 2)],
+                         list(query._cache))
+        query.close()
+
+    def test_zero_cache_size_keeps_nothing(self):
+        query = LocationQuery(self.game, cache_size=0)
+
+        self.assertEqual(2, query.distance(self.hall, self.garden))
+        self.assertEqual(0, query.cached_count)
+        query.close()
+
+    def test_negative_cache_size_raises(self):
+        self.assertRaises(ValueError, LocationQuery, self.game, -1)
+
+    def test_all_pairs_distances_are_not_cached(self):
+        self.query.all_pairs_distances()
+
+        self.assertEqual(0, self.query.cached_count)
+
+    def test_context_manager_releases_listeners(self):
+        with LocationQuery(self.game) as query:
+            self.assertEqual(2, len(self.hall._listeners))
+            query.distances(self.hall)
+
+        self.assertEqual(1, len(self.hall._listeners))
+        self.assertEqual(0, query.cached_count)
+
+
+class PurePythonLocationQueryTest(LocationQueryTest):
+    def setUp(self):
+        self.numpy = graph.numpy
+        graph.numpy = None
+        LocationQueryTest.setUp(self)
+
+    def tearDown(self):
+        LocationQueryTest.tearDown(self)
+        graph.numpy = self.numpy
+
+
+if __name__ == '__main__':
+    unittest.main()
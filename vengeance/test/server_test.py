@@ -0,0 +1,59 @@
+import unittest
+
+from vengeance.directions import NORTH
+from vengeance.game import Location
+from vengeance.game import World
+from vengeance.server import GameServer
+
+
+class GameServerTest(unittest.TestCase):
+    def setUp(self):
+        self.start = Location('Start')
+        self.end = Location('End')
+        self.start.add_exit(NORTH, self.end)
+        self.server = GameServer(World([self.start, self.end]))
+
+    def test_connected_games_share_world(self):
+        game_one = self.server.connect('one')
+        game_two = self.server.connect('two')
+
+        self.assertTrue(game_one.world is game_two.world)
+        self.assertEqual(2, self.server.session_count)
+
+    def test_players_move_independently(self):
+        self.server.connect('one')
+        self.server.connect('two')
+
+        self.server.process_input('one', 'n')
+
+        self.assertEqual(self.end,
+                         self.server.game('one').character.current_location)
+        self.assertEqual(self.start,
+                         self.server.game('two').character.current_location)
+
+    def test_connect_twice_raises(self):
+        self.server.connect('one')
+
+        try:
+            self.server.connect('one')
+            self.fail()
+        except ValueError:
+            # Success
+            pass
+
+    def test_disconnect(self):
+        game = self.server.connect('one')
+
+        self.assertTrue(game is self.server.disconnect('one'))
+        self.assertEqual(0, self.server.session_count)
+
+    def test_create_from_locations(self):
+        server = GameServer([Location('Only')])
+
+        game = server.connect('one')
+
+        self.assertEqual('Only', game.character.current_location.name)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import unittest
+
+from vengeance import graph
+from vengeance import simulation
+from vengeance.directions import EAST
+from vengeance.directions import NORTH
+from vengeance.game import Game
+from vengeance.game import Location
+from vengeance.simulation import simulate
+
+
+class SimulateTest(unittest.TestCase):
+    def setUp(self):
+        # A corridor from the hall east to the kitchen and a one-way exit
+        # north from the kitchen into the cellar
+        self.hall = Location('Hall')
+        self.kitchen = Location('Kitchen')
+        self.cellar = Location('Cellar')
+        self.hall.add_exit(EAST, self.kitchen)
+        self.kitchen.add_one_way_exit(NORTH, self.cellar)
+        self.game = Game([self.hall, self.kitchen, self.cellar])
+
+    def test_visits_count_start_and_every_step(self):
+        result = simulate(self.game, 10, 20, seed=1)
+
+        self.assertEqual(10 * 21, sum(result.visits))
+        self.assertEqual(10 * 21, sum(result.location_visits().values()))
+
+    def test_dead_ends_reached(self):
+        result = simulate(self.game, 20, 200, seed=1)
+
+        self.assertEqual([self.cellar], result.dead_ends)
+
+    def test_dead_ends_not_reached(self):
+        result = simulate(self.game, 5, 0, seed=1)
+
+        self.assertEqual([], result.dead_ends)
+
+    def test_steps_to_goal(self):
+        result = simulate(self.game, 20, 200,
+                          goal=lambda location: location is self.cellar,
+                          seed=1)
+
+        steps = list(result.steps_to_goal)
+        self.assertEqual(20, len(steps))
+        self.assertTrue(all(step >= 2 for step in steps))
+        self.assertEqual(20, result.location_visits()[self.cellar])
+
+    def test_goal_not_reached(self):
+        result = simulate(self.game, 3, 1,
+                          goal=lambda location: location is self.cellar,
+                          seed=1)
+
+        self.assertEqual([-1, -1, -1], list(result.steps_to_goal))
+
+    def test_starting_at_goal(self):
+        result = simulate(self.game, 3, 10,
+                          goal=lambda location: location is self.hall)
+
+        self.assertEqual([0, 0, 0], list(result.steps_to_goal))
+        self.assertEqual([3, 0, 0], list(result.visits))
+
+    def test_same_seed_same_result(self):
+        first = simulate(self.game, 10, 5, seed=7)
+        second = simulate(self.game, 10, 5, seed=7)
+
+        self.assertEqual(list(first.visits), list(second.visits))
+
+    def test_no_exits(self):
+        game = Game([Location('Hall')])
+
+        result = simulate(game, 4, 3)
+
+        self.assertEqual([16], list(result.visits))
+
+
+class PurePythonSimulateTest(SimulateTest):
+    def setUp(self):
+        self.numpy = simulation.numpy
+        graph.numpy = None
+        simulation.numpy = None
+        SimulateTest.setUp(self)
+
+    def tearDown(self):
+        graph.numpy = self.numpy
+        simulation.numpy = self.numpy
+
+
+if __name__ == '__main__':
+    unittest.main()
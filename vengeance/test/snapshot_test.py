@@ -0,0 +1,106 @@
+import unittest
+
+from vengeance.directions import EAST
+from vengeance.directions import NORTH
+from vengeance.game import Game
+from vengeance.game import Location
+from vengeance.snapshot import load_world
+from vengeance.snapshot import restore_session
+from vengeance.snapshot import save_world
+from vengeance.snapshot import snapshot_session
+from vengeance.snapshot import world_digest
+
+
+class SessionTest(unittest.TestCase):
+    def setUp(self):
+        self.hall = Location('Hall', 'A long hall')
+        self.kitchen = Location('Kitchen')
+        self.hall.add_exit(EAST, self.kitchen)
+        self.game = Game([self.hall, self.kitchen])
+
+    def test_restore_session(self):
+        self.game.process_input('e')
+
+        game = restore_session(self.game.world, snapshot_session(self.game))
+
+        self.assertEqual(self.kitchen, game.character.current_location)
+        self.assertFalse(game.should_end)
+        self.assertEqual(self.game.world, game.world)
+
+    def test_should_end_restored(self):
+        self.game.should_end = True
+
+        game = restore_session(self.game.world, snapshot_session(self.game))
+
+        self.assertTrue(game.should_end)
+
+    def test_session_is_compact(self):
+        self.assertEqual(6, len(snapshot_session(self.game)))
+
+    def test_location_outside_world(self):
+        cellar = Location('Cellar')
+        self.kitchen.add_one_way_exit(NORTH, cellar)
+        self.game.process_input('e')
+        self.game.process_input('n')
+
+        self.assertRaises(ValueError, snapshot_session, self.game)
+
+    def test_invalid_session(self):
+        self.assertRaises(ValueError, restore_session, self.game.world,
+                          b'\x01\x00')
+
+    def test_unsupported_version(self):
+        session = b'\x02' + snapshot_session(self.game)[1:]
+
+        self.assertRaises(ValueError, restore_session, self.game.world,
+                          session)
+
+    def test_unknown_location_index(self):
+        session = b'\x01\x02\x00\x00\x00\x00'
+
+        try:
+            restore_session(self.game.world, session)
+            self.fail()
+        except ValueError as e:
+            self.assertEqual('Unknown location index 2', str(e))
+
+
+class WorldTest(unittest.TestCase):
+    def setUp(self):
+        self.hall = Location('Hall', 'A long hall')
+        self.kitchen = Location('Kitchen')
+        self.hall.add_exit(EAST, self.kitchen)
+        self.game = Game([self.hall, self.kitchen])
+
+    def test_same_world_same_digest(self):
+        digest, blob = save_world(self.game.world)
+
+        self.assertEqual(digest, world_digest(blob))
+        self.assertEqual(digest, save_world(self.game.world)[0])
+
+    def test_changed_world_different_digest(self):
+        digest, _ = save_world(self.game.world)
+        self.kitchen.add_one_way_exit(NORTH, self.hall)
+
+        self.assertNotEqual(digest, save_world(self.game.world)[0])
+
+    def test_session_moved_to_loaded_world(self):
+        digest, blob = save_world(self.game.world)
+        self.game.process_input('e')
+        session = snapshot_session(self.game)
+
+        game = restore_session(load_world(blob, digest), session)
+
+        self.assertEqual('Kitchen', game.character.current_location.name)
+        game.process_input('w')
+        self.assertEqual('A long hall',
+                         game.character.current_location.description)
+
+    def test_digest_mismatch(self):
+        _, blob = save_world(self.game.world)
+
+        self.assertRaises(ValueError, load_world, blob, '0' * 64)
+
+
+if __name__ == '__main__':
+    unittest.main()